@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark RRT-Connect against single-tree RRT
+
+Reports success rate and wall time per planner mode on the MATLAB obstacle
+field and on a narrow-passage wall. Run from the ``python`` directory:
+
+    python examples/benchmark_rrt_connect.py --trials 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core import CUBE, ObstacleField, load_scene  # noqa: E402
+from star_wars_rrt import DEFAULT_BOUNDS, PLANNER_MODES, RRTPlanner  # noqa: E402
+
+START = np.array([-0.8, 0.0, 0.0])
+GOAL = np.array([0.8, 0.0, 0.0])
+MATLAB_SCENE = (
+    Path(__file__).resolve().parents[2] / "matlab" / "data" / "obstacles3D.csv"
+)
+
+
+def narrow_passage(cube_size: float = 0.1) -> ObstacleField:
+    """Wall of cubes across x = 0 with a single-cube gap at the center"""
+    half_y = int(round(DEFAULT_BOUNDS[3] / cube_size))
+    half_z = int(round(DEFAULT_BOUNDS[5] / cube_size))
+    rows = [
+        [CUBE, 0.0, iy * cube_size, iz * cube_size, cube_size, 0.5, 0.5, 0.5]
+        for iy in range(-half_y, half_y + 1)
+        for iz in range(-half_z, half_z + 1)
+        if (iy, iz) != (0, 0)
+    ]
+    return ObstacleField.from_array(rows)
+
+
+def run(mode: str, field: ObstacleField, bounds: np.ndarray, trials: int, args) -> dict:
+    planner = RRTPlanner(
+        bounds,
+        max_iterations=args.max_iterations,
+        nn_backend=args.nn_backend,
+        check_edges=True,
+        mode=mode,
+    )
+    times, successes = [], 0
+    for seed in range(trials):
+        planner.rng = np.random.default_rng(seed)
+        tic = time.perf_counter()
+        path = planner.plan_path(START, GOAL, field)
+        times.append(time.perf_counter() - tic)
+        successes += path is not None
+    return {
+        "success_rate": successes / trials,
+        "mean_s": float(np.mean(times)),
+        "median_s": float(np.median(times)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--max-iterations", type=int, default=5000)
+    parser.add_argument("--nn-backend", default="kdtree")
+    args = parser.parse_args()
+
+    scenes = {"narrow_passage": (narrow_passage(), DEFAULT_BOUNDS)}
+    if MATLAB_SCENE.exists():
+        field, bounds = load_scene(MATLAB_SCENE)
+        scenes["obstacles3D.csv"] = (
+            field,
+            DEFAULT_BOUNDS if bounds is None else bounds,
+        )
+
+    print(f"{'scene':<18}{'mode':<10}{'success':>9}{'mean [s]':>11}{'median [s]':>12}")
+    for name, (field, bounds) in scenes.items():
+        for mode in PLANNER_MODES:
+            result = run(mode, field, bounds, args.trials, args)
+            print(
+                f"{name:<18}{mode:<10}{result['success_rate']:>9.0%}"
+                f"{result['mean_s']:>11.3f}{result['median_s']:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
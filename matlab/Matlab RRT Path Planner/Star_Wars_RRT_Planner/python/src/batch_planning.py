@@ -0,0 +1,96 @@
+"""
+Parallel multi-query planning against a shared obstacle set
+
+The obstacle arrays and planner settings reach each worker process once,
+through the pool initializer (inherited directly under the ``fork`` start
+method), and only the (start, goal, seed) triples travel per query.
+"""
+
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core import ObstacleField, as_obstacle_field
+from star_wars_rrt import DEFAULT_BOUNDS, Obstacles, RRTPlanner
+
+Query = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class PlanResult:
+    """Outcome of one planning query"""
+
+    path: Optional[np.ndarray]
+    seconds: float
+    iterations: int
+    seed: int
+
+
+# Per-process state installed by _init_worker
+_worker_planner: Optional[RRTPlanner] = None
+_worker_field: Optional[ObstacleField] = None
+
+
+def _init_worker(planner: RRTPlanner, field: ObstacleField):
+    global _worker_planner, _worker_field
+    _worker_planner, _worker_field = planner, field
+
+
+def _plan_one(job: Tuple[np.ndarray, np.ndarray, int]) -> PlanResult:
+    start, goal, seed = job
+    _worker_planner.rng = np.random.default_rng(seed)
+    tic = time.perf_counter()
+    path = _worker_planner.plan_path(start, goal, _worker_field)
+    return PlanResult(
+        path, time.perf_counter() - tic, _worker_planner.last_iterations, seed
+    )
+
+
+def plan_many(
+    queries: Sequence[Query],
+    obstacles: Obstacles,
+    workers: Optional[int] = None,
+    planner: Optional[RRTPlanner] = None,
+    seed: int = 0,
+) -> List[PlanResult]:
+    """Plan every (start, goal) query against the same obstacles
+
+    Args:
+        queries: Sequence of (start, goal) position pairs
+        obstacles: Obstacle list or packed ObstacleField shared by all queries
+        workers: Worker processes; defaults to the CPU count, 1 runs in-process
+        planner: Configured planner to replicate in each worker
+        seed: Base seed; query ``i`` gets its own seed derived from it, so
+            results do not depend on the worker count
+
+    Returns:
+        One PlanResult per query, in input order
+    """
+    planner = planner if planner is not None else RRTPlanner(DEFAULT_BOUNDS)
+    field = as_obstacle_field(obstacles)
+    seeds = np.random.SeedSequence(seed).generate_state(len(queries)).tolist()
+    jobs = [
+        (np.asarray(start, dtype=float), np.asarray(goal, dtype=float), query_seed)
+        for (start, goal), query_seed in zip(queries, seeds)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        # Plan on a copy, as a worker process would, so the caller's planner
+        # (rng, stats, trees) is left untouched
+        _init_worker(copy.deepcopy(planner), field)
+        try:
+            return [_plan_one(job) for job in jobs]
+        finally:
+            _init_worker(None, None)
+
+    chunksize = max(1, len(jobs) // (4 * workers))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(planner, field)
+    ) as pool:
+        return list(pool.map(_plan_one, jobs, chunksize=chunksize))
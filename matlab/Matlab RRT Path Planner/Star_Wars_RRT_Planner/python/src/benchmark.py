@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Headless RRTPlanner benchmark
+
+Runs the planner over a corpus of scenes - MATLAB obstacle CSVs and seeded
+random fields of configurable density - for each planner mode and iteration
+cap, and reports success rate, p50/p95 plan time, nodes expanded and path
+length as JSON; ``--stats`` adds the planner's phase timers and counters and
+``--expansion-batch`` sweeps how many samples plain RRT extends per round.
+No window or OpenGL context is created:
+
+    python src/benchmark.py --scene ../../RRT_3D_Static/obstacles3D.csv \\
+        --random 30 120 --iterations 2000 5000 --output bench.json
+
+A small ``--step-size`` and ``--goal-bias`` grow large trees before the goal
+is reached; ``nodes_per_s`` in each result gives the tree-growth throughput:
+
+    python src/benchmark.py --scene ../../RRT_3D_Static/obstacles3D.csv \\
+        --mode rrt --iterations 50000 --step-size 0.002 --goal-bias 0 \\
+        --trials 1 --stats --expansion-batch 1 64
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Keep stdout clean for the JSON report
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core import (  # noqa: E402
+    NN_BACKENDS,
+    ObstacleField,
+    PlannerStats,
+    load_scene,
+    random_scene,
+)
+from star_wars_rrt import DEFAULT_BOUNDS, PLANNER_MODES, RRTPlanner  # noqa: E402
+
+
+class Scene:
+    """Named obstacle field with its planning bounds and query"""
+
+    def __init__(self, name: str, field: ObstacleField, bounds: np.ndarray):
+        self.name = name
+        self.field = field
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.start, self.goal = default_query(self.bounds)
+
+    @property
+    def volume(self) -> float:
+        return float(np.prod(self.bounds[1::2] - self.bounds[0::2]))
+
+
+def default_query(bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and goal on the x axis, 10% of the width in from either end"""
+    center = (bounds[0::2] + bounds[1::2]) / 2
+    margin = 0.1 * (bounds[1] - bounds[0])
+    start, goal = center.copy(), center.copy()
+    start[0], goal[0] = bounds[0] + margin, bounds[1] - margin
+    return start, goal
+
+
+def load_scenes(
+    csv_paths: Sequence[str], densities: Sequence[int], seed: int
+) -> List[Scene]:
+    """Scene files followed by one seeded random field per obstacle count"""
+    scenes = []
+    for path in csv_paths:
+        field, bounds = load_scene(path)
+        bounds = bounds if bounds is not None else DEFAULT_BOUNDS
+        scenes.append(Scene(Path(path).name, field, bounds))
+    for count in densities:
+        start, goal = default_query(DEFAULT_BOUNDS)
+        rng = np.random.default_rng([seed, count])
+        field = random_scene(count, DEFAULT_BOUNDS, rng, clear=[start, goal])
+        scenes.append(Scene(f"random_{count}", field, DEFAULT_BOUNDS))
+    return scenes
+
+
+def benchmark(
+    scene: Scene,
+    mode: str,
+    max_iterations: int,
+    trials: int,
+    seed: int = 0,
+    nn_backend: str = "kdtree",
+    check_edges: bool = True,
+    stats: bool = False,
+    expansion_batch: int = 1,
+    step_size: Optional[float] = None,
+    goal_bias: Optional[float] = None,
+) -> Dict:
+    """Plan ``trials`` times with per-trial seeds and summarize the runs"""
+    planner = RRTPlanner(
+        scene.bounds,
+        max_iterations=max_iterations,
+        nn_backend=nn_backend,
+        check_edges=check_edges,
+        mode=mode,
+    )
+    planner.expansion_batch = expansion_batch
+    if step_size is not None:
+        planner.step_size = step_size
+    if goal_bias is not None:
+        planner.goal_bias = goal_bias
+    if stats:
+        planner.stats = PlannerStats()
+    seeds = np.random.SeedSequence(seed).spawn(trials)
+    seconds, nodes, lengths = [], [], []
+    for trial_seed in seeds:
+        planner.rng = np.random.default_rng(trial_seed)
+        tic = time.perf_counter()
+        path = planner.plan_path(scene.start, scene.goal, scene.field)
+        seconds.append(time.perf_counter() - tic)
+        nodes.append(planner.last_nodes)
+        if path is not None:
+            steps = np.linalg.norm(np.diff(path, axis=0), axis=1)
+            lengths.append(float(steps.sum()))
+
+    result = {
+        "scene": scene.name,
+        "obstacles": len(scene.field),
+        "obstacle_density": len(scene.field) / scene.volume,
+        "mode": mode,
+        "max_iterations": max_iterations,
+        "expansion_batch": expansion_batch,
+        "step_size": planner.step_size,
+        "goal_bias": planner.goal_bias,
+        "trials": trials,
+        "success_rate": len(lengths) / trials,
+        "time_p50_s": float(np.percentile(seconds, 50)),
+        "time_p95_s": float(np.percentile(seconds, 95)),
+        "nodes_mean": float(np.mean(nodes)),
+        "nodes_p50": float(np.percentile(nodes, 50)),
+        "nodes_per_s": float(np.sum(nodes) / np.sum(seconds)),
+        "path_length_mean": float(np.mean(lengths)) if lengths else None,
+        "path_length_p50": float(np.percentile(lengths, 50)) if lengths else None,
+    }
+    if stats:
+        summary = planner.stats.to_dict()
+        result["timers_ns"] = summary["timers_ns"]
+        result["counts"] = summary["counts"]
+    return result
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scene", nargs="*", default=[], help="MATLAB obstacle CSV or .npy files"
+    )
+    parser.add_argument(
+        "--random",
+        type=int,
+        nargs="*",
+        default=[],
+        help="obstacle counts for seeded random fields",
+    )
+    parser.add_argument("--iterations", type=int, nargs="+", default=[5000])
+    parser.add_argument(
+        "--mode", nargs="+", choices=PLANNER_MODES, default=["rrt", "connect"]
+    )
+    parser.add_argument("--nn-backend", choices=NN_BACKENDS, default="kdtree")
+    parser.add_argument(
+        "--endpoint-checks",
+        action="store_true",
+        help="check only new nodes instead of whole edges",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="add per-phase planner timers and counters to each result",
+    )
+    parser.add_argument(
+        "--expansion-batch",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="samples extended per round in rrt mode (kdtree or spatial_hash)",
+    )
+    parser.add_argument(
+        "--step-size", type=float, help="override the planner's extension step"
+    )
+    parser.add_argument(
+        "--goal-bias", type=float, help="override the chance of sampling the goal"
+    )
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    if not args.scene and not args.random:
+        args.random = [30]
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict:
+    args = parse_args(argv)
+    results = [
+        benchmark(
+            scene,
+            mode,
+            iterations,
+            args.trials,
+            args.seed,
+            args.nn_backend,
+            not args.endpoint_checks,
+            args.stats,
+            batch,
+            args.step_size,
+            args.goal_bias,
+        )
+        for scene in load_scenes(args.scene, args.random, args.seed)
+        for mode in args.mode
+        for iterations in args.iterations
+        for batch in args.expansion_batch
+    ]
+    report = {
+        "config": {
+            "nn_backend": args.nn_backend,
+            "check_edges": not args.endpoint_checks,
+            "trials": args.trials,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Headless flight video capture
+
+Renders a scenario offscreen as fast as the GPU (or Mesa llvmpipe) allows
+and streams the frames into a PNG sequence or, for video file names, an
+``ffmpeg`` encoder pipe. No window or display server is needed:
+
+    python src/capture.py frames/ --frames 600 --mode pursuit --seed 7
+    python src/capture.py falcon_flight.mp4 --width 1280 --height 720
+"""
+
+import os
+
+# EGL pbuffer contexts work without X; must be chosen before OpenGL loads
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from typing import Optional, Sequence  # noqa: E402
+
+from core import load_scene  # noqa: E402
+from render import create_offscreen_context, open_sink  # noqa: E402
+from star_wars_rrt import StarWarsRRTApp  # noqa: E402
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output", help="PNG directory or .mp4/.mkv/.mov/.avi file")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument(
+        "--mode", choices=["single", "pursuit", "swarm"], default="single"
+    )
+    parser.add_argument("--camera", choices=["cinematic", "chase"], default="cinematic")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=60, help="encoded frame rate")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--scene", help="MATLAB obstacle CSV or .npy scene")
+    args = parser.parse_args(argv)
+
+    obstacles, bounds = load_scene(args.scene) if args.scene else (None, None)
+    context = create_offscreen_context(args.width, args.height)  # noqa: F841
+    app = StarWarsRRTApp(
+        seed=args.seed, headless=True, size=(args.width, args.height), bounds=bounds
+    )
+    app.setup_scenario(args.mode, obstacles)
+    sink = open_sink(args.output, args.width, args.height, args.fps)
+
+    tic = time.perf_counter()
+    app.record(sink, args.frames, args.camera, args.fps)
+    seconds = time.perf_counter() - tic
+    print(
+        f"{args.frames} frames in {seconds:.2f}s "
+        f"({args.frames / seconds:.1f} FPS) -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Core RRT algorithms - scenes, sampling, nearest-neighbor search, tree storage,
+static, voxelized and space-time collision checking, path post-processing,
+planner instrumentation, swarm pursuit, target goals and goal regions
+"""
+
+from .collision import CUBE, SPHERE, ObstacleField, as_obstacle_field
+from .dynamic import MovingObstacleField, Trajectories
+from .goals import GoalRegions, GoalTracker, goal_set, poisson_disc
+from .nearest_neighbors import (
+    NN_BACKENDS,
+    KDTreeIndex,
+    LinearIndex,
+    SpatialHashIndex,
+    create_nn_index,
+)
+from .occupancy import OccupancyGrid
+from .sampling import InformedSampler, UniformSampler
+from .scenes import load_scene, load_scene_csv, random_scene, save_scene
+from .smoothing import (
+    SMOOTHING_METHODS,
+    resample_bspline,
+    resample_linear,
+    resample_min_jerk,
+    shortcut_path,
+    smooth_path,
+)
+from .stats import PlannerStats
+from .swarm import PURSUER, TARGET, Swarm, SwarmPursuit
+from .tree import NO_PARENT, RRTTree
+
+__all__ = [
+    "CUBE",
+    "GoalRegions",
+    "GoalTracker",
+    "InformedSampler",
+    "KDTreeIndex",
+    "LinearIndex",
+    "MovingObstacleField",
+    "NN_BACKENDS",
+    "NO_PARENT",
+    "ObstacleField",
+    "OccupancyGrid",
+    "PURSUER",
+    "PlannerStats",
+    "RRTTree",
+    "SMOOTHING_METHODS",
+    "SPHERE",
+    "SpatialHashIndex",
+    "Swarm",
+    "SwarmPursuit",
+    "TARGET",
+    "Trajectories",
+    "UniformSampler",
+    "as_obstacle_field",
+    "create_nn_index",
+    "goal_set",
+    "load_scene",
+    "load_scene_csv",
+    "poisson_disc",
+    "random_scene",
+    "resample_bspline",
+    "resample_linear",
+    "resample_min_jerk",
+    "save_scene",
+    "shortcut_path",
+    "smooth_path",
+]
@@ -0,0 +1,211 @@
+"""
+Vectorized collision checking against packed obstacle arrays
+
+Matches the MATLAB ``collisionCheck.m`` semantics: a point hits a sphere when
+it is within ``size`` of the center, and hits a cube when every coordinate is
+within ``size / 2`` of the center.
+"""
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+SPHERE = 0
+CUBE = 1
+
+
+class ObstacleField:
+    """All spheres and axis-aligned cubes of a scene as contiguous arrays"""
+
+    def __init__(
+        self,
+        sphere_centers: np.ndarray,
+        sphere_radii: np.ndarray,
+        cube_centers: np.ndarray,
+        cube_sizes: np.ndarray,
+        sphere_colors: Optional[np.ndarray] = None,
+        cube_colors: Optional[np.ndarray] = None,
+    ):
+        self.sphere_centers = np.ascontiguousarray(sphere_centers, dtype=float)
+        self.sphere_centers = self.sphere_centers.reshape(-1, 3)
+        self.sphere_radii = np.asarray(sphere_radii, dtype=float).reshape(-1)
+        self.cube_centers = np.ascontiguousarray(cube_centers, dtype=float)
+        self.cube_centers = self.cube_centers.reshape(-1, 3)
+        self.cube_sizes = np.asarray(cube_sizes, dtype=float).reshape(-1)
+        self.sphere_colors = _colors(sphere_colors, len(self.sphere_radii))
+        self.cube_colors = _colors(cube_colors, len(self.cube_sizes))
+
+        # Precomputed query terms
+        self.sphere_radii_sq = self.sphere_radii**2
+        self.cube_half_sizes = self.cube_sizes / 2
+
+    @classmethod
+    def from_obstacles(cls, obstacles: Iterable) -> "ObstacleField":
+        """Pack a list of ``Obstacle`` dataclasses"""
+        obstacles = list(obstacles)
+        spheres = [o for o in obstacles if o.type == SPHERE]
+        cubes = [o for o in obstacles if o.type != SPHERE]
+        return cls(
+            [o.position for o in spheres],
+            [o.size for o in spheres],
+            [o.position for o in cubes],
+            [o.size for o in cubes],
+            [o.color for o in spheres],
+            [o.color for o in cubes],
+        )
+
+    @classmethod
+    def from_array(cls, rows: np.ndarray) -> "ObstacleField":
+        """Pack MATLAB-style rows ``[type, x, y, z, size, r, g, b]``"""
+        rows = np.asarray(rows, dtype=float).reshape(-1, 8)
+        spheres = rows[rows[:, 0] == SPHERE]
+        cubes = rows[rows[:, 0] != SPHERE]
+        return cls(
+            spheres[:, 1:4],
+            spheres[:, 4],
+            cubes[:, 1:4],
+            cubes[:, 4],
+            spheres[:, 5:8],
+            cubes[:, 5:8],
+        )
+
+    def __len__(self) -> int:
+        return len(self.sphere_radii) + len(self.cube_sizes)
+
+    def to_array(self) -> np.ndarray:
+        """MATLAB-style rows ``[type, x, y, z, size, r, g, b]``, spheres first"""
+        spheres = np.column_stack(
+            [
+                np.full(len(self.sphere_radii), SPHERE),
+                self.sphere_centers,
+                self.sphere_radii,
+                self.sphere_colors,
+            ]
+        )
+        cubes = np.column_stack(
+            [
+                np.full(len(self.cube_sizes), CUBE),
+                self.cube_centers,
+                self.cube_sizes,
+                self.cube_colors,
+            ]
+        )
+        return np.vstack([spheres, cubes]).astype(float)
+
+    def to_obstacles(self, obstacle_cls) -> List:
+        """Unpack into ``obstacle_cls(type, position, size, color)`` instances"""
+        spheres = [
+            obstacle_cls(SPHERE, center.copy(), float(size), tuple(color))
+            for center, size, color in zip(
+                self.sphere_centers, self.sphere_radii, self.sphere_colors
+            )
+        ]
+        cubes = [
+            obstacle_cls(CUBE, center.copy(), float(size), tuple(color))
+            for center, size, color in zip(
+                self.cube_centers, self.cube_sizes, self.cube_colors
+            )
+        ]
+        return spheres + cubes
+
+    def contains(self, point: np.ndarray) -> bool:
+        """True if ``point`` lies inside any obstacle"""
+        if len(self.sphere_radii):
+            diff = self.sphere_centers - point
+            if (np.einsum("ij,ij->i", diff, diff) <= self.sphere_radii_sq).any():
+                return True
+        if len(self.cube_sizes):
+            inside = np.abs(self.cube_centers - point) <= self.cube_half_sizes[:, None]
+            if inside.all(axis=1).any():
+                return True
+        return False
+
+    def contains_batch(self, points: np.ndarray) -> np.ndarray:
+        """Per-point collision flags for ``points`` of shape (k, 3)"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        hit = np.zeros(len(points), dtype=bool)
+        if len(self.sphere_radii):
+            diff = points[:, None, :] - self.sphere_centers[None, :, :]
+            d2 = np.einsum("kmi,kmi->km", diff, diff)
+            hit |= (d2 <= self.sphere_radii_sq).any(axis=1)
+        if len(self.cube_sizes):
+            offset = np.abs(points[:, None, :] - self.cube_centers[None, :, :])
+            inside = offset <= self.cube_half_sizes[None, :, None]
+            hit |= inside.all(axis=2).any(axis=1)
+        return hit
+
+    def segment_collides(self, start: np.ndarray, end: np.ndarray) -> bool:
+        """True if the straight edge from ``start`` to ``end`` touches any obstacle"""
+        return bool(self.segments_collide(start[None, :], end[None, :])[0])
+
+    def segments_collide(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Exact per-edge collision flags for ``starts``/``ends`` of shape (k, 3)"""
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        hit = np.zeros(len(starts), dtype=bool)
+        if len(self.sphere_radii):
+            hit |= _segments_hit_spheres(
+                starts, ends, self.sphere_centers, self.sphere_radii_sq
+            )
+        if len(self.cube_sizes):
+            hit |= _segments_hit_boxes(
+                starts,
+                ends,
+                self.cube_centers - self.cube_half_sizes[:, None],
+                self.cube_centers + self.cube_half_sizes[:, None],
+            )
+        return hit
+
+
+def _segments_hit_spheres(
+    starts: np.ndarray, ends: np.ndarray, centers: np.ndarray, radii_sq: np.ndarray
+) -> np.ndarray:
+    """Closest point on each segment to each center, clamped to the segment"""
+    direction = ends - starts  # (k, 3)
+    length_sq = np.einsum("ki,ki->k", direction, direction)
+    to_center = centers[None, :, :] - starts[:, None, :]  # (k, m, 3)
+    t = np.einsum("kmi,ki->km", to_center, direction)
+    t = np.divide(
+        t, length_sq[:, None], out=np.zeros_like(t), where=length_sq[:, None] > 0
+    )
+    np.clip(t, 0.0, 1.0, out=t)
+    offset = to_center - t[:, :, None] * direction[:, None, :]
+    d2 = np.einsum("kmi,kmi->km", offset, offset)
+    return (d2 <= radii_sq[None, :]).any(axis=1)
+
+
+def _segments_hit_boxes(
+    starts: np.ndarray, ends: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> np.ndarray:
+    """Slab test of each segment against each closed axis-aligned box"""
+    direction = (ends - starts)[:, None, :]  # (k, 1, 3)
+    origin = starts[:, None, :]
+    lower, upper = lower[None, :, :], upper[None, :, :]  # (1, m, 3)
+
+    parallel = direction == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_lower = (lower - origin) / direction
+        t_upper = (upper - origin) / direction
+    t_near = np.minimum(t_lower, t_upper)
+    t_far = np.maximum(t_lower, t_upper)
+    # Segments parallel to a slab either always or never lie within it
+    inside_slab = (origin >= lower) & (origin <= upper)
+    t_near = np.where(parallel, np.where(inside_slab, -np.inf, np.inf), t_near)
+    t_far = np.where(parallel, np.where(inside_slab, np.inf, -np.inf), t_far)
+
+    entry = np.maximum(t_near.max(axis=2), 0.0)
+    exit_ = np.minimum(t_far.min(axis=2), 1.0)
+    return (entry <= exit_).any(axis=1)
+
+
+def _colors(colors: Optional[np.ndarray], count: int) -> np.ndarray:
+    if colors is None or len(colors) == 0:
+        return np.full((count, 3), 0.5)
+    return np.asarray(colors, dtype=float).reshape(count, 3)
+
+
+def as_obstacle_field(obstacles) -> ObstacleField:
+    """Return ``obstacles`` as an ``ObstacleField``, packing a list if needed"""
+    if isinstance(obstacles, ObstacleField):
+        return obstacles
+    return ObstacleField.from_obstacles(obstacles)
@@ -0,0 +1,307 @@
+"""
+Moving obstacles and space-time collision queries
+
+A ``MovingObstacleField`` gives every sphere and cube of an ``ObstacleField``
+a trajectory: a piecewise-linear path through timed waypoints plus a constant
+drift velocity, optionally wrapped back into the bounds as the MATLAB
+``RRT_3D_Dynamic`` animation does. All centers at a time are evaluated in one
+vectorized pass, and collision queries take a time with every point.
+"""
+
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .collision import SPHERE, ObstacleField
+
+# Waypoints as (times of shape (K,), centers of shape (K, 3))
+Waypoints = Tuple[np.ndarray, np.ndarray]
+
+
+class Trajectories:
+    """Center trajectories of ``n`` obstacles
+
+    Waypoint tracks are padded to a common length by repeating their last
+    key, so every obstacle is interpolated by the same array operations.
+    Drift ``velocities`` are added on top of the waypoint track.
+    """
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        points: np.ndarray,
+        velocities: Optional[np.ndarray] = None,
+        loop: bool = False,
+    ):
+        self.times = np.asarray(times, dtype=float)  # (n, K), ascending per row
+        self.points = np.asarray(points, dtype=float)  # (n, K, 3)
+        count = len(self.times)
+        self.velocities = (
+            np.zeros((count, 3))
+            if velocities is None
+            else np.asarray(velocities, dtype=float).reshape(count, 3)
+        )
+        # loop replays each waypoint track forever instead of parking at its end
+        self.loop = loop
+        self._durations = self.times[:, -1] - self.times[:, 0]
+
+    @classmethod
+    def from_motion(
+        cls,
+        centers: np.ndarray,
+        velocities: Optional[np.ndarray] = None,
+        waypoints: Optional[Sequence[Optional[Waypoints]]] = None,
+        loop: bool = False,
+    ) -> "Trajectories":
+        """Tracks from start centers, drift velocities and optional waypoints
+
+        Obstacles with waypoints follow them instead of holding their center.
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        tracks = [
+            (
+                (np.zeros(1), center[None, :])
+                if waypoints is None or waypoints[i] is None
+                else (
+                    np.asarray(waypoints[i][0], dtype=float).reshape(-1),
+                    np.asarray(waypoints[i][1], dtype=float).reshape(-1, 3),
+                )
+            )
+            for i, center in enumerate(centers)
+        ]
+        keys = max((len(t) for t, _ in tracks), default=1)
+        times = np.empty((len(tracks), keys))
+        points = np.empty((len(tracks), keys, 3))
+        for i, (track_times, track_points) in enumerate(tracks):
+            times[i, : len(track_times)] = track_times
+            times[i, len(track_times) :] = track_times[-1]
+            points[i, : len(track_points)] = track_points
+            points[i, len(track_points) :] = track_points[-1]
+        return cls(times, points, velocities, loop)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def max_speed(self) -> float:
+        """Upper bound on how fast any center moves"""
+        if len(self) == 0:
+            return 0.0
+        drift = np.linalg.norm(self.velocities, axis=1)
+        legs = np.linalg.norm(np.diff(self.points, axis=1), axis=2)
+        spans = np.diff(self.times, axis=1)
+        track = np.divide(legs, spans, out=np.zeros_like(legs), where=spans > 0)
+        return float((drift + track.max(axis=1, initial=0.0)).max())
+
+    def centers(self, times: np.ndarray) -> np.ndarray:
+        """Centers of every obstacle at each of ``k`` times, shape (k, n, 3)"""
+        times = np.asarray(times, dtype=float).reshape(-1)
+        count, keys = self.times.shape
+        local = np.broadcast_to(times[:, None], (len(times), count))
+        if self.loop:
+            start = self.times[:, 0]
+            looping = self._durations > 0
+            wrapped = start + np.mod(
+                local - start, np.where(looping, self._durations, 1.0)
+            )
+            local = np.where(looping, wrapped, local)
+
+        if keys == 1:
+            track = np.broadcast_to(self.points[:, 0], (len(times), count, 3))
+        else:
+            # Leg that starts at or before each local time, clamped to the ends
+            leg = (self.times[None, :, 1:-1] <= local[:, :, None]).sum(axis=2)
+            rows = np.arange(count)
+            t0, t1 = self.times[rows, leg], self.times[rows, leg + 1]
+            span = t1 - t0
+            fraction = np.divide(
+                local - t0, span, out=np.ones_like(span), where=span > 0
+            )
+            fraction = np.clip(fraction, 0.0, 1.0)[:, :, None]
+            p0, p1 = self.points[rows, leg], self.points[rows, leg + 1]
+            track = p0 + fraction * (p1 - p0)
+        return track + times[:, None, None] * self.velocities[None, :, :]
+
+
+class MovingObstacleField:
+    """Spheres and cubes moving along ``Trajectories``
+
+    ``wrap_bounds`` (``[x_min, x_max, ...]``) wraps centers that drift out of
+    the bounds back in on the opposite side.
+    """
+
+    def __init__(
+        self,
+        field: ObstacleField,
+        sphere_motion: Optional[Trajectories] = None,
+        cube_motion: Optional[Trajectories] = None,
+        wrap_bounds: Optional[np.ndarray] = None,
+    ):
+        self.field = field
+        self.sphere_motion = (
+            sphere_motion
+            if sphere_motion is not None
+            else Trajectories.from_motion(field.sphere_centers)
+        )
+        self.cube_motion = (
+            cube_motion
+            if cube_motion is not None
+            else Trajectories.from_motion(field.cube_centers)
+        )
+        self.wrap_bounds = (
+            None if wrap_bounds is None else np.asarray(wrap_bounds, dtype=float)
+        )
+        self.max_speed = max(self.sphere_motion.max_speed, self.cube_motion.max_speed)
+
+    @classmethod
+    def from_obstacles(
+        cls,
+        obstacles: Iterable,
+        wrap_bounds: Optional[np.ndarray] = None,
+        loop: bool = False,
+    ) -> "MovingObstacleField":
+        """Pack ``Obstacle`` dataclasses, using their ``velocity``/``waypoints``"""
+        obstacles = list(obstacles)
+        field = ObstacleField.from_obstacles(obstacles)
+        motions = []
+        for group in (
+            [o for o in obstacles if o.type == SPHERE],
+            [o for o in obstacles if o.type != SPHERE],
+        ):
+            velocities = [
+                (
+                    np.zeros(3)
+                    if getattr(o, "velocity", None) is None
+                    else np.asarray(o.velocity, dtype=float)
+                )
+                for o in group
+            ]
+            motions.append(
+                Trajectories.from_motion(
+                    [o.position for o in group],
+                    np.reshape(velocities, (-1, 3)),
+                    [getattr(o, "waypoints", None) for o in group],
+                    loop,
+                )
+            )
+        return cls(field, *motions, wrap_bounds=wrap_bounds)
+
+    @classmethod
+    def from_array(
+        cls,
+        rows: np.ndarray,
+        velocities: np.ndarray,
+        wrap_bounds: Optional[np.ndarray] = None,
+    ) -> "MovingObstacleField":
+        """MATLAB rows ``[type, x, y, z, size, r, g, b]`` with one velocity each"""
+        rows = np.asarray(rows, dtype=float).reshape(-1, 8)
+        velocities = np.asarray(velocities, dtype=float).reshape(-1, 3)
+        spheres = rows[:, 0] == SPHERE
+        return cls(
+            ObstacleField.from_array(rows),
+            Trajectories.from_motion(rows[spheres, 1:4], velocities[spheres]),
+            Trajectories.from_motion(rows[~spheres, 1:4], velocities[~spheres]),
+            wrap_bounds,
+        )
+
+    def __len__(self) -> int:
+        return len(self.field)
+
+    def centers(self, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sphere and cube centers at each of ``k`` times, (k, n, 3) each"""
+        return (
+            self._wrap(self.sphere_motion.centers(times)),
+            self._wrap(self.cube_motion.centers(times)),
+        )
+
+    def at(self, t: float) -> ObstacleField:
+        """Static snapshot of the scene at time ``t``"""
+        spheres, cubes = self.centers([t])
+        field = self.field
+        return ObstacleField(
+            spheres[0],
+            field.sphere_radii,
+            cubes[0],
+            field.cube_sizes,
+            field.sphere_colors,
+            field.cube_colors,
+        )
+
+    def contains(self, point: np.ndarray, t: float) -> bool:
+        """True if ``point`` lies inside any obstacle at time ``t``"""
+        return bool(self.contains_batch(np.asarray(point)[None, :], [t])[0])
+
+    def contains_batch(self, points: np.ndarray, times) -> np.ndarray:
+        """Per-point collision flags for ``(k, 3)`` points, each at its own time"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        times = np.broadcast_to(np.asarray(times, dtype=float), (len(points),))
+        spheres, cubes = self.centers(times)
+        field = self.field
+        hit = np.zeros(len(points), dtype=bool)
+        if len(field.sphere_radii):
+            diff = points[:, None, :] - spheres
+            d2 = np.einsum("kmi,kmi->km", diff, diff)
+            hit |= (d2 <= field.sphere_radii_sq).any(axis=1)
+        if len(field.cube_sizes):
+            inside = (
+                np.abs(points[:, None, :] - cubes)
+                <= field.cube_half_sizes[None, :, None]
+            )
+            hit |= inside.all(axis=2).any(axis=1)
+        return hit
+
+    def segment_collides(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        start_time: float,
+        end_time: float,
+        resolution: float = 0.01,
+    ) -> bool:
+        """True if flying ``start`` to ``end`` over the time span hits anything"""
+        return bool(
+            self.segments_collide(
+                start[None, :], end[None, :], [start_time], [end_time], resolution
+            )[0]
+        )
+
+    def segments_collide(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        start_times,
+        end_times,
+        resolution: float = 0.01,
+    ) -> np.ndarray:
+        """Per-edge flags for edges flown at constant speed over their time spans
+
+        Each edge is sampled so that neither the ship nor any obstacle moves
+        more than ``resolution`` between consecutive samples.
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        count = len(starts)
+        start_times = np.broadcast_to(np.asarray(start_times, dtype=float), (count,))
+        end_times = np.broadcast_to(np.asarray(end_times, dtype=float), (count,))
+        if count == 0:
+            return np.zeros(0, dtype=bool)
+
+        travel = np.linalg.norm(ends - starts, axis=1)
+        travel += self.max_speed * np.abs(end_times - start_times)
+        samples = int(np.ceil(travel.max() / resolution)) + 1
+        fractions = np.linspace(0.0, 1.0, max(samples, 2))
+        points = (
+            starts[:, None, :] + fractions[None, :, None] * (ends - starts)[:, None, :]
+        )
+        times = (
+            start_times[:, None]
+            + fractions[None, :] * (end_times - start_times)[:, None]
+        )
+        hit = self.contains_batch(points.reshape(-1, 3), times.reshape(-1))
+        return hit.reshape(count, -1).any(axis=1)
+
+    def _wrap(self, centers: np.ndarray) -> np.ndarray:
+        if self.wrap_bounds is None:
+            return centers
+        low, high = self.wrap_bounds[0::2], self.wrap_bounds[1::2]
+        return low + np.mod(centers - low, high - low)
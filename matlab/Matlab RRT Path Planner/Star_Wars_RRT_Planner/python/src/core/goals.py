@@ -0,0 +1,267 @@
+"""
+Persistent wander goals for pursuit targets and goal regions for planning
+
+Targets pick goals from a precomputed Poisson-disc point set instead of
+drawing a fresh random point every tick. ``goal_set`` builds each set once
+per bounds/spacing/seed and shares it read-only across episodes, and
+``GoalTracker`` holds one goal per agent until the agent arrives, dwells,
+or the goal ends up inside an obstacle.
+
+``GoalRegions`` is the planner's side: several candidate goal balls, tested
+against new tree nodes in one vectorized pass, so a single tree serves every
+candidate instead of one plan per goal.
+"""
+
+import functools
+import math
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .collision import ObstacleField
+
+# Dwell time left below this counts as done, absorbing countdown round-off
+DWELL_SLACK = 1e-9
+
+
+def poisson_disc(
+    bounds: np.ndarray,
+    radius: float,
+    rng: Optional[np.random.Generator] = None,
+    attempts: int = 30,
+) -> np.ndarray:
+    """Points filling the bounds with no two closer than ``radius`` (Bridson)
+
+    Args:
+        bounds: ``[x_min, x_max, y_min, y_max, z_min, z_max]``
+        radius: Minimum distance between points
+        rng: Random generator; seed it for a repeatable set
+        attempts: Candidates tried around an active point before retiring it
+
+    Returns:
+        ``(n, 3)`` points in insertion order
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    bounds = np.asarray(bounds, dtype=float)
+    low, high = bounds[0::2], bounds[1::2]
+    # Cells this small hold at most one point
+    cell = radius / math.sqrt(3)
+    shape = np.maximum(np.ceil((high - low) / cell).astype(int), 1)
+    grid = np.full(shape, -1, dtype=np.intp)
+    points = np.empty((grid.size, 3))
+
+    def cell_of(point: np.ndarray) -> np.ndarray:
+        return np.minimum(((point - low) / cell).astype(int), shape - 1)
+
+    # Candidates lie within 2 * radius of their center, so every point that
+    # could conflict with one sits within 3 * radius of the center
+    reach = int(math.ceil(3 * radius / cell))
+    points[0] = rng.uniform(low, high)
+    grid[tuple(cell_of(points[0]))] = 0
+    count = 1
+    active = [0]
+    while active:
+        slot = int(rng.integers(len(active)))
+        center = points[active[slot]]
+        # Uniform by volume in the shell between radius and 2 * radius
+        directions = rng.normal(size=(attempts, 3))
+        directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+        distances = radius * np.cbrt(rng.uniform(1.0, 8.0, attempts))
+        candidates = center + directions * distances[:, None]
+        candidates = candidates[((candidates >= low) & (candidates <= high)).all(1)]
+
+        key = cell_of(center)
+        begin, end = np.maximum(key - reach, 0), np.minimum(key + reach + 1, shape)
+        nearby = grid[begin[0] : end[0], begin[1] : end[1], begin[2] : end[2]]
+        nearby = points[nearby[nearby >= 0]]
+        offsets = candidates[:, None, :] - nearby[None, :, :]
+        clear = (np.einsum("cni,cni->cn", offsets, offsets) >= radius**2).all(1)
+        if clear.any():
+            # One point per round, as later candidates were not tested
+            # against this one
+            points[count] = candidates[np.argmax(clear)]
+            grid[tuple(cell_of(points[count]))] = count
+            active.append(count)
+            count += 1
+        else:
+            active[slot] = active[-1]
+            active.pop()
+    return points[:count]
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_goal_set(
+    bounds: Tuple[float, ...], spacing: float, seed: int
+) -> np.ndarray:
+    points = poisson_disc(np.array(bounds), spacing, np.random.default_rng(seed))
+    points.setflags(write=False)
+    return points
+
+
+def goal_set(bounds: np.ndarray, spacing: float = 0.25, seed: int = 0) -> np.ndarray:
+    """Poisson-disc goal points, built once per arguments and shared read-only"""
+    key = tuple(float(value) for value in np.asarray(bounds).reshape(-1))
+    return _cached_goal_set(key, float(spacing), int(seed))
+
+
+class GoalTracker:
+    """Goal state machine for ``count`` agents
+
+    An agent without a goal draws one from ``points``, flies at it, and on
+    arrival holds position for ``dwell_time`` seconds before drawing the
+    next. Goals that end up inside an obstacle are dropped and redrawn, and
+    draws only ever pick obstacle-free points.
+    """
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        count: int = 1,
+        dwell_time: float = 0.5,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.dwell_time = dwell_time
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._obstacles: Optional[ObstacleField] = None
+        self._free_points = self.points
+        self.reset(count)
+
+    def __len__(self) -> int:
+        return len(self.goals)
+
+    def reset(self, count: Optional[int] = None):
+        """Forget every goal, e.g. at the start of an episode"""
+        count = len(self.goals) if count is None else count
+        self.goals = np.zeros((count, 3))
+        self.has_goal = np.zeros(count, dtype=bool)
+        self.dwell = np.zeros(count)  # Seconds left to hold position
+
+    def steps(
+        self,
+        positions: np.ndarray,
+        speed: float,
+        dt: float,
+        obstacles: Optional[ObstacleField] = None,
+        agents: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Advance the state machine one tick
+
+        Args:
+            positions: Current ``(k, 3)`` positions of ``agents``
+            speed: Distance an agent may cover this tick
+            dt: Tick length in seconds, for the dwell countdown
+            obstacles: Current obstacle field; goals inside it are dropped
+            agents: Tracker rows for ``positions``; all agents by default
+
+        Returns:
+            ``(k, 3)`` displacements of at most ``speed``
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        agents = np.arange(len(self.goals)) if agents is None else np.asarray(agents)
+        if obstacles is not None and obstacles is not self._obstacles:
+            self._set_obstacles(obstacles)
+
+        holding = self.dwell[agents] > DWELL_SLACK
+        self.dwell[agents] = np.maximum(self.dwell[agents] - dt, 0.0)
+        drawing = agents[~self.has_goal[agents] & ~holding]
+        if len(drawing):
+            choice = self.rng.integers(len(self._free_points), size=len(drawing))
+            self.goals[drawing] = self._free_points[choice]
+            self.has_goal[drawing] = True
+
+        offsets = self.goals[agents] - positions
+        distances = np.linalg.norm(offsets, axis=1)
+        scale = np.where(distances > speed, speed / np.maximum(distances, speed), 1.0)
+        steps = offsets * scale[:, None]
+        steps[holding] = 0.0
+
+        arrived = agents[(distances <= speed) & ~holding]
+        self.has_goal[arrived] = False
+        self.dwell[arrived] = self.dwell_time
+        return steps
+
+    def _set_obstacles(self, obstacles: ObstacleField):
+        self._obstacles = obstacles
+        if len(obstacles) == 0:
+            self._free_points = self.points
+            return
+        free = ~obstacles.contains_batch(self.points)
+        # With every point blocked, wandering anywhere beats not moving
+        self._free_points = self.points[free] if free.any() else self.points
+        self.has_goal &= ~obstacles.contains_batch(self.goals)
+
+
+class GoalRegions:
+    """Candidate goal balls a plan may end in
+
+    Args:
+        centers: ``(m, 3)`` goal points, or one ``(3,)`` point
+        radii: Radius of each ball, or one radius for all
+    """
+
+    def __init__(self, centers: np.ndarray, radii: Union[float, np.ndarray]):
+        self.centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        if len(self.centers) == 0:
+            raise ValueError("GoalRegions needs at least one goal")
+        self.radii = np.broadcast_to(
+            np.asarray(radii, dtype=float), (len(self.centers),)
+        ).copy()
+        self.radii_sq = self.radii**2
+        # Index of each region among the goals it was built from
+        self.ids = np.arange(len(self.centers))
+
+    def __len__(self) -> int:
+        return len(self.centers)
+
+    def subset(self, keep: np.ndarray) -> "GoalRegions":
+        """Regions selected by the mask or indices ``keep``, ids preserved"""
+        regions = GoalRegions(self.centers[keep], self.radii[keep])
+        regions.ids = self.ids[keep]
+        return regions
+
+    def without_blocked(self, obstacles: ObstacleField) -> "GoalRegions":
+        """Regions whose centers are obstacle-free
+
+        With every center blocked all regions are kept, since a node near a
+        blocked center may still land inside its ball.
+        """
+        blocked = obstacles.contains_batch(self.centers)
+        if blocked.all() or not blocked.any():
+            return self
+        return self.subset(~blocked)
+
+    def hit(self, point: np.ndarray, open_regions: Optional[np.ndarray] = None) -> int:
+        """Region containing ``point`` with the nearest center, or -1
+
+        With an ``open_regions`` mask, containing regions still open win
+        over closed ones, which are reported only when no open one fits.
+        """
+        offsets = self.centers - point
+        d2 = np.einsum("ij,ij->i", offsets, offsets)
+        d2[d2 >= self.radii_sq] = np.inf
+        if open_regions is not None and np.isfinite(d2[open_regions]).any():
+            d2[~open_regions] = np.inf
+        best = int(np.argmin(d2))
+        return best if d2[best] < np.inf else -1
+
+    def hits(
+        self, points: np.ndarray, open_regions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """``hit`` for each of ``(k, 3)`` points"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        offsets = points[:, None, :] - self.centers[None, :, :]
+        d2 = np.einsum("kmi,kmi->km", offsets, offsets)
+        d2[d2 >= self.radii_sq[None, :]] = np.inf
+        rows = np.arange(len(points))
+        best = np.argmin(d2, axis=1)
+        if open_regions is not None and not open_regions.all():
+            open_d2 = np.where(open_regions[None, :], d2, np.inf)
+            open_best = np.argmin(open_d2, axis=1)
+            best = np.where(np.isfinite(open_d2[rows, open_best]), open_best, best)
+        return np.where(np.isfinite(d2[rows, best]), best, -1)
+
+    def lower_bounds(self, start: np.ndarray) -> np.ndarray:
+        """Shortest conceivable path length from ``start`` into each region"""
+        distances = np.linalg.norm(self.centers - start, axis=1)
+        return np.maximum(distances - self.radii, 0.0)
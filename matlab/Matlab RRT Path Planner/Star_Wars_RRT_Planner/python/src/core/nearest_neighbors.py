@@ -0,0 +1,413 @@
+"""
+Nearest-neighbor indices for RRT tree growth
+
+All indices store 3D points in insertion order and answer exact nearest and
+radius queries, so node ``i`` in the index is node ``i`` in the planner's tree.
+"""
+
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class LinearIndex:
+    """Reference brute-force index - one vectorized scan per query"""
+
+    def __init__(self, capacity: int = 1024):
+        self._points = np.empty((max(capacity, 1), 3))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def points(self) -> np.ndarray:
+        """View of the stored points, shape (n, 3)"""
+        return self._points[: self._size]
+
+    def add(self, point: np.ndarray) -> int:
+        """Insert a point and return its index"""
+        if self._size == len(self._points):
+            grown = np.empty((2 * len(self._points), 3))
+            grown[: self._size] = self._points
+            self._points = grown
+        self._points[self._size] = point
+        self._size += 1
+        return self._size - 1
+
+    def add_batch(self, points: np.ndarray) -> np.ndarray:
+        """Insert ``(k, 3)`` points and return their indices"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        needed = self._size + len(points)
+        if needed > len(self._points):
+            grown = np.empty((max(2 * len(self._points), needed), 3))
+            grown[: self._size] = self._points[: self._size]
+            self._points = grown
+        self._points[self._size : needed] = points
+        ids = np.arange(self._size, needed)
+        self._size = needed
+        return ids
+
+    def nearest(self, query: np.ndarray) -> int:
+        """Index of the stored point closest to ``query``"""
+        return self._scan(query, 0, self._size)[0]
+
+    def nearest_batch(self, queries: np.ndarray) -> np.ndarray:
+        """Index of the stored point closest to each of ``(k, 3)`` queries"""
+        return self._scan_batch(np.asarray(queries, dtype=float), 0, self._size)[0]
+
+    def within_radius(self, query: np.ndarray, radius: float) -> np.ndarray:
+        """Indices of all stored points within ``radius`` of ``query``"""
+        return self._ball(np.arange(self._size), query, radius)
+
+    def _ball(self, ids: np.ndarray, query: np.ndarray, radius: float) -> np.ndarray:
+        """Subset of ``ids`` whose points lie within ``radius`` of ``query``"""
+        diff = self._points[ids] - query
+        return ids[np.einsum("ij,ij->i", diff, diff) <= radius * radius]
+
+    def _scan_batch(
+        self, queries: np.ndarray, begin: int, end: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force nearest over points[begin:end] for every query row"""
+        diff = self._points[None, begin:end, :] - queries[:, None, :]
+        d2 = np.einsum("kni,kni->kn", diff, diff)
+        best = np.argmin(d2, axis=1)
+        return begin + best, d2[np.arange(len(queries)), best]
+
+    def _scan(self, query: np.ndarray, begin: int, end: int) -> Tuple[int, float]:
+        """Brute-force nearest over points[begin:end] as (index, squared distance)"""
+        diff = self._points[begin:end] - query
+        d2 = np.einsum("ij,ij->i", diff, diff)
+        best = int(np.argmin(d2))
+        return begin + best, float(d2[best])
+
+
+class SpatialHashIndex(LinearIndex):
+    """Uniform-grid spatial hash over the planner bounds, updated incrementally
+
+    Only occupied cells are stored, in a dict keyed by flat cell id, so memory
+    follows the number of points rather than the volume. Queries scan the
+    3x3x3 block around the query cell; a hit within one cell size is final.
+    Queries left open, typically samples far from a compact tree, take the
+    exact distance to every occupied cell box in one vectorized pass and scan
+    only the cells that could still hold something closer. Points outside the
+    bounds go to a small overflow list that is scanned on every query.
+
+    With ``expected_nodes`` the cell size is floored at the edge of a cell
+    holding one point when that many fill the bounds evenly, so a tiny step
+    size cannot make the block around a query nearly always empty.
+    """
+
+    def __init__(
+        self,
+        bounds: np.ndarray,
+        cell_size: float,
+        capacity: int = 1024,
+        expected_nodes: Optional[int] = None,
+    ):
+        super().__init__(capacity)
+        bounds = np.asarray(bounds, dtype=float)
+        self._origin = bounds[0::2]
+        extent = bounds[1::2] - self._origin
+        if expected_nodes:
+            cell_size = max(
+                cell_size, float(np.prod(extent) / expected_nodes) ** (1 / 3)
+            )
+        self.cell_size = float(cell_size)
+        self._dims = np.maximum(np.ceil(extent / self.cell_size).astype(np.int64), 1)
+        self._strides = np.array([self._dims[1] * self._dims[2], self._dims[2], 1])
+        self._cell_count = int(np.prod(self._dims))
+        self._cells: Dict[int, List[int]] = {}
+        # Occupied cells in first-use order: member lists and lower corners
+        self._members: List[List[int]] = []
+        self._corners = np.empty((64, 3))
+        self._outside: List[int] = []
+        self._shells: List[np.ndarray] = []
+
+    def _key(self, point: np.ndarray) -> np.ndarray:
+        return np.floor((point - self._origin) / self.cell_size).astype(np.int64)
+
+    def _bucket(self, cell: int, key: np.ndarray) -> List[int]:
+        """Member list of ``cell``, registering it on first use"""
+        members = self._cells.get(cell)
+        if members is None:
+            members = self._cells[cell] = []
+            slot = len(self._members)
+            if slot == len(self._corners):
+                grown = np.empty((2 * slot, 3))
+                grown[:slot] = self._corners
+                self._corners = grown
+            self._corners[slot] = self._origin + key * self.cell_size
+            self._members.append(members)
+        return members
+
+    def add(self, point: np.ndarray) -> int:
+        idx = super().add(point)
+        key = self._key(self._points[idx])
+        if (key < 0).any() or (key >= self._dims).any():
+            self._outside.append(idx)
+        else:
+            self._bucket(int(key @ self._strides), key).append(idx)
+        return idx
+
+    def add_batch(self, points: np.ndarray) -> np.ndarray:
+        ids = super().add_batch(points)
+        keys = self._key(self._points[ids])
+        outside = ((keys < 0) | (keys >= self._dims)).any(axis=1)
+        self._outside.extend(ids[outside].tolist())
+        keys = keys[~outside]
+        for idx, cell, key in zip(
+            ids[~outside].tolist(), (keys @ self._strides).tolist(), keys
+        ):
+            self._bucket(cell, key).append(idx)
+        return ids
+
+    def _shell(self, ring: int) -> np.ndarray:
+        """Flat cell offsets at Chebyshev distance ``ring`` (ring 1 includes 0)"""
+        while len(self._shells) <= ring:
+            r = len(self._shells)
+            axis = np.arange(-r, r + 1)
+            grid = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), -1)
+            grid = grid.reshape(-1, 3)
+            inner = 0 if r <= 1 else r
+            self._shells.append(grid[np.abs(grid).max(axis=1) >= inner] @ self._strides)
+        return self._shells[ring]
+
+    def _gather(self, cells: np.ndarray) -> List[int]:
+        """Point ids stored in ``cells``"""
+        stored = self._cells
+        return [i for c in cells.tolist() if c in stored for i in stored[c]]
+
+    def _lower(
+        self,
+        queries: np.ndarray,
+        ids: np.ndarray,
+        rows: np.ndarray,
+        best_idx: np.ndarray,
+        best_d2: np.ndarray,
+    ):
+        """Improve ``best_*`` in place with candidate ``ids[j]`` for query ``rows[j]``
+
+        Candidates must arrive grouped by row, as every gather here emits them.
+        """
+        if not len(ids):
+            return
+        diff = self._points[ids] - queries[rows]
+        d2 = np.einsum("ij,ij->i", diff, diff)
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        group_min = np.minimum.reduceat(d2, starts)
+        hits = np.flatnonzero(
+            d2 == np.repeat(group_min, np.diff(np.r_[starts, len(d2)]))
+        )
+        first = hits[np.r_[True, rows[hits][1:] != rows[hits][:-1]]]
+        first = first[d2[first] < best_d2[rows[first]]]
+        best_idx[rows[first]] = ids[first]
+        best_d2[rows[first]] = d2[first]
+
+    def _scan_slots(
+        self,
+        queries: np.ndarray,
+        rows: np.ndarray,
+        slots: np.ndarray,
+        best_idx: np.ndarray,
+        best_d2: np.ndarray,
+    ):
+        """Improve ``best_*`` with the members of occupied cell ``slots[j]``"""
+        found = [self._members[slot] for slot in slots.tolist()]
+        counts = np.fromiter(map(len, found), dtype=np.intp, count=len(found))
+        ids = np.fromiter(chain.from_iterable(found), dtype=np.intp, count=counts.sum())
+        self._lower(queries, ids, np.repeat(rows, counts), best_idx, best_d2)
+
+    def _search_cells(
+        self, queries: np.ndarray, best_idx: np.ndarray, best_d2: np.ndarray
+    ):
+        """Exact search over all occupied cells for queries the block left open"""
+        occupied = len(self._members)
+        if not occupied:
+            return
+        half = 0.5 * self.cell_size
+        centers = (self._corners[:occupied] + half).T.copy()
+        # Bound the (k, cells) temporaries for trees spread over many cells
+        chunk = max(1, (1 << 18) // occupied)
+        for begin in range(0, len(queries), chunk):
+            part = queries[begin : begin + chunk]
+            box_d2 = np.zeros((len(part), occupied))
+            for axis in range(3):
+                gap = np.abs(part[:, axis, None] - centers[axis]) - half
+                np.maximum(gap, 0.0, out=gap)
+                box_d2 += gap * gap
+            rows = np.arange(begin, begin + len(part))
+            # The closest box seeds a bound that rules out nearly every other
+            self._scan_slots(queries, rows, box_d2.argmin(axis=1), best_idx, best_d2)
+            hits, slots = np.nonzero(box_d2 < best_d2[rows, None])
+            self._scan_slots(queries, rows[hits], slots, best_idx, best_d2)
+
+    def nearest(self, query: np.ndarray) -> int:
+        return int(self.nearest_batch(np.asarray(query, dtype=float)[None, :])[0])
+
+    def nearest_batch(self, queries: np.ndarray) -> np.ndarray:
+        """Nearest point for each of ``(k, 3)`` queries
+
+        The 3x3x3 blocks of all queries are gathered and scanned in one pass.
+        A hit within one cell size cannot be beaten from outside the block;
+        the remaining queries go through one box-distance pass over the
+        occupied cells together.
+        """
+        queries = np.asarray(queries, dtype=float).reshape(-1, 3)
+        count = len(queries)
+        if self._size <= count * 27:
+            # Small trees: the brute-force scan is cheaper than the gather
+            return super().nearest_batch(queries)
+
+        keys = self._key(queries)
+        inside = ((keys >= 0) & (keys < self._dims)).all(axis=1)
+        blocks = (keys @ self._strides)[:, None] + self._shell(1)[None, :]
+        found = [
+            self._cells.get(cell, ())
+            for block in blocks[inside].tolist()
+            for cell in block
+        ]
+        counts = np.fromiter(map(len, found), dtype=np.intp, count=len(found))
+        ids = np.fromiter(chain.from_iterable(found), dtype=np.intp, count=counts.sum())
+        rows = np.repeat(np.repeat(np.flatnonzero(inside), blocks.shape[1]), counts)
+
+        best_idx = np.full(count, -1, dtype=np.intp)
+        best_d2 = np.full(count, np.inf)
+        self._lower(queries, ids, rows, best_idx, best_d2)
+        if self._outside:
+            outside = np.array(self._outside, dtype=np.intp)
+            diff = self._points[outside][None, :, :] - queries[:, None, :]
+            d2 = np.einsum("kni,kni->kn", diff, diff)
+            nearest = np.argmin(d2, axis=1)
+            d2 = d2[np.arange(count), nearest]
+            closer = d2 < best_d2
+            best_idx[closer] = outside[nearest[closer]]
+            best_d2[closer] = d2[closer]
+
+        uncertain = np.flatnonzero(~inside | (best_d2 > self.cell_size**2))
+        if len(uncertain):
+            idx, d2 = best_idx[uncertain], best_d2[uncertain]
+            self._search_cells(queries[uncertain], idx, d2)
+            best_idx[uncertain] = idx
+        return best_idx
+
+    def within_radius(self, query: np.ndarray, radius: float) -> np.ndarray:
+        query = np.asarray(query, dtype=float)
+        rings = max(int(np.ceil(radius / self.cell_size)), 1)
+        center = int(self._key(query) @ self._strides)
+        cells = np.concatenate([self._shell(r) for r in range(1, rings + 1)]) + center
+        # Wrapped offsets can alias the same cell, so deduplicate
+        cells = np.unique(cells[(cells >= 0) & (cells < self._cell_count)])
+        if len(cells) > self._size:
+            return LinearIndex.within_radius(self, query, radius)
+
+        candidates = self._gather(cells)
+        candidates.extend(self._outside)
+        return self._ball(np.array(candidates, dtype=np.intp), query, radius)
+
+
+class KDTreeIndex(LinearIndex):
+    """Batched KD-tree - rebuilt periodically, recent inserts scanned linearly
+
+    Points inserted since the last build sit in a pending tail that is
+    brute-forced; the tree is rebuilt once the tail outgrows
+    ``rebuild_factor * sqrt(n)``, which keeps both costs sublinear.
+    """
+
+    def __init__(
+        self, capacity: int = 1024, min_batch: int = 64, rebuild_factor: float = 4.0
+    ):
+        super().__init__(capacity)
+        self.min_batch = min_batch
+        self.rebuild_factor = rebuild_factor
+        self._tree = None
+        self._built = 0
+
+    def add(self, point: np.ndarray) -> int:
+        idx = super().add(point)
+        self._maybe_rebuild()
+        return idx
+
+    def add_batch(self, points: np.ndarray) -> np.ndarray:
+        ids = super().add_batch(points)
+        self._maybe_rebuild()
+        return ids
+
+    def _maybe_rebuild(self):
+        pending = self._size - self._built
+        if pending > max(self.min_batch, self.rebuild_factor * np.sqrt(self._size)):
+            self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the KD-tree over every stored point"""
+        self._tree = cKDTree(
+            self._points[: self._size].copy(), balanced_tree=False, compact_nodes=False
+        )
+        self._built = self._size
+
+    def nearest(self, query: np.ndarray) -> int:
+        query = np.asarray(query, dtype=float)
+        best_idx, best_d2 = -1, np.inf
+        if self._tree is not None:
+            dist, best_idx = self._tree.query(query)
+            best_idx, best_d2 = int(best_idx), float(dist) ** 2
+        if self._built < self._size:
+            idx, d2 = self._scan(query, self._built, self._size)
+            if d2 < best_d2:
+                best_idx = idx
+        return best_idx
+
+    def nearest_batch(self, queries: np.ndarray) -> np.ndarray:
+        queries = np.asarray(queries, dtype=float).reshape(-1, 3)
+        best_idx = np.full(len(queries), -1, dtype=np.intp)
+        best_d2 = np.full(len(queries), np.inf)
+        if self._tree is not None:
+            dist, best_idx = self._tree.query(queries)
+            best_idx, best_d2 = best_idx.astype(np.intp), dist**2
+        if self._built < self._size:
+            idx, d2 = self._scan_batch(queries, self._built, self._size)
+            closer = d2 < best_d2
+            best_idx[closer] = idx[closer]
+        return best_idx
+
+    def within_radius(self, query: np.ndarray, radius: float) -> np.ndarray:
+        query = np.asarray(query, dtype=float)
+        pending = self._ball(np.arange(self._built, self._size), query, radius)
+        if self._tree is None:
+            return pending
+        found = np.asarray(self._tree.query_ball_point(query, radius), dtype=np.intp)
+        return np.concatenate([found, pending])
+
+
+NN_BACKENDS = ("linear", "spatial_hash", "kdtree")
+
+
+def create_nn_index(
+    backend: str,
+    bounds: np.ndarray,
+    cell_size: float,
+    expected_nodes: Optional[int] = None,
+) -> LinearIndex:
+    """Create a nearest-neighbor index by backend name
+
+    Args:
+        backend: One of ``NN_BACKENDS``
+        bounds: Planning bounds [xmin, xmax, ymin, ymax, zmin, zmax]
+        cell_size: Grid cell edge length for the spatial hash
+        expected_nodes: Tree size the spatial hash should expect, which
+            floors its cell size
+
+    Returns:
+        Empty index ready for insertion
+    """
+    if backend == "linear":
+        return LinearIndex()
+    if backend == "spatial_hash":
+        return SpatialHashIndex(bounds, cell_size, expected_nodes=expected_nodes)
+    if backend == "kdtree":
+        return KDTreeIndex()
+    raise ValueError(
+        f"Unknown nearest-neighbor backend '{backend}', expected one of {NN_BACKENDS}"
+    )
@@ -0,0 +1,245 @@
+"""
+Voxel occupancy grid and signed distance field for static scenes
+
+An ``OccupancyGrid`` is an ``ObstacleField`` that also rasterizes its
+obstacles into voxels over the planning bounds. Each voxel is free, blocked
+(entirely inside an obstacle) or mixed, so a point query is one array lookup
+and only points in mixed voxels fall back to the exact obstacle test - the
+answers match ``ObstacleField`` exactly. A Euclidean distance transform of the
+voxels gives a clearance bound around any point, which lets edge checks and
+planner steps skip obstacles entirely in open space.
+
+Grids save to a directory of ``.npy`` files and load memory-mapped, so a
+large scene is ready without reading or rebuilding its voxels.
+"""
+
+import math
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+from .collision import ObstacleField
+
+# Voxel states, ordered so combining two obstacles is an elementwise maximum
+FREE = 0
+MIXED = 1
+BLOCKED = 2
+
+# Rasterization pads obstacles by this much (and shrinks them for BLOCKED),
+# so a point rounded into a neighboring voxel is still classified safely
+GRID_SLACK = 1e-9
+
+
+class OccupancyGrid(ObstacleField):
+    """Obstacle field with voxel occupancy and signed distance lookups
+
+    Args:
+        field: Obstacles to rasterize
+        bounds: Grid extent ``[x_min, x_max, y_min, y_max, z_min, z_max]``;
+            points outside it use the exact obstacle tests
+        resolution: Voxel edge length
+        states: Precomputed voxel states, e.g. from ``load``
+        signed_distance: Precomputed distance field matching ``states``
+    """
+
+    def __init__(
+        self,
+        field: ObstacleField,
+        bounds: np.ndarray,
+        resolution: float = 0.02,
+        states: Optional[np.ndarray] = None,
+        signed_distance: Optional[np.ndarray] = None,
+    ):
+        super().__init__(
+            field.sphere_centers,
+            field.sphere_radii,
+            field.cube_centers,
+            field.cube_sizes,
+            field.sphere_colors,
+            field.cube_colors,
+        )
+        if resolution <= 0:
+            raise ValueError("Voxel resolution must be positive")
+        self.bounds = np.asarray(bounds, dtype=float).reshape(6)
+        self.resolution = float(resolution)
+        self._low = self.bounds[0::2]
+        extent = self.bounds[1::2] - self._low
+        cells = np.maximum(np.ceil(extent / resolution), 1)
+        self.shape = tuple(int(n) for n in cells)
+
+        self.states = self._rasterize() if states is None else states
+        if self.states.shape != self.shape:
+            raise ValueError(f"Voxel states {self.states.shape} != grid {self.shape}")
+        # Distance between voxel centers, negative inside non-free voxels
+        self.signed_distance = (
+            self._distance_field() if signed_distance is None else signed_distance
+        )
+        # Worst case from a point to its voxel center plus an obstacle point to
+        # its voxel center, with room for float32 round-off
+        self._margin = math.sqrt(3) * self.resolution + 1e-6
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "OccupancyGrid":
+        """Grid written by ``save``; voxel arrays are memory-mapped by default"""
+        path = Path(path)
+        mode = "r" if mmap else None
+        header = np.load(path / "grid.npy")
+        return cls(
+            ObstacleField.from_array(np.load(path / "obstacles.npy")),
+            header[:6],
+            float(header[6]),
+            np.load(path / "states.npy", mmap_mode=mode),
+            np.load(path / "signed_distance.npy", mmap_mode=mode),
+        )
+
+    def save(self, path: Union[str, Path]):
+        """Write the grid as ``.npy`` files in directory ``path``"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "grid.npy", np.append(self.bounds, self.resolution))
+        np.save(path / "obstacles.npy", self.to_array())
+        np.save(path / "states.npy", np.asarray(self.states))
+        np.save(path / "signed_distance.npy", np.asarray(self.signed_distance))
+
+    def contains(self, point: np.ndarray) -> bool:
+        """True if ``point`` lies inside any obstacle"""
+        voxel = self._voxel(point)
+        if voxel is None:
+            return super().contains(point)
+        state = self.states[voxel]
+        if state == MIXED:
+            return super().contains(point)
+        return state == BLOCKED
+
+    def contains_batch(self, points: np.ndarray) -> np.ndarray:
+        """Per-point collision flags for ``points`` of shape (k, 3)"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        voxels, inside = self._voxels(points)
+        states = np.full(len(points), MIXED, dtype=np.uint8)
+        states[inside] = self.states[tuple(voxels[inside].T)]
+        hit = states == BLOCKED
+        exact = states == MIXED
+        if exact.any():
+            hit[exact] = super().contains_batch(points[exact])
+        return hit
+
+    def clearance(self, points: np.ndarray) -> Union[float, np.ndarray]:
+        """Distance below which no obstacle lies around each point
+
+        A strict lower bound on the distance to the nearest obstacle: zero in
+        non-free voxels and outside the grid, otherwise the voxel's distance
+        field value less one voxel diagonal. A single ``(3,)`` point gives a
+        float, ``(k, 3)`` points an array.
+        """
+        points = np.asarray(points, dtype=float)
+        if points.ndim == 1:
+            voxel = self._voxel(points)
+            if voxel is None:
+                return 0.0
+            return max(float(self.signed_distance[voxel]) - self._margin, 0.0)
+        voxels, inside = self._voxels(points)
+        clearance = np.zeros(len(points))
+        distance = self.signed_distance[tuple(voxels[inside].T)]
+        clearance[inside] = np.maximum(distance - self._margin, 0.0)
+        return clearance
+
+    def segments_collide(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Exact per-edge collision flags for ``starts``/``ends`` of shape (k, 3)
+
+        Edges covered by the free balls around their two endpoints are free
+        without testing any obstacle.
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        covered = self.clearance(starts) + self.clearance(ends) > lengths
+        hit = np.zeros(len(starts), dtype=bool)
+        if not covered.all():
+            hit[~covered] = super().segments_collide(starts[~covered], ends[~covered])
+        return hit
+
+    def _voxel(self, point: np.ndarray) -> Optional[Tuple[int, int, int]]:
+        """Voxel index of one point, or None outside the grid"""
+        cell = (point - self._low) / self.resolution
+        x, y, z = float(cell[0]), float(cell[1]), float(cell[2])
+        nx, ny, nz = self.shape
+        if not (0 <= x < nx and 0 <= y < ny and 0 <= z < nz):
+            return None
+        return int(x), int(y), int(z)
+
+    def _voxels(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Voxel indices of ``(k, 3)`` points and which lie inside the grid"""
+        cells = np.floor((points - self._low) / self.resolution)
+        inside = ((cells >= 0) & (cells < self.shape)).all(axis=1)
+        return cells.astype(np.intp), inside
+
+    def _rasterize(self) -> np.ndarray:
+        """Voxel states, visiting only the voxels near each obstacle"""
+        states = np.zeros(self.shape, dtype=np.uint8)
+        faces = [
+            self._low[axis] + self.resolution * np.arange(self.shape[axis] + 1)
+            for axis in range(3)
+        ]
+        obstacles = [
+            (center, radius, True)
+            for center, radius in zip(self.sphere_centers, self.sphere_radii)
+        ] + [
+            (center, half, False)
+            for center, half in zip(self.cube_centers, self.cube_half_sizes)
+        ]
+        for center, extent, is_sphere in obstacles:
+            # Voxels overlapping the obstacle's bounding box, one extra each side
+            first = np.floor((center - extent - self._low) / self.resolution) - 1
+            last = np.floor((center + extent - self._low) / self.resolution) + 2
+            first = np.clip(first, 0, self.shape).astype(int)
+            last = np.clip(last, 0, self.shape).astype(int)
+            if np.any(first >= last):
+                continue
+            block = tuple(slice(a, b) for a, b in zip(first, last))
+
+            # Voxel faces relative to the center, one axis per array dimension
+            lower, upper = [], []
+            for axis in range(3):
+                shape = [1, 1, 1]
+                shape[axis] = -1
+                axis_faces = faces[axis][first[axis] : last[axis] + 1] - center[axis]
+                lower.append(axis_faces[:-1].reshape(shape))
+                upper.append(axis_faces[1:].reshape(shape))
+
+            if is_sphere:
+                # Nearest and farthest voxel point from the center
+                near = sum(
+                    np.maximum(np.maximum(lo, -up), 0.0) ** 2
+                    for lo, up in zip(lower, upper)
+                )
+                far = sum(np.maximum(-lo, up) ** 2 for lo, up in zip(lower, upper))
+                touches = near <= (extent + GRID_SLACK) ** 2
+                covered = far <= (extent - GRID_SLACK) ** 2
+            else:
+                touches = np.ones((1, 1, 1), dtype=bool)
+                covered = np.ones((1, 1, 1), dtype=bool)
+                for lo, up in zip(lower, upper):
+                    touches = touches & (up >= -extent - GRID_SLACK)
+                    touches = touches & (lo <= extent + GRID_SLACK)
+                    covered = covered & (lo >= -extent + GRID_SLACK)
+                    covered = covered & (up <= extent - GRID_SLACK)
+
+            state = np.where(covered, BLOCKED, np.where(touches, MIXED, FREE))
+            view = states[block]
+            np.maximum(view, state.astype(np.uint8), out=view)
+        return states
+
+    def _distance_field(self) -> np.ndarray:
+        """Signed distance between voxel centers (Euclidean distance transform)"""
+        free = self.states == FREE
+        if free.all():
+            # No obstacle anywhere: clearance is limited only by the grid
+            return np.full(self.shape, np.inf, dtype=np.float32)
+        outside = distance_transform_edt(free, sampling=self.resolution)
+        if free.any():
+            inside = distance_transform_edt(~free, sampling=self.resolution)
+        else:
+            inside = np.zeros(self.shape)
+        return (outside - inside).astype(np.float32)
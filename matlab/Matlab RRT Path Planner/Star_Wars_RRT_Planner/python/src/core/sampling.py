@@ -0,0 +1,153 @@
+"""
+Block-buffered random sampling for the planners
+
+Drawing one scalar at a time from ``random`` costs a Python call per
+coordinate. ``UniformSampler`` instead pulls ``(batch, 3)`` points and
+``batch`` goal-bias coins from an explicit ``numpy.random.Generator`` and
+hands them out row by row, so a seeded generator reproduces a run exactly.
+``InformedSampler`` narrows the points to the informed set of the best path
+found so far.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+# Blocks drawn before giving up on an informed set that misses the bounds
+INFORMED_ATTEMPTS = 64
+
+
+class UniformSampler:
+    """Uniform points within ``[x_min, x_max, y_min, y_max, z_min, z_max]``"""
+
+    def __init__(
+        self,
+        bounds: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+        batch: int = 256,
+    ):
+        bounds = np.asarray(bounds, dtype=float)
+        self.low = bounds[0::2]
+        self.high = bounds[1::2]
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.batch = max(int(batch), 1)
+        self._points = np.empty((0, 3))
+        self._coins = np.empty(0)
+        self._next_point = 0
+        self._next_coin = 0
+
+    def point(self) -> np.ndarray:
+        """Next uniform point in the bounds, shape (3,)"""
+        if self._next_point == len(self._points):
+            self._points = self._draw_points()
+            self._next_point = 0
+        point = self._points[self._next_point]
+        self._next_point += 1
+        return point
+
+    def coin(self) -> float:
+        """Next uniform draw from [0, 1)"""
+        if self._next_coin == len(self._coins):
+            self._coins = self.rng.random(self.batch)
+            self._next_coin = 0
+        coin = self._coins[self._next_coin]
+        self._next_coin += 1
+        return float(coin)
+
+    def points(self, count: int) -> np.ndarray:
+        """Next ``count`` points of the same stream as ``point``, shape (count, 3)"""
+        chunks = []
+        while count > 0:
+            if self._next_point == len(self._points):
+                self._points = self._draw_points()
+                self._next_point = 0
+            chunk = self._points[self._next_point : self._next_point + count]
+            self._next_point += len(chunk)
+            count -= len(chunk)
+            chunks.append(chunk)
+        return np.concatenate(chunks) if chunks else np.empty((0, 3))
+
+    def coins(self, count: int) -> np.ndarray:
+        """Next ``count`` draws of the same stream as ``coin``"""
+        chunks = []
+        while count > 0:
+            if self._next_coin == len(self._coins):
+                self._coins = self.rng.random(self.batch)
+                self._next_coin = 0
+            chunk = self._coins[self._next_coin : self._next_coin + count]
+            self._next_coin += len(chunk)
+            count -= len(chunk)
+            chunks.append(chunk)
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+    def _draw_points(self) -> np.ndarray:
+        return self.rng.uniform(self.low, self.high, (self.batch, 3))
+
+
+class InformedSampler(UniformSampler):
+    """``UniformSampler`` that narrows to the informed set once a cost is known
+
+    Only points with ``|x - start| + |x - goal| <= best_cost`` can lie on a
+    path shorter than ``best_cost``; they fill a prolate spheroid with foci
+    at start and goal (Gammell et al., 2014). Until ``set_cost`` is called
+    the sampler draws exactly what ``UniformSampler`` would.
+    """
+
+    def __init__(
+        self,
+        bounds: np.ndarray,
+        start: np.ndarray,
+        goal: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+        batch: int = 256,
+    ):
+        super().__init__(bounds, rng, batch)
+        self.start = np.asarray(start, dtype=float)
+        self.goal = np.asarray(goal, dtype=float)
+        self.center = (self.start + self.goal) / 2
+        offset = self.goal - self.start
+        self.min_cost = float(np.linalg.norm(offset))
+        axis = offset / self.min_cost if self.min_cost > 0 else np.eye(3)[0]
+        # Orthonormal frame whose first column is the start-goal axis
+        rotation, _ = np.linalg.qr(np.column_stack([axis, np.eye(3)]))
+        rotation[:, 0] *= np.sign(rotation[:, 0] @ axis)
+        self._rotation = rotation
+        self.best_cost = math.inf
+
+    def set_cost(self, cost: float):
+        """Narrow sampling to points that could beat a path of length ``cost``"""
+        if cost < self.best_cost:
+            self.best_cost = float(cost)
+            # Buffered points were drawn from the larger set
+            self._points = np.empty((0, 3))
+            self._next_point = 0
+
+    def _draw_points(self) -> np.ndarray:
+        """Next block, drawn from the smaller of spheroid and bounds box"""
+        if not math.isfinite(self.best_cost):
+            return super()._draw_points()
+        transverse = self.best_cost / 2
+        conjugate = math.sqrt(max(self.best_cost**2 - self.min_cost**2, 0.0)) / 2
+        spheroid = 4.0 / 3.0 * math.pi * transverse * conjugate**2
+        box = float(np.prod(self.high - self.low))
+        radii = np.array([transverse, conjugate, conjugate])
+        for _ in range(INFORMED_ATTEMPTS):
+            if spheroid < box:
+                # Uniform in the unit ball, stretched and rotated onto the
+                # spheroid, then clipped to the bounds by rejection
+                directions = self.rng.normal(size=(self.batch, 3))
+                directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+                ball = directions * np.cbrt(self.rng.random(self.batch))[:, None]
+                points = self.center + (ball * radii) @ self._rotation.T
+                keep = ((points >= self.low) & (points <= self.high)).all(axis=1)
+            else:
+                points = super()._draw_points()
+                keep = (
+                    np.linalg.norm(points - self.start, axis=1)
+                    + np.linalg.norm(points - self.goal, axis=1)
+                    <= self.best_cost
+                )
+            if keep.any():
+                return points[keep]
+        return super()._draw_points()
@@ -0,0 +1,221 @@
+"""
+Obstacle scenes - MATLAB CSV files, binary copies and seeded random fields
+
+Scene CSVs hold one ``[type, x, y, z, size, r, g, b]`` row per obstacle, as
+written by the MATLAB RRT. The ``obstacles3D_space_custom_*.csv`` variants
+start with a ``-1`` row carrying the planning bounds
+``x_min, x_max, y_min, y_max, z_min, z_max``. ``.npy`` scenes hold the same
+rows as a float array.
+
+``load_scene`` parses a CSV once and then reads a binary ``.npy`` copy kept
+in a ``__scenecache__`` directory beside it, named after the CSV's mtime and
+size so an edited file is parsed again.
+"""
+
+import functools
+import os
+import warnings
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .collision import CUBE, SPHERE, ObstacleField, as_obstacle_field
+
+BOUNDS_ROW = -1
+SCENE_COLUMNS = 8
+CACHE_DIR = "__scenecache__"
+
+
+def load_scene(
+    path: Union[str, Path], cache: bool = True
+) -> Tuple[ObstacleField, Optional[np.ndarray]]:
+    """Read a scene CSV or ``.npy`` file, reusing parsed copies of CSVs
+
+    Parsed rows are memoized per path, mtime and size, so reloading an
+    unchanged scene costs one ``stat``.
+
+    Args:
+        path: Scene file; ``.npy`` files are read as binary rows
+        cache: Read and write the ``__scenecache__`` copy of a CSV; when the
+            directory is not writable the CSV is parsed on every load, with a
+            warning
+
+    Returns:
+        The packed obstacles and the bounds from the header row, or None when
+        the file has no bounds row
+
+    Raises:
+        ValueError: If a row is not a valid sphere, cube or bounds row
+    """
+    source = Path(path).resolve()
+    stat = source.stat()
+    rows = _cached_rows(str(source), stat.st_mtime_ns, stat.st_size, cache)
+    return _unpack(rows)
+
+
+def load_scene_csv(
+    path: Union[str, Path],
+) -> Tuple[ObstacleField, Optional[np.ndarray]]:
+    """Parse a MATLAB obstacle CSV, bypassing every cache
+
+    Returns:
+        The packed obstacles and the bounds from the header row, or None when
+        the file has no bounds row
+    """
+    return _unpack(_validate_rows(_parse_csv(path), path))
+
+
+def save_scene(path: Union[str, Path], obstacles, bounds: Optional[np.ndarray] = None):
+    """Write a scene as MATLAB CSV, or as binary rows for a ``.npy`` path
+
+    Args:
+        path: Destination file
+        obstacles: ``ObstacleField`` or list of ``Obstacle`` dataclasses
+        bounds: Planning bounds, written as a leading ``-1`` row when given
+    """
+    path = Path(path)
+    rows = as_obstacle_field(obstacles).to_array()
+    if bounds is not None:
+        header = np.full((1, SCENE_COLUMNS), np.nan)
+        header[0, 0] = BOUNDS_ROW
+        header[0, 1:7] = np.asarray(bounds, dtype=float).reshape(6)
+        rows = np.vstack([header, rows])
+    if path.suffix.lower() == ".npy":
+        np.save(path, rows)
+        return
+    with open(path, "w") as handle:
+        if bounds is not None:
+            # Seven values and a trailing comma, like the MATLAB custom scenes
+            handle.write(",".join(repr(float(v)) for v in rows[0, :7]) + ",\n")
+            rows = rows[1:]
+        np.savetxt(handle, rows, fmt="%.17g", delimiter=",")
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_rows(path: str, mtime_ns: int, size: int, cache: bool) -> np.ndarray:
+    source = Path(path)
+    copy = None
+    if source.suffix.lower() == ".npy":
+        rows = np.load(source)
+    elif not cache:
+        rows = _parse_csv(source)
+    else:
+        copy = source.parent / CACHE_DIR / f"{source.name}.{mtime_ns}-{size}.npy"
+        try:
+            rows, copy = np.load(copy), None
+        except (OSError, ValueError):
+            rows = _parse_csv(source)
+    rows = _validate_rows(rows, source)
+    if copy is not None:
+        _write_copy(copy, rows)
+    rows.setflags(write=False)
+    return rows
+
+
+def _write_copy(copy: Path, rows: np.ndarray):
+    """Atomically replace the cached copy of a CSV, dropping stale ones
+
+    A failed write only warns: the scene is still loaded, just parsed again
+    by the next process.
+    """
+    scratch = copy.with_name(f"{copy.name}.{os.getpid()}.tmp")
+    try:
+        copy.parent.mkdir(exist_ok=True)
+        with open(scratch, "wb") as handle:
+            np.save(handle, rows)
+        os.replace(scratch, copy)
+        csv_name = copy.name.rsplit(".", 2)[0]
+        for stale in copy.parent.glob(f"{csv_name}.*.npy"):
+            if stale != copy and stale.name.rsplit(".", 2)[0] == csv_name:
+                stale.unlink(missing_ok=True)
+    except OSError as error:
+        warnings.warn(
+            f"Could not cache {copy.name} in {copy.parent}: {error}", RuntimeWarning
+        )
+        if scratch.exists():
+            scratch.unlink()
+
+
+def _parse_csv(path: Union[str, Path]) -> np.ndarray:
+    rows = np.atleast_2d(np.genfromtxt(path, delimiter=",", dtype=float))
+    return rows if rows.size else np.empty((0, SCENE_COLUMNS))
+
+
+def _validate_rows(rows: np.ndarray, source) -> np.ndarray:
+    """``(n, 8)`` float rows, raising ``ValueError`` naming the first bad row"""
+    rows = np.asarray(rows, dtype=float)
+    if rows.ndim != 2 or (len(rows) and rows.shape[1] < SCENE_COLUMNS):
+        raise ValueError(
+            f"{source}: expected rows of {SCENE_COLUMNS} values "
+            f"[type, x, y, z, size, r, g, b], got shape {rows.shape}"
+        )
+    rows = rows[:, :SCENE_COLUMNS]
+    first = 0
+    if len(rows) and rows[0, 0] == BOUNDS_ROW:
+        bounds = rows[0, 1:7]
+        if not np.isfinite(bounds).all() or np.any(bounds[0::2] >= bounds[1::2]):
+            raise ValueError(f"{source}: row 1: bounds need min < max per axis")
+        first = 1
+
+    body = rows[first:]
+    problems = (
+        (~np.isfinite(body).all(axis=1), "non-finite value"),
+        (~np.isin(body[:, 0], (SPHERE, CUBE)), f"type not {SPHERE} or {CUBE}"),
+        (~(body[:, 4] > 0), "size not positive"),
+    )
+    for bad, reason in problems:
+        if bad.any():
+            row = first + int(np.argmax(bad)) + 1
+            raise ValueError(f"{source}: row {row}: {reason}")
+    return rows
+
+
+def _unpack(rows: np.ndarray) -> Tuple[ObstacleField, Optional[np.ndarray]]:
+    bounds = None
+    if len(rows) and rows[0, 0] == BOUNDS_ROW:
+        bounds, rows = rows[0, 1:7].copy(), rows[1:]
+    return ObstacleField.from_array(rows), bounds
+
+
+def random_scene(
+    num_obstacles: int,
+    bounds: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+    size_range: Tuple[float, float] = (0.02, 0.08),
+    clear: Sequence[np.ndarray] = (),
+) -> ObstacleField:
+    """Uniformly placed spheres and cubes, none covering a ``clear`` point
+
+    Args:
+        num_obstacles: Number of obstacles in the field
+        bounds: Planning bounds ``[x_min, x_max, y_min, y_max, z_min, z_max]``
+        rng: Random generator; seed it for a repeatable field
+        size_range: Sphere radius / cube edge range
+        clear: Points (e.g. start and goal) that must stay collision-free
+
+    Returns:
+        Packed obstacle field with exactly ``num_obstacles`` obstacles
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    bounds = np.asarray(bounds, dtype=float)
+    clear = np.asarray(clear, dtype=float).reshape(-1, 3)
+    rows = np.empty((0, 8))
+    while len(rows) < num_obstacles:
+        count = 2 * (num_obstacles - len(rows))
+        batch = np.column_stack(
+            [
+                rng.integers(0, 2, count),
+                rng.uniform(bounds[0::2], bounds[1::2], (count, 3)),
+                rng.uniform(*size_range, count),
+                rng.uniform(0.3, 0.7, (count, 3)),
+            ]
+        )
+        # Same inclusive tests as ObstacleField.contains, per candidate row
+        offset = clear[None, :, :] - batch[:, None, 1:4]
+        size = batch[:, 4:5]
+        in_sphere = np.einsum("kci,kci->kc", offset, offset) <= size**2
+        in_cube = (np.abs(offset) <= size[:, :, None] / 2).all(axis=2)
+        hit = np.where(batch[:, :1] == SPHERE, in_sphere, in_cube).any(axis=1)
+        rows = np.vstack([rows, batch[~hit]])
+    return ObstacleField.from_array(rows[:num_obstacles])
@@ -0,0 +1,137 @@
+"""
+Path post-processing - randomized shortcutting and smooth resampling
+
+Raw RRT paths are ``step_size``-spaced tree vertices. Shortcutting removes
+detours with collision-checked straight edges, and resampling turns the
+remaining waypoints into a fixed number of points on a smooth curve.
+"""
+
+from typing import Optional
+
+import numpy as np
+from scipy.interpolate import BSpline, make_interp_spline
+
+from .collision import ObstacleField
+
+SMOOTHING_METHODS = ("shortcut", "bspline", "min_jerk")
+
+
+def shortcut_path(
+    path: np.ndarray,
+    obstacles: ObstacleField,
+    attempts: int = 200,
+    batch: int = 32,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Randomized shortcutting with batched edge checks
+
+    Each round draws ``batch`` random waypoint pairs, checks all the direct
+    edges in one call and splices in the free shortcut that skips the most
+    waypoints. Endpoints are always kept.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    path = np.asarray(path, dtype=float)
+    for _ in range(max(attempts // batch, 1)):
+        if len(path) <= 2:
+            break
+        pairs = np.sort(rng.integers(0, len(path), (batch, 2)), axis=1)
+        pairs = pairs[pairs[:, 1] - pairs[:, 0] > 1]
+        if not len(pairs):
+            continue
+        free = ~obstacles.segments_collide(path[pairs[:, 0]], path[pairs[:, 1]])
+        if not free.any():
+            continue
+        candidates = pairs[free]
+        i, j = candidates[np.argmax(candidates[:, 1] - candidates[:, 0])]
+        path = np.vstack([path[: i + 1], path[j:]])
+    return path
+
+
+def resample_linear(path: np.ndarray, num_points: int) -> np.ndarray:
+    """Evenly spaced points along the polyline, endpoints included"""
+    arc = _arc_length(path)
+    targets = np.linspace(0.0, arc[-1], num_points)
+    return np.column_stack([np.interp(targets, arc, path[:, k]) for k in range(3)])
+
+
+def resample_bspline(path: np.ndarray, num_points: int, degree: int = 3) -> np.ndarray:
+    """Clamped B-spline with the waypoints as control points
+
+    The curve starts and ends on the path endpoints and stays inside the
+    convex hull of each run of ``degree + 1`` waypoints.
+    """
+    path = np.asarray(path, dtype=float)
+    degree = min(degree, len(path) - 1)
+    if degree < 2:
+        return resample_linear(path, num_points)
+    interior = np.linspace(0.0, 1.0, len(path) - degree + 1)[1:-1]
+    knots = np.concatenate([np.zeros(degree + 1), interior, np.ones(degree + 1)])
+    return BSpline(knots, path, degree)(np.linspace(0.0, 1.0, num_points))
+
+
+def resample_min_jerk(path: np.ndarray, num_points: int) -> np.ndarray:
+    """Quintic spline through the waypoints, at rest at both ends
+
+    Parameterized by chord length; with zero velocity and acceleration at the
+    endpoints this is the minimum-jerk curve through the waypoints.
+    """
+    path = np.asarray(path, dtype=float)
+    arc = _arc_length(path)
+    # Spline knots need a strictly increasing parameter
+    keep = np.concatenate([[True], np.diff(arc) > 0])
+    path, arc = path[keep], arc[keep]
+    if len(path) < 3:
+        return resample_linear(path, num_points)
+    rest = [(1, np.zeros(3)), (2, np.zeros(3))]
+    degree = 5 if len(path) >= 4 else 3
+    spline = make_interp_spline(
+        arc / arc[-1],
+        path,
+        k=degree,
+        bc_type=(rest[: degree // 2], rest[: degree // 2]),
+    )
+    return spline(np.linspace(0.0, 1.0, num_points))
+
+
+def smooth_path(
+    path: np.ndarray,
+    obstacles: ObstacleField,
+    method: str = "bspline",
+    num_points: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Shortcut a planned path, then optionally resample it
+
+    Args:
+        path: Raw planner waypoints, shape (n, 3)
+        obstacles: Collision engine used for shortcuts and curve validation
+        method: One of ``SMOOTHING_METHODS``; "shortcut" skips resampling
+        num_points: Target waypoint count for the resampled curve; defaults
+            to the shortcut waypoint count
+        rng: Random generator for shortcut pair selection
+
+    Returns:
+        Smoothed path with the exact start and goal; if the resampled curve
+        would clip an obstacle the shortcut polyline is returned instead
+    """
+    if method not in SMOOTHING_METHODS:
+        raise ValueError(
+            f"Unknown smoothing method '{method}', expected one of {SMOOTHING_METHODS}"
+        )
+    short = shortcut_path(path, obstacles, rng=rng)
+    if method == "shortcut":
+        return short
+
+    num_points = num_points or len(short)
+    resample = resample_bspline if method == "bspline" else resample_min_jerk
+    curve = resample(short, num_points)
+    if obstacles.segments_collide(curve[:-1], curve[1:]).any():
+        return short
+    curve[[0, -1]] = short[[0, -1]]
+    return curve
+
+
+def _arc_length(path: np.ndarray) -> np.ndarray:
+    """Cumulative distance along the path, starting at 0"""
+    steps = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    return np.concatenate([[0.0], np.cumsum(steps)])
@@ -0,0 +1,104 @@
+"""
+Opt-in planner instrumentation
+
+A ``PlannerStats`` attached to ``RRTPlanner.stats`` accumulates nanosecond
+timers per planning phase, event counters and a tree-size growth curve over
+every ``plan_path`` call until ``reset``. The planner only touches it behind
+an ``is not None`` check, so leaving ``stats`` unset costs one comparison
+per phase. Tree extensions outside ``plan_path`` (the replanning pursuer)
+still add to the phase timers and counters, but not to ``total`` or the
+growth curve.
+"""
+
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Timed phases; "steering" is the rest of the plan time - stepping toward
+# samples, tree and index updates and RRT* rewiring
+PHASES = ("sampling", "nearest", "collision", "smoothing", "steering")
+COUNTERS = (
+    "plans",
+    "iterations",
+    "samples",
+    "goal_samples",
+    "nearest_queries",
+    "collision_checks",
+    "rejections",
+    "nodes",
+)
+
+
+class PlannerStats:
+    """Cumulative phase timers, counters and tree growth of a planner
+
+    Args:
+        growth_interval: Iterations between points of the growth curve
+    """
+
+    def __init__(self, growth_interval: int = 100):
+        self.growth_interval = max(int(growth_interval), 1)
+        self.reset()
+
+    def reset(self):
+        """Zero every timer and counter and drop the growth curve"""
+        self.timers_ns: Dict[str, int] = dict.fromkeys(PHASES + ("total",), 0)
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        # (plan, iteration, nodes, nanoseconds since the plan started)
+        self.growth: List[Tuple[int, int, int, int]] = []
+        self._plan_start = 0
+        self._timed_at_start = 0
+        self._planning = False
+
+    def charge(self, phase: str, since_ns: int) -> int:
+        """Add the time since ``since_ns`` to ``phase``; returns the time now"""
+        now = time.perf_counter_ns()
+        self.timers_ns[phase] += now - since_ns
+        return now
+
+    def begin_plan(self):
+        self.counts["plans"] += 1
+        self._timed_at_start = self._timed_ns()
+        self._planning = True
+        self._plan_start = time.perf_counter_ns()
+
+    def record_growth(self, iteration: int, nodes: int):
+        if not self._planning:
+            return
+        elapsed = time.perf_counter_ns() - self._plan_start
+        self.growth.append((self.counts["plans"], iteration, nodes, elapsed))
+
+    def end_plan(self, iterations: int, nodes: int):
+        elapsed = time.perf_counter_ns() - self._plan_start
+        self._planning = False
+        self.timers_ns["total"] += elapsed
+        timed = self._timed_ns() - self._timed_at_start
+        self.timers_ns["steering"] += max(elapsed - timed, 0)
+        self.counts["iterations"] += iterations
+        self.counts["nodes"] += nodes
+        if not self.growth or self.growth[-1][:2] != (self.counts["plans"], iterations):
+            self.growth.append((self.counts["plans"], iterations, nodes, elapsed))
+
+    def to_dict(self) -> Dict:
+        """Plain ``dict`` of timers, counters and the columnar growth curve"""
+        plans, iterations, nodes, elapsed = (
+            [list(column) for column in zip(*self.growth)]
+            if self.growth
+            else ([], [], [], [])
+        )
+        return {
+            "timers_ns": dict(self.timers_ns),
+            "counts": dict(self.counts),
+            "growth": {
+                "plan": plans,
+                "iteration": iterations,
+                "nodes": nodes,
+                "elapsed_ns": elapsed,
+            },
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def _timed_ns(self) -> int:
+        return sum(self.timers_ns[phase] for phase in PHASES if phase != "steering")
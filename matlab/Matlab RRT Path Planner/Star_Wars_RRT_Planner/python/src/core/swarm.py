@@ -0,0 +1,206 @@
+"""
+Vectorized multi-agent pursuit - many pursuers and targets as arrays
+
+A ``Swarm`` keeps every ship's position, velocity, role and capture flag in
+struct-of-arrays form, and ``SwarmPursuit.step`` advances all of them at
+once with the ``PursuitAI`` rules: targets flee the nearest pursuer inside
+the evasion radius and otherwise wander between held goals, pursuers chase the
+nearest target still free, and a target is captured once a pursuer is inside
+the capture radius. Moves are clipped to the bounds, and moves that would
+cross an obstacle are replaced by the best-aligned free detour.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .collision import ObstacleField
+from .goals import GoalTracker, goal_set
+
+PURSUER = 0
+TARGET = 1
+
+# Detour directions tried per blocked ship, and how far they stray from the
+# desired heading (std. dev. of the perturbation of the unit direction)
+DETOUR_CANDIDATES = 8
+DETOUR_SPREAD = 1.0
+
+
+class Swarm:
+    """Positions, velocities, roles and capture flags of ``n`` ships"""
+
+    def __init__(
+        self,
+        positions: np.ndarray,
+        roles: np.ndarray,
+        velocities: Optional[np.ndarray] = None,
+    ):
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        self.roles = np.asarray(roles, dtype=np.int8).reshape(-1)
+        if len(self.roles) != len(self.positions):
+            raise ValueError("Need one role per position")
+        self.velocities = (
+            np.zeros_like(self.positions)
+            if velocities is None
+            else np.array(velocities, dtype=float).reshape(-1, 3)
+        )
+        self.captured = np.zeros(len(self.positions), dtype=bool)
+
+    @classmethod
+    def random(
+        cls,
+        num_pursuers: int,
+        num_targets: int,
+        bounds: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+        obstacles: Optional[ObstacleField] = None,
+    ) -> "Swarm":
+        """Pursuers then targets at uniform positions outside every obstacle"""
+        rng = rng if rng is not None else np.random.default_rng()
+        bounds = np.asarray(bounds, dtype=float)
+        count = num_pursuers + num_targets
+        positions = np.empty((0, 3))
+        while len(positions) < count:
+            batch = rng.uniform(bounds[0::2], bounds[1::2], (2 * count, 3))
+            if obstacles is not None:
+                batch = batch[~obstacles.contains_batch(batch)]
+            positions = np.vstack([positions, batch])
+        roles = np.repeat([PURSUER, TARGET], [num_pursuers, num_targets])
+        return cls(positions[:count], roles)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def pursuers(self) -> np.ndarray:
+        """Indices of the pursuers"""
+        return np.flatnonzero(self.roles == PURSUER)
+
+    @property
+    def targets(self) -> np.ndarray:
+        """Indices of the targets"""
+        return np.flatnonzero(self.roles == TARGET)
+
+    @property
+    def free_targets(self) -> np.ndarray:
+        """Indices of the targets not yet captured"""
+        return np.flatnonzero((self.roles == TARGET) & ~self.captured)
+
+
+class SwarmPursuit:
+    """One vectorized pursuit step for every ship of a ``Swarm``"""
+
+    def __init__(
+        self,
+        bounds: np.ndarray,
+        obstacles: Optional[ObstacleField] = None,
+        rng: Optional[np.random.Generator] = None,
+        evasion_radius: float = 0.15,
+        capture_radius: float = 0.05,
+        pursuer_speed: float = 0.02,
+        target_speed: float = 0.015,
+        dwell_time: float = 0.5,
+        goal_spacing: float = 0.25,
+    ):
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.obstacles = obstacles
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.evasion_radius = evasion_radius
+        self.capture_radius = capture_radius
+        self.pursuer_speed = pursuer_speed
+        self.target_speed = target_speed
+        # Goal state per ship index; only target rows are used
+        self.goals = GoalTracker(
+            goal_set(self.bounds, goal_spacing), 0, dwell_time, self.rng
+        )
+
+    def step(self, swarm: Swarm, dt: float = 1 / 60) -> np.ndarray:
+        """Move every ship once and mark captures, updating ``swarm`` in place
+
+        Returns:
+            Indices of the targets captured in this step
+        """
+        pursuers, targets = swarm.pursuers, swarm.free_targets
+        if len(self.goals) != len(swarm):
+            self.goals.reset(len(swarm))
+        start = swarm.positions.copy()
+        if len(pursuers) == 0 or len(targets) == 0:
+            swarm.velocities[:] = 0.0
+            return np.empty(0, dtype=np.int64)
+
+        # Targets: flee the nearest pursuer when it is close, else seek a goal
+        distances = _pairwise_distances(start[targets], start[pursuers])
+        nearest = distances.argmin(axis=1)
+        threatened = distances[np.arange(len(targets)), nearest] < self.evasion_radius
+        steps = np.empty((len(targets), 3))
+        steps[threatened] = self.target_speed * _unit(
+            start[targets[threatened]] - start[pursuers[nearest[threatened]]]
+        )
+        calm = targets[~threatened]
+        steps[~threatened] = self.goals.steps(
+            start[calm], self.target_speed, dt, self.obstacles, calm
+        )
+        swarm.positions[targets] = self._move(start[targets], steps)
+
+        # Capture against the moved targets, then chase those still free
+        distances = _pairwise_distances(swarm.positions[targets], start[pursuers])
+        caught = (distances < self.capture_radius).any(axis=1)
+        swarm.captured[targets[caught]] = True
+        free = ~caught
+        if free.any():
+            chased = targets[free][distances[free].argmin(axis=0)]
+            heading = swarm.positions[chased] - start[pursuers]
+            swarm.positions[pursuers] = self._move(
+                start[pursuers], _unit(heading) * self.pursuer_speed
+            )
+
+        swarm.velocities[:] = swarm.positions - start
+        return targets[caught]
+
+    def _move(self, starts: np.ndarray, steps: np.ndarray) -> np.ndarray:
+        """Clipped end points, detouring around obstacles where the step is blocked"""
+        ends = self._clip(starts + steps)
+        if self.obstacles is None or len(self.obstacles) == 0:
+            return ends
+        blocked = np.flatnonzero(self.obstacles.segments_collide(starts, ends))
+        if len(blocked) == 0:
+            return ends
+
+        # Random headings around the desired one, best-aligned free one wins
+        speed = np.linalg.norm(steps[blocked], axis=1, keepdims=True)
+        desired = _unit(steps[blocked])
+        jitter = self.rng.normal(size=(len(blocked), DETOUR_CANDIDATES, 3))
+        candidates = _unit(desired[:, None, :] + DETOUR_SPREAD * jitter)
+        candidate_ends = self._clip(
+            starts[blocked][:, None, :] + candidates * speed[:, :, None]
+        )
+        free = ~self.obstacles.segments_collide(
+            np.repeat(starts[blocked], DETOUR_CANDIDATES, axis=0),
+            candidate_ends.reshape(-1, 3),
+        ).reshape(len(blocked), DETOUR_CANDIDATES)
+        alignment = np.where(
+            free, np.einsum("bki,bi->bk", candidates, desired), -np.inf
+        )
+        best = alignment.argmax(axis=1)
+        # Ships with no free detour hold position this step
+        ends[blocked] = np.where(
+            free.any(axis=1)[:, None],
+            candidate_ends[np.arange(len(blocked)), best],
+            starts[blocked],
+        )
+        return ends
+
+    def _clip(self, points: np.ndarray) -> np.ndarray:
+        return np.clip(points, self.bounds[0::2], self.bounds[1::2])
+
+
+def _pairwise_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """``(len(a), len(b))`` Euclidean distances"""
+    diff = a[:, None, :] - b[None, :, :]
+    return np.sqrt(np.einsum("abi,abi->ab", diff, diff))
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    """Row-normalized ``vectors``; zero rows stay zero"""
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
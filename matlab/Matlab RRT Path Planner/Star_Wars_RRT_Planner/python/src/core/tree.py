@@ -0,0 +1,174 @@
+"""
+Array-backed RRT tree storage
+
+Node positions live in one preallocated ``(capacity, 3)`` float64 buffer,
+parent links in a matching int32 array and cost-to-come in a float64 array;
+all double in place when full, so adding a node never allocates per node.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+NO_PARENT = -1
+
+
+class RRTTree:
+    """Compact growable tree of 3D nodes with integer parent links
+
+    Child lists are only kept when ``track_children`` is set, which
+    ``reparent`` needs to shift the costs of a rewired subtree.
+    """
+
+    def __init__(
+        self, root: np.ndarray, capacity: int = 1024, track_children: bool = False
+    ):
+        capacity = max(int(capacity), 1)
+        self._positions = np.empty((capacity, 3), dtype=np.float64)
+        self._parents = np.empty(capacity, dtype=np.int32)
+        self._costs = np.empty(capacity, dtype=np.float64)
+        self._children: Optional[List[List[int]]] = [] if track_children else None
+        self._size = 0
+        self.add(root, NO_PARENT)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._parents)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """View of node positions, shape (n, 3)"""
+        return self._positions[: self._size]
+
+    @property
+    def parents(self) -> np.ndarray:
+        """View of parent indices, shape (n,); the root's parent is ``NO_PARENT``"""
+        return self._parents[: self._size]
+
+    @property
+    def costs(self) -> np.ndarray:
+        """View of cost-to-come from the root, shape (n,)"""
+        return self._costs[: self._size]
+
+    def add(self, position: np.ndarray, parent: int, cost: float = 0.0) -> int:
+        """Append a node and return its index"""
+        if self._size == self.capacity:
+            self._grow(2 * self.capacity)
+        idx = self._size
+        self._positions[idx] = position
+        self._parents[idx] = parent
+        self._costs[idx] = cost
+        if self._children is not None:
+            self._children.append([])
+            if parent != NO_PARENT:
+                self._children[parent].append(idx)
+        self._size += 1
+        return idx
+
+    def add_batch(
+        self, positions: np.ndarray, parents: np.ndarray, costs: np.ndarray
+    ) -> np.ndarray:
+        """Append ``k`` nodes with existing parents and return their indices"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        needed = self._size + len(positions)
+        if needed > self.capacity:
+            self._grow(max(2 * self.capacity, needed))
+        ids = np.arange(self._size, needed)
+        self._positions[self._size : needed] = positions
+        self._parents[self._size : needed] = parents
+        self._costs[self._size : needed] = costs
+        if self._children is not None:
+            self._children.extend([] for _ in ids)
+            for idx, parent in zip(ids.tolist(), np.asarray(parents).tolist()):
+                self._children[parent].append(idx)
+        self._size = needed
+        return ids
+
+    def _grow(self, capacity: int):
+        positions = np.empty((capacity, 3), dtype=np.float64)
+        parents = np.empty(capacity, dtype=np.int32)
+        costs = np.empty(capacity, dtype=np.float64)
+        positions[: self._size] = self._positions[: self._size]
+        parents[: self._size] = self._parents[: self._size]
+        costs[: self._size] = self._costs[: self._size]
+        self._positions, self._parents, self._costs = positions, parents, costs
+
+    def reparent(self, idx: int, parent: int, cost: float):
+        """Move ``idx`` under ``parent`` with a new cost, shifting its subtree"""
+        if self._children is None:
+            raise RuntimeError("reparent requires RRTTree(track_children=True)")
+        self._children[self._parents[idx]].remove(idx)
+        self._children[parent].append(idx)
+        self._parents[idx] = parent
+
+        delta = cost - self._costs[idx]
+        stack = [idx]
+        while stack:
+            node = stack.pop()
+            self._costs[node] += delta
+            stack.extend(self._children[node])
+
+    def subtree_mask(self, roots) -> np.ndarray:
+        """Per-node flags marking ``roots`` and every node below them"""
+        marked = np.zeros(self._size, dtype=bool)
+        marked[roots] = True
+        ancestors = self._parents[: self._size].astype(np.intp)
+        # Pointer jumping: round k looks 2**k levels further up every branch
+        while True:
+            has = ancestors != NO_PARENT
+            if not has.any():
+                return marked
+            marked[has] |= marked[ancestors[has]]
+            ancestors[has] = ancestors[ancestors[has]]
+
+    def prune(self, keep: np.ndarray) -> np.ndarray:
+        """Drop every node not flagged in ``keep``, compacting the arrays in place
+
+        The kept nodes must include each kept node's parent (or be a root).
+
+        Returns:
+            New index of every old node, ``NO_PARENT`` for dropped ones
+        """
+        keep = np.asarray(keep, dtype=bool)
+        kept = np.flatnonzero(keep)
+        remap = np.full(self._size, NO_PARENT, dtype=np.intp)
+        remap[kept] = np.arange(len(kept))
+        parents = self._parents[kept]
+        count = len(kept)
+        self._positions[:count] = self._positions[kept]
+        self._costs[:count] = self._costs[kept]
+        self._parents[:count] = np.where(
+            parents == NO_PARENT, NO_PARENT, remap[parents]
+        )
+        if self._children is not None:
+            self._children = [
+                [int(remap[child]) for child in self._children[node] if keep[child]]
+                for node in kept.tolist()
+            ]
+        self._size = count
+        return remap
+
+    def reroot(self, idx: int) -> np.ndarray:
+        """Make ``idx`` the root, dropping every node outside its subtree
+
+        Costs are shifted so the new root costs zero.
+
+        Returns:
+            New index of every old node, as from ``prune``
+        """
+        keep = self.subtree_mask([idx])
+        self._costs[: self._size] -= self._costs[idx]
+        self._parents[idx] = NO_PARENT
+        return self.prune(keep)
+
+    def branch(self, idx: int) -> np.ndarray:
+        """Node indices from the root down to ``idx``"""
+        parents = self._parents
+        chain = []
+        while idx != NO_PARENT:
+            chain.append(idx)
+            idx = int(parents[idx])
+        return np.array(chain[::-1], dtype=np.intp)
@@ -0,0 +1,35 @@
+"""
+Rendering helpers - GPU buffers, mesh generation and ship model loading and
+offscreen capture
+"""
+
+from .buffers import MeshBuffer, vbo_supported
+from .instancing import ObstacleRenderer, instance_array, instancing_supported
+from .meshes import unit_cube, uv_sphere
+from .models import ShipModel, load_ship_model
+from .offscreen import (
+    FFmpegSink,
+    OffscreenTarget,
+    PNGSequenceSink,
+    create_offscreen_context,
+    open_sink,
+    write_png,
+)
+
+__all__ = [
+    "FFmpegSink",
+    "MeshBuffer",
+    "ObstacleRenderer",
+    "OffscreenTarget",
+    "PNGSequenceSink",
+    "ShipModel",
+    "create_offscreen_context",
+    "instance_array",
+    "instancing_supported",
+    "load_ship_model",
+    "open_sink",
+    "unit_cube",
+    "uv_sphere",
+    "vbo_supported",
+    "write_png",
+]
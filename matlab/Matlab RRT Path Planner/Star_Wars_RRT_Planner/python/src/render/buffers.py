@@ -0,0 +1,110 @@
+"""
+Vertex buffer objects for the fixed-function pipeline
+
+A ``MeshBuffer`` keeps positions, normals and colors as consecutive blocks of
+one GL_ARRAY_BUFFER (plus an optional index buffer), so a whole mesh is drawn
+with a handful of GL calls instead of one call per vertex.
+"""
+
+import ctypes
+from typing import Optional
+
+import numpy as np
+from OpenGL.GL import *
+
+
+def vbo_supported() -> bool:
+    """True if the current context exposes buffer objects (OpenGL 1.5+)"""
+    try:
+        version = glGetString(GL_VERSION)
+        if not version or not bool(glGenBuffers):
+            return False
+        major, minor = version.split()[0].split(b".")[:2]
+        return (int(major), int(minor)) >= (1, 5)
+    except Exception:
+        return False
+
+
+def upload(target, data: np.ndarray, usage=GL_STATIC_DRAW) -> int:
+    """Create a buffer object on ``target`` holding ``data``"""
+    data = np.ascontiguousarray(data)
+    buffer = glGenBuffers(1)
+    glBindBuffer(target, buffer)
+    glBufferData(target, data.nbytes, data, usage)
+    glBindBuffer(target, 0)
+    return buffer
+
+
+class MeshBuffer:
+    """Positions with optional normals, colors and triangle/line indices"""
+
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        normals: Optional[np.ndarray] = None,
+        colors: Optional[np.ndarray] = None,
+        indices: Optional[np.ndarray] = None,
+        usage=GL_STATIC_DRAW,
+    ):
+        blocks = [np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)]
+        self.count = len(blocks[0])
+        self._normal_offset = self._color_offset = None
+        offset = blocks[0].nbytes
+        if normals is not None:
+            blocks.append(np.ascontiguousarray(normals, dtype=np.float32))
+            self._normal_offset, offset = offset, offset + blocks[-1].nbytes
+        if colors is not None:
+            blocks.append(np.ascontiguousarray(colors, dtype=np.float32))
+            self._color_offset, offset = offset, offset + blocks[-1].nbytes
+
+        self._vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        glBufferData(GL_ARRAY_BUFFER, offset, None, usage)
+        start = 0
+        for block in blocks:
+            glBufferSubData(GL_ARRAY_BUFFER, start, block.nbytes, block)
+            start += block.nbytes
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        self._ibo = None
+        if indices is not None:
+            indices = np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1)
+            self.count = len(indices)
+            self._ibo = upload(GL_ELEMENT_ARRAY_BUFFER, indices, usage)
+
+    def update_colors(self, colors: np.ndarray):
+        """Overwrite the per-vertex colors in place"""
+        colors = np.ascontiguousarray(colors, dtype=np.float32)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, self._color_offset, colors.nbytes, colors)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, mode=GL_TRIANGLES):
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+        if self._normal_offset is not None:
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glNormalPointer(GL_FLOAT, 0, ctypes.c_void_p(self._normal_offset))
+        if self._color_offset is not None:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(3, GL_FLOAT, 0, ctypes.c_void_p(self._color_offset))
+
+        if self._ibo is not None:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._ibo)
+            glDrawElements(mode, self.count, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            glDrawArrays(mode, 0, self.count)
+
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        """Free the GL buffers; the mesh cannot be drawn afterwards"""
+        glDeleteBuffers(1, [self._vbo])
+        if self._ibo is not None:
+            glDeleteBuffers(1, [self._ibo])
+        self._vbo = self._ibo = None
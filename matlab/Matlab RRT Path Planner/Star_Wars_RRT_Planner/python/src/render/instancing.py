@@ -0,0 +1,228 @@
+"""
+Instanced obstacle rendering from shared unit meshes
+
+One unit sphere and one unit cube are uploaded at startup. Per-obstacle
+position, scale and color live in a single packed ``(n, 7)`` float32 array per
+shape, rebuilt only when the obstacle set changes, and each shape is drawn
+with one ``glDrawElementsInstanced`` call. Contexts without instancing
+(OpenGL < 3.3) replay a display list per obstacle instead.
+"""
+
+import ctypes
+from typing import List, Optional
+
+import numpy as np
+from OpenGL.GL import *
+
+from core import ObstacleField
+
+from .buffers import upload
+from .meshes import Mesh, unit_cube, uv_sphere
+
+# Attribute slots bound before linking
+POSITION, NORMAL, OFFSET_SCALE, COLOR = 0, 1, 2, 3
+
+VERTEX_SHADER = """
+#version 120
+attribute vec3 position;
+attribute vec3 normal;
+attribute vec4 offset_scale;  // xyz = center, w = radius or edge length
+attribute vec3 color;
+varying vec3 v_color;
+
+void main() {
+    vec4 world = vec4(offset_scale.xyz + offset_scale.w * position, 1.0);
+    gl_Position = gl_ModelViewProjectionMatrix * world;
+    // Default GL_LIGHT0 (directional along +z in eye space) with the
+    // 0.2 global ambient term, as the fixed-function path lights obstacles
+    vec3 n = normalize(gl_NormalMatrix * normal);
+    v_color = color * (0.2 + max(n.z, 0.0));
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 120
+varying vec3 v_color;
+
+void main() {
+    gl_FragColor = vec4(v_color, 1.0);
+}
+"""
+
+
+def instance_array(
+    centers: np.ndarray, scales: np.ndarray, colors: np.ndarray
+) -> np.ndarray:
+    """Pack per-instance ``[x, y, z, scale, r, g, b]`` rows as float32"""
+    return np.column_stack(
+        [
+            np.asarray(centers, dtype=float).reshape(-1, 3),
+            np.asarray(scales, dtype=float).reshape(-1),
+            np.asarray(colors, dtype=float).reshape(-1, 3),
+        ]
+    ).astype(np.float32)
+
+
+def instancing_supported() -> bool:
+    """True if the current context can draw instanced with vertex divisors"""
+    try:
+        version = glGetString(GL_VERSION)
+        if not version or not bool(glDrawElementsInstanced):
+            return False
+        major, minor = version.split()[0].split(b".")[:2]
+        return (int(major), int(minor)) >= (3, 3) and bool(glVertexAttribDivisor)
+    except Exception:
+        return False
+
+
+class ObstacleRenderer:
+    """Draws every sphere and cube of an ``ObstacleField`` from shared meshes"""
+
+    def __init__(
+        self, slices: int = 16, stacks: int = 16, instanced: Optional[bool] = None
+    ):
+        self.instanced = instancing_supported() if instanced is None else instanced
+        meshes = [uv_sphere(slices, stacks), unit_cube()]
+        # Per shape: packed instances and, when instanced, their GL buffer
+        self._instances = [np.empty((0, 7), dtype=np.float32) for _ in meshes]
+        self._instance_vbos: List[Optional[int]] = [None for _ in meshes]
+
+        if self.instanced:
+            try:
+                self._program = _link_program(VERTEX_SHADER, FRAGMENT_SHADER)
+            except RuntimeError:
+                self.instanced = False
+        if self.instanced:
+            self._meshes = [_MeshArrays(mesh) for mesh in meshes]
+        else:
+            self._lists = [_display_list(mesh) for mesh in meshes]
+
+    def __len__(self) -> int:
+        return sum(len(instances) for instances in self._instances)
+
+    def set_obstacles(self, field: ObstacleField):
+        """Repack and re-upload the instance arrays"""
+        self._instances = [
+            instance_array(
+                field.sphere_centers, field.sphere_radii, field.sphere_colors
+            ),
+            instance_array(field.cube_centers, field.cube_sizes, field.cube_colors),
+        ]
+        if not self.instanced:
+            return
+        for shape, instances in enumerate(self._instances):
+            if self._instance_vbos[shape] is not None:
+                glDeleteBuffers(1, [self._instance_vbos[shape]])
+            self._instance_vbos[shape] = (
+                upload(GL_ARRAY_BUFFER, instances) if len(instances) else None
+            )
+
+    def draw(self):
+        if self.instanced:
+            self._draw_instanced()
+        else:
+            self._draw_display_lists()
+
+    def _draw_instanced(self):
+        glUseProgram(self._program)
+        stride = 7 * 4
+        for mesh, vbo, instances in zip(
+            self._meshes, self._instance_vbos, self._instances
+        ):
+            if vbo is None:
+                continue
+            mesh.bind()
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glEnableVertexAttribArray(OFFSET_SCALE)
+            glVertexAttribPointer(
+                OFFSET_SCALE, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0)
+            )
+            glEnableVertexAttribArray(COLOR)
+            glVertexAttribPointer(
+                COLOR, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(4 * 4)
+            )
+            glVertexAttribDivisor(OFFSET_SCALE, 1)
+            glVertexAttribDivisor(COLOR, 1)
+
+            glDrawElementsInstanced(
+                GL_TRIANGLES, mesh.count, GL_UNSIGNED_INT, None, len(instances)
+            )
+
+            glVertexAttribDivisor(OFFSET_SCALE, 0)
+            glVertexAttribDivisor(COLOR, 0)
+            for slot in (POSITION, NORMAL, OFFSET_SCALE, COLOR):
+                glDisableVertexAttribArray(slot)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+
+    def _draw_display_lists(self):
+        # Instances are scaled by the modelview matrix, so renormalize
+        glEnable(GL_NORMALIZE)
+        for display_list, instances in zip(self._lists, self._instances):
+            for x, y, z, scale, r, g, b in instances.tolist():
+                glPushMatrix()
+                glTranslatef(x, y, z)
+                glScalef(scale, scale, scale)
+                glColor3f(r, g, b)
+                glCallList(display_list)
+                glPopMatrix()
+        glDisable(GL_NORMALIZE)
+
+
+class _MeshArrays:
+    """Shared unit mesh as position, normal and index buffers"""
+
+    def __init__(self, mesh: Mesh):
+        vertices, normals, indices = mesh
+        self.count = indices.size
+        self._positions = upload(GL_ARRAY_BUFFER, vertices.astype(np.float32))
+        self._normals = upload(GL_ARRAY_BUFFER, normals.astype(np.float32))
+        self._indices = upload(GL_ELEMENT_ARRAY_BUFFER, indices.astype(np.uint32))
+
+    def bind(self):
+        for slot, buffer in ((POSITION, self._positions), (NORMAL, self._normals)):
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glEnableVertexAttribArray(slot)
+            glVertexAttribPointer(slot, 3, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._indices)
+
+
+def _display_list(mesh: Mesh) -> int:
+    """Compile a unit mesh into a display list (one-time immediate-mode pass)"""
+    vertices, normals, indices = mesh
+    display_list = glGenLists(1)
+    glNewList(display_list, GL_COMPILE)
+    glBegin(GL_TRIANGLES)
+    for index in indices.ravel().tolist():
+        glNormal3fv(normals[index])
+        glVertex3fv(vertices[index])
+    glEnd()
+    glEndList()
+    return display_list
+
+
+def _link_program(vertex_source: str, fragment_source: str) -> int:
+    program = glCreateProgram()
+    for kind, source in (
+        (GL_VERTEX_SHADER, vertex_source),
+        (GL_FRAGMENT_SHADER, fragment_source),
+    ):
+        shader = glCreateShader(kind)
+        glShaderSource(shader, source)
+        glCompileShader(shader)
+        if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+            raise RuntimeError(glGetShaderInfoLog(shader).decode())
+        glAttachShader(program, shader)
+        glDeleteShader(shader)
+    for slot, name in (
+        (POSITION, "position"),
+        (NORMAL, "normal"),
+        (OFFSET_SCALE, "offset_scale"),
+        (COLOR, "color"),
+    ):
+        glBindAttribLocation(program, slot, name)
+    glLinkProgram(program)
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        raise RuntimeError(glGetProgramInfoLog(program).decode())
+    return program
@@ -0,0 +1,61 @@
+"""
+Mesh generation for the retained-mode renderer
+
+Pure NumPy: every function returns float32 vertex/normal arrays and uint32
+triangle indices ready for upload, without touching OpenGL.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+Mesh = Tuple[np.ndarray, np.ndarray, np.ndarray]  # vertices, normals, indices
+
+
+def uv_sphere(slices: int = 16, stacks: int = 16) -> Mesh:
+    """Unit sphere, matching the tessellation of ``gluSphere``"""
+    theta = np.linspace(0.0, np.pi, stacks + 1)[:, None]  # polar angle
+    phi = np.linspace(0.0, 2 * np.pi, slices + 1)[None, :]  # azimuth
+    vertices = np.stack(
+        [
+            np.sin(theta) * np.cos(phi),
+            np.sin(theta) * np.sin(phi),
+            np.broadcast_to(np.cos(theta), (stacks + 1, slices + 1)),
+        ],
+        axis=-1,
+    ).reshape(-1, 3)
+
+    # Two triangles per quad of the (stacks, slices) grid
+    row = np.arange(stacks)[:, None] * (slices + 1)
+    col = np.arange(slices)[None, :]
+    a = (row + col).ravel()
+    b, c, d = a + slices + 1, a + 1, a + slices + 2
+    indices = np.concatenate([np.stack([a, b, c], 1), np.stack([c, b, d], 1)])
+    vertices = vertices.astype(np.float32)
+    return vertices, vertices.copy(), indices.astype(np.uint32)
+
+
+def unit_cube() -> Mesh:
+    """Axis-aligned cube with unit edge centered on the origin, flat normals"""
+    vertices, normals = [], []
+    for axis in range(3):
+        for sign in (-1.0, 1.0):
+            u, v = [k for k in range(3) if k != axis]
+            # Corners in counter-clockwise order seen from outside the face
+            corners = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+            if sign * (1 if axis != 1 else -1) < 0:
+                corners = corners[::-1]
+            for cu, cv in corners:
+                vertex = np.zeros(3)
+                vertex[axis], vertex[u], vertex[v] = sign, cu, cv
+                vertices.append(vertex / 2)
+            normal = np.zeros(3)
+            normal[axis] = sign
+            normals.extend([normal] * 4)
+    quads = np.arange(24).reshape(6, 4)
+    indices = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+    return (
+        np.array(vertices, dtype=np.float32),
+        np.array(normals, dtype=np.float32),
+        indices.astype(np.uint32),
+    )
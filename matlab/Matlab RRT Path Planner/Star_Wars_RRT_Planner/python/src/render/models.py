@@ -0,0 +1,171 @@
+"""
+Ship model pipeline - STL parsing, level-of-detail decimation and caching
+
+The first load of a model parses the STL, normalizes it to a unit bounding
+radius, builds decimated levels of detail by vertex clustering and stores
+the flat-shaded triangle arrays in an ``.npz`` file named after the SHA-256
+of the STL bytes. Later loads read the arrays straight from the cache, so the
+STL is never re-parsed unless it (or the LOD settings) change.
+"""
+
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+CACHE_VERSION = 1
+# Clustering grid cells along the longest axis per level; 0 keeps every face
+DEFAULT_LEVELS = (0, 24, 10)
+# Camera distances at which to switch to the next coarser level
+DEFAULT_LOD_DISTANCES = (1.5, 4.0)
+
+
+@dataclass
+class ShipModel:
+    """Flat-shaded triangle soup per level of detail, finest first
+
+    Each level is a ``(vertices, normals)`` pair of float32 ``(3 * faces, 3)``
+    arrays, ready for ``glDrawArrays(GL_TRIANGLES, ...)``. Geometry is centered
+    on the origin with a bounding radius of 1.
+    """
+
+    lods: List[Tuple[np.ndarray, np.ndarray]]
+    lod_distances: Sequence[float] = DEFAULT_LOD_DISTANCES
+
+    def face_counts(self) -> List[int]:
+        return [len(vertices) // 3 for vertices, _ in self.lods]
+
+    def select_lod(self, distance: float) -> int:
+        """Level to draw for a camera ``distance`` away"""
+        level = int(np.searchsorted(self.lod_distances, distance, side="right"))
+        return min(level, len(self.lods) - 1)
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "star_wars_rrt"
+
+
+def load_ship_model(
+    path: Union[str, Path],
+    cache_dir: Optional[Union[str, Path]] = None,
+    levels: Sequence[int] = DEFAULT_LEVELS,
+) -> ShipModel:
+    """Load an STL model through the on-disk LOD cache
+
+    Args:
+        path: STL file
+        cache_dir: Cache directory; defaults to ``~/.cache/star_wars_rrt``
+        levels: Clustering resolution per level, finest first (0 = full mesh)
+
+    Returns:
+        The model with one entry in ``lods`` per level
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    key = hashlib.sha256(data)
+    key.update(repr((CACHE_VERSION, tuple(levels))).encode())
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    cache = cache_dir / f"{path.stem}-{key.hexdigest()[:16]}.npz"
+
+    if cache.exists():
+        with np.load(cache) as archive:
+            return ShipModel(
+                [
+                    (archive[f"vertices_{level}"], archive[f"normals_{level}"])
+                    for level in range(len(levels))
+                ]
+            )
+
+    vertices, faces = _parse_stl(data)
+    vertices = normalize_vertices(vertices)
+    lods = [
+        flat_triangles(*cluster_decimate(vertices, faces, cells)) for cells in levels
+    ]
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    arrays = {}
+    for level, (lod_vertices, lod_normals) in enumerate(lods):
+        arrays[f"vertices_{level}"] = lod_vertices
+        arrays[f"normals_{level}"] = lod_normals
+    # Write then rename, so a concurrent reader never sees a partial file
+    partial = cache.with_suffix(f".{os.getpid()}.tmp")
+    with open(partial, "wb") as handle:
+        np.savez(handle, **arrays)
+    os.replace(partial, cache)
+    return ShipModel(lods)
+
+
+def normalize_vertices(vertices: np.ndarray) -> np.ndarray:
+    """Center on the bounding-box center and scale to a bounding radius of 1"""
+    vertices = np.asarray(vertices, dtype=float)
+    center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    centered = vertices - center
+    radius = np.linalg.norm(centered, axis=1).max()
+    return centered / radius if radius > 0 else centered
+
+
+def cluster_decimate(
+    vertices: np.ndarray, faces: np.ndarray, cells: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vertex-clustering decimation on a grid of ``cells`` along the longest axis
+
+    Vertices sharing a grid cell merge into their mean; faces that collapse
+    to a line or point, and duplicates, are dropped. ``cells <= 0`` returns
+    the mesh unchanged.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces, dtype=np.int64)
+    if cells <= 0 or len(vertices) == 0:
+        return vertices, faces
+
+    low = vertices.min(axis=0)
+    cell = (vertices.max(axis=0) - low).max() / cells
+    keys = np.floor((vertices - low) / cell).astype(np.int64)
+    _, cluster, counts = np.unique(
+        keys, axis=0, return_inverse=True, return_counts=True
+    )
+    cluster = cluster.reshape(-1)
+    merged = np.zeros((len(counts), 3))
+    np.add.at(merged, cluster, vertices)
+    merged /= counts[:, None]
+
+    remapped = cluster[faces]
+    valid = (
+        (remapped[:, 0] != remapped[:, 1])
+        & (remapped[:, 1] != remapped[:, 2])
+        & (remapped[:, 0] != remapped[:, 2])
+    )
+    remapped = remapped[valid]
+    # Same triangle with the same winding is a duplicate
+    rows = np.arange(len(remapped))[:, None]
+    canonical = remapped[rows, (np.argmin(remapped, axis=1)[:, None] + [0, 1, 2]) % 3]
+    _, first = np.unique(canonical, axis=0, return_index=True)
+    return merged, remapped[np.sort(first)]
+
+
+def flat_triangles(
+    vertices: np.ndarray, faces: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Unshared per-face vertices with the face normal repeated on each corner"""
+    corners = vertices[faces]  # (f, 3, 3)
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    return (
+        corners.reshape(-1, 3).astype(np.float32),
+        np.repeat(normals, 3, axis=0).astype(np.float32),
+    )
+
+
+def _parse_stl(data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Vertices and faces of an STL file's bytes"""
+    # Imported here so cache hits never pay for loading trimesh
+    import trimesh
+
+    mesh = trimesh.load(io.BytesIO(data), file_type="stl", force="mesh")
+    return np.asarray(mesh.vertices), np.asarray(mesh.faces)
@@ -0,0 +1,203 @@
+"""
+Offscreen rendering and frame sinks for headless video capture
+
+Frames are drawn into a framebuffer object on a context that needs no
+visible window: an EGL pbuffer context when PyOpenGL runs on the EGL platform
+(``PYOPENGL_PLATFORM=egl``, e.g. Mesa llvmpipe on CI boxes), otherwise a
+hidden pygame window. Read-back frames go to a PNG sequence or an ``ffmpeg``
+encoder pipe.
+"""
+
+import contextlib
+import ctypes
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from OpenGL.GL import *
+
+
+def create_offscreen_context(width: int, height: int):
+    """Make a GL context current without showing a window
+
+    Returns:
+        An object that keeps the context alive; drop it to release the context
+    """
+    if os.environ.get("PYOPENGL_PLATFORM") == "egl":
+        return _EGLContext(width, height)
+
+    import pygame
+
+    pygame.display.init()
+    return pygame.display.set_mode(
+        (width, height), pygame.OPENGL | pygame.DOUBLEBUF | pygame.HIDDEN
+    )
+
+
+class _EGLContext:
+    """Desktop OpenGL context on a small EGL pbuffer"""
+
+    def __init__(self, width: int, height: int):
+        from OpenGL import EGL
+
+        self._egl = EGL
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(
+            self.display, ctypes.byref(major), ctypes.byref(minor)
+        ):
+            raise RuntimeError("eglInitialize failed")
+
+        # fmt: off
+        attributes = [
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE,
+        ]
+        # fmt: on
+        config, count = EGL.EGLConfig(), EGL.EGLint()
+        EGL.eglChooseConfig(
+            self.display,
+            (EGL.EGLint * len(attributes))(*attributes),
+            ctypes.byref(config),
+            1,
+            ctypes.byref(count),
+        )
+        if count.value == 0:
+            raise RuntimeError("No EGL config with desktop OpenGL support")
+
+        size = (EGL.EGLint * 5)(
+            EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE
+        )
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config, size)
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(
+            self.display, config, EGL.EGL_NO_CONTEXT, None
+        )
+        if not EGL.eglMakeCurrent(
+            self.display, self.surface, self.surface, self.context
+        ):
+            raise RuntimeError("eglMakeCurrent failed")
+
+    def __del__(self):
+        # EGL may already be unloaded at interpreter exit
+        with contextlib.suppress(Exception):
+            EGL = self._egl
+            EGL.eglMakeCurrent(
+                self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT
+            )
+            EGL.eglDestroyContext(self.display, self.context)
+            EGL.eglDestroySurface(self.display, self.surface)
+
+
+class OffscreenTarget:
+    """Framebuffer object with RGBA color and 24-bit depth renderbuffers"""
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        self._fbo = glGenFramebuffers(1)
+        self._color, self._depth = glGenRenderbuffers(2)
+        glBindFramebuffer(GL_FRAMEBUFFER, self._fbo)
+        for buffer, storage, attachment in (
+            (self._color, GL_RGBA8, GL_COLOR_ATTACHMENT0),
+            (self._depth, GL_DEPTH_COMPONENT24, GL_DEPTH_ATTACHMENT),
+        ):
+            glBindRenderbuffer(GL_RENDERBUFFER, buffer)
+            glRenderbufferStorage(GL_RENDERBUFFER, storage, width, height)
+            glFramebufferRenderbuffer(
+                GL_FRAMEBUFFER, attachment, GL_RENDERBUFFER, buffer
+            )
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("Offscreen framebuffer is incomplete")
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self._fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def read_pixels(self) -> np.ndarray:
+        """Current frame as a top-down ``(height, width, 3)`` uint8 array"""
+        glBindFramebuffer(GL_FRAMEBUFFER, self._fbo)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
+        frame = np.frombuffer(data, dtype=np.uint8)
+        return frame.reshape(self.height, self.width, 3)[::-1]
+
+
+def write_png(path: Union[str, Path], rgb: np.ndarray):
+    """Write an ``(height, width, 3)`` uint8 image as an 8-bit RGB PNG"""
+    rgb = np.ascontiguousarray(rgb, dtype=np.uint8)
+    height, width = rgb.shape[:2]
+    # Filter type 0 (none) at the start of every scanline
+    raw = np.hstack([np.zeros((height, 1), np.uint8), rgb.reshape(height, -1)])
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        crc = zlib.crc32(kind + payload) & 0xFFFFFFFF
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    with open(path, "wb") as handle:
+        handle.write(b"\x89PNG\r\n\x1a\n")
+        handle.write(chunk(b"IHDR", header))
+        handle.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        handle.write(chunk(b"IEND", b""))
+
+
+class PNGSequenceSink:
+    """Numbered ``frame_00000.png`` files in a directory"""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.frames = 0
+
+    def write(self, frame: np.ndarray):
+        write_png(self.directory / f"frame_{self.frames:05d}.png", frame)
+        self.frames += 1
+
+    def close(self):
+        """Nothing to flush; each frame is a complete file once written"""
+
+
+class FFmpegSink:
+    """Raw RGB frames piped into an ``ffmpeg`` H.264 encoder"""
+
+    def __init__(self, path: Union[str, Path], width: int, height: int, fps: int = 60):
+        executable = shutil.which("ffmpeg")
+        if executable is None:
+            raise RuntimeError("ffmpeg not found on PATH")
+        self.frames = 0
+        # fmt: off
+        self._process = subprocess.Popen(
+            [
+                executable, "-loglevel", "error", "-y",
+                "-f", "rawvideo", "-pix_fmt", "rgb24",
+                "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                "-pix_fmt", "yuv420p", "-c:v", "libx264", str(path),
+            ],
+            stdin=subprocess.PIPE,
+        )
+        # fmt: on
+
+    def write(self, frame: np.ndarray):
+        self._process.stdin.write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+        self.frames += 1
+
+    def close(self):
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError("ffmpeg exited with an error")
+
+
+def open_sink(output: Union[str, Path], width: int, height: int, fps: int = 60):
+    """Video file sink for ``.mp4``/``.mkv``/``.mov``/``.avi``, else a PNG directory"""
+    if Path(output).suffix.lower() in (".mp4", ".mkv", ".mov", ".avi"):
+        return FFmpegSink(output, width, height, fps)
+    return PNGSequenceSink(output)
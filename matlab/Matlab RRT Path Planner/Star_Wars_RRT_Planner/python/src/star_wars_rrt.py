@@ -4,17 +4,61 @@ Star Wars RRT Path Planner - Python Version
 Enhanced performance with real-time rendering and GPU acceleration
 """
 
-import random
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import argparse
+import math
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 import pygame
-import trimesh
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from pygame.locals import *
 
+from core import (
+    NN_BACKENDS,
+    NO_PARENT,
+    SMOOTHING_METHODS,
+    TARGET,
+    GoalRegions,
+    GoalTracker,
+    InformedSampler,
+    LinearIndex,
+    MovingObstacleField,
+    ObstacleField,
+    OccupancyGrid,
+    PlannerStats,
+    RRTTree,
+    Swarm,
+    SwarmPursuit,
+    UniformSampler,
+    as_obstacle_field,
+    create_nn_index,
+    goal_set,
+    load_scene,
+    smooth_path,
+)
+from render import (
+    MeshBuffer,
+    ObstacleRenderer,
+    OffscreenTarget,
+    ShipModel,
+    load_ship_model,
+    vbo_supported,
+)
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "matlab" / "models"
+DEFAULT_BOUNDS = np.array([-1.0, 1.0, -0.6, 0.6, -0.3, 0.3])
+PLANNER_MODES = ("rrt", "connect", "star")
+GOAL_SELECTIONS = ("first", "best")
+# Slack on the fixed-timestep accumulator, far below any real frame time
+STEP_EPSILON = 1e-9
+
+# Extension outcomes for RRT-Connect
+TRAPPED, ADVANCED, REACHED = 0, 1, 2
+
 
 @dataclass
 class Obstacle:
@@ -24,6 +68,14 @@ class Obstacle:
     position: np.ndarray
     size: float
     color: Tuple[float, float, float]
+    # Motion for MovingObstacleField: drift per second, and/or timed
+    # waypoints (times, centers) that replace the fixed position
+    velocity: Optional[np.ndarray] = None
+    waypoints: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+
+# Planner and AI entry points take either form; lists are packed on entry
+Obstacles = Union[List[Obstacle], ObstacleField]
 
 
 @dataclass
@@ -33,97 +85,711 @@ class Ship:
     position: np.ndarray
     orientation: np.ndarray
     velocity: np.ndarray
-    model: Optional[trimesh.Trimesh] = None
+    model: Optional[ShipModel] = None
     color: Tuple[float, float, float] = (0.8, 0.8, 0.8)
 
 
 class RRTPlanner:
     """High-performance RRT path planner with GPU acceleration"""
 
-    def __init__(self, bounds: np.ndarray, max_iterations: int = 5000):
+    def __init__(
+        self,
+        bounds: np.ndarray,
+        max_iterations: int = 5000,
+        nn_backend: str = "linear",
+        check_edges: bool = False,
+        mode: str = "rrt",
+        smoothing: Optional[str] = None,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        if nn_backend not in NN_BACKENDS:
+            raise ValueError(
+                f"Unknown nn_backend '{nn_backend}', expected one of {NN_BACKENDS}"
+            )
+        if mode not in PLANNER_MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {PLANNER_MODES}")
+        if smoothing is not None and smoothing not in SMOOTHING_METHODS:
+            raise ValueError(
+                f"Unknown smoothing '{smoothing}', expected one of {SMOOTHING_METHODS}"
+            )
         self.bounds = bounds
         self.max_iterations = max_iterations
         self.step_size = 0.05
         self.goal_radius = 0.1
         self.goal_bias = 0.2
+        self.rewire_radius = 0.1  # Upper bound on the RRT* neighborhood
+        # "linear" is the brute-force reference; "spatial_hash" and "kdtree"
+        # keep nearest-node lookups sublinear for large trees
+        self.nn_backend = nn_backend
+        # Test whole extension edges instead of only the new endpoint, so
+        # larger step sizes cannot clip through thin obstacles
+        self.check_edges = check_edges
+        # "rrt" grows one goal-biased tree; "connect" grows trees from start
+        # and goal and greedily joins them (RRT-Connect); "star" keeps
+        # refining with parent selection and rewiring (RRT*)
+        self.mode = mode
+        # Optional post-processing: "shortcut" prunes detours; "bspline" and
+        # "min_jerk" also resample to smooth_waypoints points
+        self.smoothing = smoothing
+        self.smooth_waypoints: Optional[int] = None
+        # "rrt" mode draws, steers and checks this many samples per round as
+        # arrays; 1 keeps the one-sample-per-iteration loop. Batching needs
+        # nn_backend="kdtree" or "spatial_hash": the linear scan's batched
+        # query costs more than K single ones once the tree passes a few
+        # thousand nodes
+        self.expansion_batch = 1
+        # Against an OccupancyGrid, a node whose clearance exceeds step_size
+        # extends up to its clearance, capped here, without an edge check
+        self.max_step_size = 0.2
+        # Once RRT* has a path, sample only where a shorter one could run
+        self.informed_sampling = True
+        # With several goals, "first" stops plain RRT at the first region
+        # reached; "best" keeps growing while an unreached region could still
+        # give a shorter path. RRT* always returns its cheapest path and
+        # RRT-Connect its first connection
+        self.goal_selection = "first"
+        self.last_goal: Optional[int] = None  # Goal reached by the latest path
+        # Flight speed (units per second) that times space-time plans
+        self.speed = 1.0
+        self.last_times: Optional[np.ndarray] = None  # Arrival time per waypoint
+        self._start_time = 0.0
+        # All sampling draws from this generator; seed it for repeatable runs
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._sampler = UniformSampler(self.bounds, self.rng)
+        self.last_iterations = 0  # Iterations used by the latest plan_path call
+        self.last_nodes = 0  # Tree nodes (all trees) built by the latest call
+        # Attach a PlannerStats to collect phase timers and counters
+        self.stats: Optional[PlannerStats] = None
+        self._trees: List[RRTTree] = []
+        # Goal bookkeeping of the current plan, see _reach_goal
+        self._goal_node: Optional[int] = None
+        self._goal_region: Optional[int] = None
+        self._goal_cost = math.inf
+        self._goals_open = np.zeros(0, dtype=bool)
+        self._goal_bounds = np.zeros(0)
 
     def plan_path(
-        self, start: np.ndarray, goal: np.ndarray, obstacles: List[Obstacle]
+        self,
+        start: np.ndarray,
+        goal: np.ndarray,
+        obstacles: Union[Obstacles, MovingObstacleField],
+        time_budget: Optional[float] = None,
+        start_time: float = 0.0,
+        goal_radii: Optional[Union[float, np.ndarray]] = None,
     ) -> Optional[np.ndarray]:
-        """Plan path using RRT algorithm"""
-        nodes = [np.append(start, -1)]  # [x, y, z, parent_index]
+        """Plan path using RRT algorithm
+
+        With ``time_budget`` (seconds) planning stops once the budget expires;
+        RRT* then returns the best path found so far.
+
+        ``goal`` may also be ``(m, 3)`` candidate goals, each the center of a
+        ball of its ``goal_radii`` entry (``goal_radius`` by default). One
+        tree serves them all, every new node is tested against every ball at
+        once, and ``last_goal`` holds the index of the goal reached. Goals
+        inside a static obstacle are skipped unless all of them are.
+
+        A ``MovingObstacleField`` plans in (x, y, z, t): the ship leaves
+        ``start`` at ``start_time`` flying at ``speed``, and every edge is
+        checked against the obstacles where they are while it is flown. Only
+        the "rrt" mode plans among moving obstacles, and such paths are not
+        smoothed. ``last_times`` holds the arrival time at each waypoint.
+        """
+        moving = isinstance(obstacles, MovingObstacleField)
+        if moving and self.mode != "rrt":
+            raise ValueError(f"Mode '{self.mode}' cannot plan among moving obstacles")
+        if self.goal_selection not in GOAL_SELECTIONS:
+            raise ValueError(
+                f"Unknown goal_selection '{self.goal_selection}', "
+                f"expected one of {GOAL_SELECTIONS}"
+            )
+        goals = GoalRegions(
+            goal, self.goal_radius if goal_radii is None else goal_radii
+        )
+        if not moving:
+            obstacles = as_obstacle_field(obstacles)
+            goals = goals.without_blocked(obstacles)
+        stats = self.stats
+        if stats is not None:
+            stats.begin_plan()
+        self._start_time = start_time
+        self.last_iterations = 0
+        self._trees = []
+        self._goal_node, self._goal_region = None, None
+        self._goal_cost = math.inf
+        self._goals_open = np.ones(len(goals), dtype=bool)
+        self._goal_bounds = goals.lower_bounds(start)
+        # Fresh sample blocks, so each call depends only on the generator state
+        self._sampler = InformedSampler(self.bounds, start, goals.centers[0], self.rng)
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        if self.mode == "connect":
+            path = self._plan_connect(start, goals, obstacles, deadline)
+        elif self.mode == "star":
+            path = self._plan_star(start, goals, obstacles, deadline)
+        elif self.expansion_batch > 1:
+            path = self._plan_rrt_batched(start, goals, obstacles, deadline)
+        else:
+            path = self._plan_rrt(start, goals, obstacles, deadline)
+        self.last_nodes = sum(len(tree) for tree in self._trees)
+        self.last_goal = None
+        if path is not None:
+            self.last_goal = int(goals.ids[self._goal_region])
+
+        if path is not None and self.smoothing is not None and not moving:
+            tick = time.perf_counter_ns() if stats is not None else 0
+            path = smooth_path(
+                path, obstacles, self.smoothing, self.smooth_waypoints, self.rng
+            )
+            if stats is not None:
+                stats.charge("smoothing", tick)
+        self.last_times = None
+        if path is not None:
+            legs = np.linalg.norm(np.diff(path, axis=0), axis=1)
+            arc_length = np.concatenate([[0.0], np.cumsum(legs)])
+            self.last_times = start_time + arc_length / self.speed
+        if stats is not None:
+            stats.end_plan(self.last_iterations, self.last_nodes)
+        return path
+
+    def grow(
+        self,
+        tree: RRTTree,
+        index: LinearIndex,
+        obstacles: ObstacleField,
+        target: np.ndarray,
+        deadline: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        max_extensions: Optional[int] = None,
+    ) -> int:
+        """Extend an existing tree toward goal-biased samples of ``target``
+
+        For callers that keep their own tree across calls, e.g. a replanner.
+        ``index`` must hold the tree's nodes in order. Growth stops after
+        ``max_extensions`` attempts, once the tree has ``max_nodes`` nodes,
+        or past the ``time.perf_counter()`` ``deadline``.
+
+        Returns:
+            Number of extension attempts made
+        """
+        if deadline is None and max_nodes is None and max_extensions is None:
+            raise ValueError("grow needs a deadline, max_nodes or max_extensions")
+        attempts = 0
+        while max_extensions is None or attempts < max_extensions:
+            if max_nodes is not None and len(tree) >= max_nodes:
+                break
+            if self._expired(deadline):
+                break
+            self._extend(tree, index, self._sample(target), obstacles)
+            attempts += 1
+        return attempts
+
+    def _plan_rrt(
+        self,
+        start: np.ndarray,
+        goals: GoalRegions,
+        obstacles: ObstacleField,
+        deadline: Optional[float],
+    ) -> Optional[np.ndarray]:
+        """Single goal-biased RRT tree"""
+        tree = RRTTree(start, capacity=min(self.max_iterations + 1, 4096))
+        index = self._new_index()
+        index.add(start)
+        self._trees = [tree]
+        targets = goals.centers
 
         for iteration in range(self.max_iterations):
+            self.last_iterations = iteration + 1
+            if self._expired(deadline):
+                break
+
             # Goal-biased sampling
-            if random.random() < self.goal_bias:
-                sample = goal
-            else:
-                sample = np.array(
-                    [
-                        random.uniform(self.bounds[0], self.bounds[1]),
-                        random.uniform(self.bounds[2], self.bounds[3]),
-                        random.uniform(self.bounds[4], self.bounds[5]),
-                    ]
-                )
+            sample = self._sample(targets)
 
             # Find nearest node
-            nodes_array = np.array([node[:3] for node in nodes])
-            distances = np.linalg.norm(nodes_array - sample, axis=1)
-            nearest_idx = np.argmin(distances)
-            nearest_node = nodes_array[nearest_idx]
+            nearest_idx = self._nearest(index, sample)
+            nearest_node = tree.positions[nearest_idx]
 
             # Step towards sample
             direction = sample - nearest_node
             distance = np.linalg.norm(direction)
             if distance > 0:
                 direction = direction / distance
-                new_pos = nearest_node + self.step_size * direction
+                step, known_free = self._step_length(nearest_node, obstacles)
+                step = min(step, distance) if known_free else step
+                new_pos = nearest_node + step * direction
 
                 # Check collision
-                if not self._check_collision(new_pos, obstacles):
-                    nodes.append(np.append(new_pos, nearest_idx))
+                cost = tree.costs[nearest_idx] + step
+                if known_free or not self._check_edge(
+                    nearest_node, new_pos, obstacles, tree.costs[nearest_idx], cost
+                ):
+                    new_idx = tree.add(new_pos, nearest_idx, cost)
+                    index.add(new_pos)
+
+                    # Check if a goal region was reached
+                    region = goals.hit(new_pos, self._goals_open)
+                    if region >= 0:
+                        if self._reach_goal(region, new_idx, cost):
+                            break
+                        targets = goals.centers[self._goals_open]
+
+        return self._goal_path(tree)
+
+    def _plan_rrt_batched(
+        self,
+        start: np.ndarray,
+        goals: GoalRegions,
+        obstacles: ObstacleField,
+        deadline: Optional[float],
+    ) -> Optional[np.ndarray]:
+        """Goal-biased RRT extending ``expansion_batch`` samples per round
+
+        Each round's samples find their nearest nodes in the tree as it stood
+        at the start of the round, in one query; steering, collision checks
+        and insertion then run on arrays.
+        """
+        tree = RRTTree(start, capacity=min(self.max_iterations + 1, 4096))
+        index = self._new_index()
+        index.add(start)
+        self._trees = [tree]
+        stats = self.stats
+        targets = goals.centers
+
+        while self.last_iterations < self.max_iterations:
+            if self._expired(deadline):
+                break
+            count = min(
+                int(self.expansion_batch), self.max_iterations - self.last_iterations
+            )
+            self.last_iterations += count
+
+            tick = time.perf_counter_ns() if stats is not None else 0
+            samples = self._sampler.points(count)
+            goal_samples = self._sampler.coins(count) < self.goal_bias
+            if len(targets) == 1:
+                samples[goal_samples] = targets[0]
+            else:
+                picks = self._sampler.coins(int(goal_samples.sum())) * len(targets)
+                samples[goal_samples] = targets[picks.astype(np.intp)]
+            if stats is not None:
+                tick = stats.charge("sampling", tick)
+                stats.counts["samples"] += count
+                stats.counts["goal_samples"] += int(goal_samples.sum())
+
+            nearest = index.nearest_batch(samples)
+            if stats is not None:
+                tick = stats.charge("nearest", tick)
+                stats.counts["nearest_queries"] += count
+
+            origins = tree.positions[nearest]
+            offsets = samples - origins
+            distances = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+            moving = distances > 0
+            nearest, origins = nearest[moving], origins[moving]
+            offsets, distances = offsets[moving], distances[moving]
+            steps = np.full(len(nearest), self.step_size)
+            known_free = np.zeros(len(nearest), dtype=bool)
+            if isinstance(obstacles, OccupancyGrid):
+                clearance = obstacles.clearance(origins)
+                known_free = clearance > self.step_size
+                stretched = np.minimum(
+                    np.minimum(clearance, self.max_step_size), distances
+                )
+                steps[known_free] = stretched[known_free]
+            ends = origins + offsets * (steps / distances)[:, None]
+            start_costs = tree.costs[nearest]
+            costs = start_costs + steps
+
+            tick = time.perf_counter_ns() if stats is not None else 0
+            checked = ~known_free
+            hit = np.zeros(len(nearest), dtype=bool)
+            hit[checked] = self._edges_hit(
+                origins[checked],
+                ends[checked],
+                obstacles,
+                start_costs[checked],
+                costs[checked],
+            )
+            if stats is not None:
+                stats.charge("collision", tick)
+                stats.counts["collision_checks"] += int(checked.sum())
+                stats.counts["rejections"] += int(hit.sum())
+
+            free = ~hit
+            ends = ends[free]
+            ids = tree.add_batch(ends, nearest[free], costs[free])
+            index.add_batch(ends)
+            if stats is not None:
+                interval = stats.growth_interval
+                if (
+                    self.last_iterations // interval
+                    > (self.last_iterations - count) // interval
+                ):
+                    stats.record_growth(self.last_iterations, len(tree))
+
+            regions = goals.hits(ends, self._goals_open)
+            reached = np.flatnonzero(regions >= 0)
+            if len(reached):
+                costs = costs[free]
+                if any(
+                    self._reach_goal(int(regions[row]), int(ids[row]), costs[row])
+                    for row in reached
+                ):
+                    break
+                targets = goals.centers[self._goals_open]
+
+        return self._goal_path(tree)
+
+    def _plan_connect(
+        self,
+        start: np.ndarray,
+        goals: GoalRegions,
+        obstacles: ObstacleField,
+        deadline: Optional[float],
+    ) -> Optional[np.ndarray]:
+        """Bidirectional RRT-Connect between start and goal
+
+        Several goals root one forest, so the goal side is still one tree.
+        """
+        trees = []
+        for roots in (start[None, :], goals.centers):
+            tree = RRTTree(roots[0], capacity=min(self.max_iterations + 1, 4096))
+            for root in roots[1:]:
+                tree.add(root, NO_PARENT)
+            index = self._new_index()
+            index.add_batch(roots)
+            trees.append((tree, index))
+        start_tree = trees[0][0]
+        self._trees = [tree for tree, _ in trees]
 
-                    # Check if goal reached
-                    if np.linalg.norm(new_pos - goal) < self.goal_radius:
-                        return self._extract_path(nodes, len(nodes) - 1)
+        for iteration in range(self.max_iterations):
+            self.last_iterations = iteration + 1
+            if self._expired(deadline):
+                break
+            (tree_a, index_a), (tree_b, index_b) = trees
+            status, new_idx = self._extend(tree_a, index_a, self._sample(), obstacles)
+            if status != TRAPPED:
+                # Greedily grow the other tree toward the new node
+                target = tree_a.positions[new_idx]
+                status, other_idx = self._extend(tree_b, index_b, target, obstacles)
+                while status == ADVANCED:
+                    status, other_idx = self._extend(tree_b, index_b, target, obstacles)
+                if status == REACHED:
+                    branch_a = tree_a.branch(new_idx)
+                    branch_b = tree_b.branch(other_idx)
+                    path_a = tree_a.positions[branch_a]
+                    path_b = tree_b.positions[branch_b][::-1][1:]
+                    # Goal roots were added first, so a root's index is its goal
+                    if tree_a is start_tree:
+                        self._goal_region = int(branch_b[0])
+                        return np.vstack([path_a, path_b])
+                    self._goal_region = int(branch_a[0])
+                    return np.vstack([path_b[::-1], path_a[::-1]])
+            trees.reverse()
 
         return None
 
-    def _check_collision(self, point: np.ndarray, obstacles: List[Obstacle]) -> bool:
+    def _plan_star(
+        self,
+        start: np.ndarray,
+        goals: GoalRegions,
+        obstacles: ObstacleField,
+        deadline: Optional[float],
+    ) -> Optional[np.ndarray]:
+        """RRT* - best-parent selection and rewiring in a shrinking radius"""
+        tree = RRTTree(
+            start, capacity=min(self.max_iterations + 1, 4096), track_children=True
+        )
+        index = self._new_index()
+        index.add(start)
+        self._trees = [tree]
+        gamma = self._rewire_gamma()
+        goal_nodes, goal_regions = [], []
+
+        for iteration in range(self.max_iterations):
+            self.last_iterations = iteration + 1
+            if self._expired(deadline):
+                break
+
+            sample = self._sample(goals.centers)
+            nearest_idx = self._nearest(index, sample)
+            nearest_node = tree.positions[nearest_idx]
+            direction = sample - nearest_node
+            distance = np.linalg.norm(direction)
+            if distance == 0:
+                continue
+            new_pos = nearest_node + (self.step_size / distance) * direction
+            if self._check_edge(nearest_node, new_pos, obstacles):
+                continue
+
+            # Neighborhood shrinks as the tree grows, never below one step
+            n = len(tree)
+            radius = min(
+                gamma * (math.log(n + 1) / (n + 1)) ** (1 / 3), self.rewire_radius
+            )
+            tick = time.perf_counter_ns() if self.stats is not None else 0
+            neighbors = index.within_radius(new_pos, max(radius, self.step_size))
+            if not (neighbors == nearest_idx).any():
+                # new_pos sits exactly step_size away, so rounding can drop it
+                neighbors = np.append(neighbors, nearest_idx)
+            if self.stats is not None:
+                tick = self.stats.charge("nearest", tick)
+                self.stats.counts["nearest_queries"] += 1
+            neighbor_pos = tree.positions[neighbors]
+            offsets = neighbor_pos - new_pos
+            dists = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+            free = ~obstacles.segments_collide(
+                neighbor_pos, np.broadcast_to(new_pos, neighbor_pos.shape)
+            )
+            if self.stats is not None:
+                self.stats.charge("collision", tick)
+                self.stats.counts["collision_checks"] += len(neighbors)
+            free[neighbors == nearest_idx] = True
+
+            # Cheapest collision-free parent
+            through = np.where(free, tree.costs[neighbors] + dists, np.inf)
+            best = int(np.argmin(through))
+            new_cost = float(through[best])
+            new_idx = tree.add(new_pos, int(neighbors[best]), new_cost)
+            index.add(new_pos)
+
+            # Rewire neighbors that are cheaper to reach through the new node;
+            # costs is re-read since each rewire lowers a whole subtree
+            costs = tree.costs
+            rewire = free & (new_cost + dists < costs[neighbors])
+            for neighbor, dist in zip(
+                neighbors[rewire].tolist(), dists[rewire].tolist()
+            ):
+                if new_cost + dist < costs[neighbor]:
+                    tree.reparent(neighbor, new_idx, new_cost + dist)
+
+            region = goals.hit(new_pos)
+            if region >= 0:
+                goal_nodes.append(new_idx)
+                goal_regions.append(region)
+            if goal_nodes and self.informed_sampling and len(goals) == 1:
+                # Paths end within goal_radius of the goal, so a better one
+                # may be up to goal_radius longer measured to the goal itself
+                best_cost = float(tree.costs[goal_nodes].min())
+                self._sampler.set_cost(best_cost + goals.radii[0])
+
+        if not goal_nodes:
+            return None
+        best = int(np.argmin(tree.costs[goal_nodes]))
+        self._goal_region = goal_regions[best]
+        return self._extract_path(tree, goal_nodes[best])
+
+    def _rewire_gamma(self) -> float:
+        """RRT* ball constant for the bounds volume (Karaman & Frazzoli, 2011)"""
+        bounds = np.asarray(self.bounds, dtype=float)
+        volume = float(np.prod(bounds[1::2] - bounds[0::2]))
+        unit_ball = 4.0 / 3.0 * math.pi
+        return 2.0 * (4.0 / 3.0) ** (1 / 3) * (volume / unit_ball) ** (1 / 3)
+
+    @staticmethod
+    def _expired(deadline: Optional[float]) -> bool:
+        return deadline is not None and time.perf_counter() > deadline
+
+    def _extend(
+        self,
+        tree: RRTTree,
+        index: LinearIndex,
+        target: np.ndarray,
+        obstacles: ObstacleField,
+    ) -> Tuple[int, int]:
+        """Step ``tree`` toward ``target``; returns (status, node index)"""
+        nearest_idx = self._nearest(index, target)
+        nearest_node = tree.positions[nearest_idx]
+        direction = target - nearest_node
+        distance = np.linalg.norm(direction)
+        if distance == 0:
+            return REACHED, nearest_idx
+        step, known_free = self._step_length(nearest_node, obstacles)
+        if distance <= step:
+            new_pos, status = target.copy(), REACHED
+        else:
+            new_pos = nearest_node + (step / distance) * direction
+            status = ADVANCED
+
+        if not known_free and self._check_edge(nearest_node, new_pos, obstacles):
+            return TRAPPED, nearest_idx
+        step = min(distance, step)
+        new_idx = tree.add(new_pos, nearest_idx, tree.costs[nearest_idx] + step)
+        index.add(new_pos)
+        return status, new_idx
+
+    def _new_index(self) -> LinearIndex:
+        """Empty nearest-neighbor index sized for a full tree"""
+        return create_nn_index(
+            self.nn_backend, self.bounds, self.step_size, self.max_iterations + 1
+        )
+
+    def _step_length(self, node: np.ndarray, obstacles) -> Tuple[float, bool]:
+        """Extension length from ``node``, and whether that edge is known free
+
+        Inside an ``OccupancyGrid`` the whole ball of the node's clearance is
+        free, so any edge shorter than the clearance needs no check.
+        """
+        if isinstance(obstacles, OccupancyGrid):
+            clearance = obstacles.clearance(node)
+            if clearance > self.step_size:
+                return min(clearance, self.max_step_size), True
+        return self.step_size, False
+
+    def _reach_goal(self, region: int, node: int, cost: float) -> bool:
+        """Record ``node`` reaching goal ``region``; True once planning is done
+
+        "best" closes the region and every unreached one that cannot beat
+        the cheapest path so far, and is done once none is left open.
+        """
+        if cost < self._goal_cost:
+            self._goal_node, self._goal_region = node, region
+            self._goal_cost = cost
+        if self.goal_selection == "first":
+            return True
+        self._goals_open[region] = False
+        self._goals_open &= self._goal_bounds < self._goal_cost
+        return not self._goals_open.any()
+
+    def _goal_path(self, tree: RRTTree) -> Optional[np.ndarray]:
+        if self._goal_node is None:
+            return None
+        return self._extract_path(tree, self._goal_node)
+
+    def _sample(self, goal: Optional[np.ndarray] = None) -> np.ndarray:
+        """Next sample, ``goal`` with probability ``goal_bias`` when given
+
+        ``goal`` may be ``(m, 3)`` candidates, one of which is drawn.
+        """
+        stats = self.stats
+        tick = time.perf_counter_ns() if stats is not None else 0
+        if goal is not None and self._sampler.coin() < self.goal_bias:
+            if goal.ndim == 2:
+                pick = 0 if len(goal) == 1 else int(self._sampler.coin() * len(goal))
+                goal = goal[pick]
+            sample = goal
+        else:
+            sample = self._random_point()
+        if stats is not None:
+            stats.charge("sampling", tick)
+            stats.counts["samples"] += 1
+            stats.counts["goal_samples"] += sample is goal
+            if self.last_iterations % stats.growth_interval == 0:
+                nodes = sum(len(tree) for tree in self._trees)
+                stats.record_growth(self.last_iterations, nodes)
+        return sample
+
+    def _nearest(self, index: LinearIndex, point: np.ndarray) -> int:
+        if self.stats is None:
+            return index.nearest(point)
+        tick = time.perf_counter_ns()
+        nearest = index.nearest(point)
+        self.stats.charge("nearest", tick)
+        self.stats.counts["nearest_queries"] += 1
+        return nearest
+
+    def _random_point(self) -> np.ndarray:
+        """Uniform sample within the planning bounds"""
+        return self._sampler.point()
+
+    def _check_collision(self, point: np.ndarray, obstacles: Obstacles) -> bool:
         """Fast collision checking using vectorized operations"""
-        for obstacle in obstacles:
-            if obstacle.type == 0:  # Sphere
-                if np.linalg.norm(point - obstacle.position) <= obstacle.size:
-                    return True
-            else:  # Cube
-                if np.all(np.abs(point - obstacle.position) <= obstacle.size / 2):
-                    return True
-        return False
-
-    def _extract_path(self, nodes: List[np.ndarray], goal_idx: int) -> np.ndarray:
-        """Extract path from RRT tree"""
-        path = []
-        current_idx = goal_idx
+        return as_obstacle_field(obstacles).contains(point)
 
-        while current_idx != -1:
-            path.append(nodes[current_idx][:3])
-            current_idx = int(nodes[current_idx][3])
+    def _check_edge(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        obstacles: Union[ObstacleField, MovingObstacleField],
+        start_cost: float = 0.0,
+        end_cost: float = 0.0,
+    ) -> bool:
+        """Collision check for the tree extension from ``start`` to ``end``
+
+        Moving obstacles are checked over the whole edge at the times it is
+        flown, derived from the path lengths ``start_cost``/``end_cost``.
+        """
+        stats = self.stats
+        if stats is None:
+            return self._edge_hits(start, end, obstacles, start_cost, end_cost)
+        tick = time.perf_counter_ns()
+        hit = self._edge_hits(start, end, obstacles, start_cost, end_cost)
+        stats.charge("collision", tick)
+        stats.counts["collision_checks"] += 1
+        stats.counts["rejections"] += hit
+        return hit
+
+    def _edge_hits(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        obstacles: Union[ObstacleField, MovingObstacleField],
+        start_cost: float,
+        end_cost: float,
+    ) -> bool:
+        if isinstance(obstacles, MovingObstacleField):
+            return obstacles.segment_collides(
+                start,
+                end,
+                self._start_time + start_cost / self.speed,
+                self._start_time + end_cost / self.speed,
+            )
+        if self.check_edges:
+            return obstacles.segment_collides(start, end)
+        return self._check_collision(end, obstacles)
 
-        return np.array(path[::-1])
+    def _edges_hit(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        obstacles: Union[ObstacleField, MovingObstacleField],
+        start_costs: np.ndarray,
+        end_costs: np.ndarray,
+    ) -> np.ndarray:
+        """``_edge_hits`` for ``(k, 3)`` arrays of extensions"""
+        if isinstance(obstacles, MovingObstacleField):
+            return obstacles.segments_collide(
+                starts,
+                ends,
+                self._start_time + start_costs / self.speed,
+                self._start_time + end_costs / self.speed,
+            )
+        if self.check_edges:
+            return obstacles.segments_collide(starts, ends)
+        return obstacles.contains_batch(ends)
+
+    def _extract_path(self, tree: RRTTree, goal_idx: int) -> np.ndarray:
+        """Extract path from RRT tree"""
+        return tree.positions[tree.branch(goal_idx)]
 
 
 class PursuitAI:
     """Intelligent pursuit AI with advanced behavior"""
 
-    def __init__(self, bounds: np.ndarray):
+    def __init__(
+        self,
+        bounds: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+        dwell_time: float = 0.5,
+        goal_spacing: float = 0.25,
+    ):
         self.bounds = bounds
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.evasion_radius = 0.15
         self.capture_radius = 0.05
         self.pursuer_speed = 0.02
         self.target_speed = 0.015
+        # The target wanders between held goals from a shared Poisson-disc
+        # set, pausing dwell_time seconds at each
+        self.goals = GoalTracker(
+            goal_set(bounds, goal_spacing), dwell_time=dwell_time, rng=self.rng
+        )
+
+    def reset(self):
+        """Drop the held goal, e.g. when a new scenario starts"""
+        self.goals.reset()
 
     def update_target_behavior(
-        self, target: Ship, pursuer: Ship, obstacles: List[Obstacle]
+        self, target: Ship, pursuer: Ship, obstacles: Obstacles, dt: float = 1 / 60
     ) -> np.ndarray:
         """Update target ship behavior (evade or move to goal)"""
         distance = np.linalg.norm(target.position - pursuer.position)
@@ -131,14 +797,16 @@ class PursuitAI:
         if distance < self.evasion_radius:
             # Evasion mode
             evasion_direction = target.position - pursuer.position
-            evasion_direction = evasion_direction / np.linalg.norm(evasion_direction)
+            norm = np.linalg.norm(evasion_direction)
+            if norm > 0:
+                evasion_direction = evasion_direction / norm
             new_pos = target.position + self.target_speed * evasion_direction
         else:
-            # Normal mode - move toward random goal
-            goal = self._generate_random_goal()
-            goal_direction = goal - target.position
-            goal_direction = goal_direction / np.linalg.norm(goal_direction)
-            new_pos = target.position + self.target_speed * goal_direction
+            # Normal mode - move toward the held goal
+            step = self.goals.steps(
+                target.position, self.target_speed, dt, as_obstacle_field(obstacles)
+            )
+            new_pos = target.position + step[0]
 
         # Constrain to bounds
         new_pos = np.clip(
@@ -149,24 +817,195 @@ class PursuitAI:
 
         return new_pos
 
-    def _generate_random_goal(self) -> np.ndarray:
-        """Generate random goal within bounds"""
-        return np.array(
-            [
-                random.uniform(self.bounds[0], self.bounds[1]),
-                random.uniform(self.bounds[2], self.bounds[3]),
-                random.uniform(self.bounds[4], self.bounds[5]),
-            ]
+
+class ReplanningPursuer:
+    """Pursuer flying an RRT plan that is repaired, not rebuilt, every tick
+
+    The tree is rooted at the last node the pursuer reached. Each tick drops
+    branches whose edges now hit an obstacle, grows the tree toward the
+    target within the tick's budget and flies toward the next node of the
+    cheapest branch that sees the target (or, failing that, the node nearest
+    to it). Reaching a node re-roots the tree there and prunes the branches
+    left behind, so everything grown ahead carries over to later ticks.
+    """
+
+    def __init__(
+        self,
+        planner: RRTPlanner,
+        position: np.ndarray,
+        speed: float = 0.02,
+        time_budget: Optional[float] = 0.002,
+        max_extensions: int = 50,
+        max_nodes: int = 2000,
+    ):
+        if not planner.check_edges:
+            raise ValueError("ReplanningPursuer needs RRTPlanner(check_edges=True)")
+        self.planner = planner
+        self.position = np.array(position, dtype=float)
+        self.speed = speed
+        # Per-tick growth limits; the time budget keeps ticks affordable at
+        # 60 Hz, the extension cap keeps seeded runs repeatable
+        self.time_budget = time_budget
+        self.max_extensions = max_extensions
+        self.max_nodes = max_nodes
+        self.path: Optional[np.ndarray] = None  # Plan from the pursuer onward
+        self.replans = 0  # Times the tree had to be rebuilt from scratch
+        self._obstacles: Optional[ObstacleField] = None
+        self._reset()
+
+    def _reset(self):
+        """Fresh tree rooted at the pursuer"""
+        self.tree = RRTTree(self.position)
+        self._next: Optional[int] = None  # Node the pursuer is flying to
+        self._reindex()
+
+    def _reindex(self):
+        self.index = create_nn_index(
+            self.planner.nn_backend,
+            self.planner.bounds,
+            self.planner.step_size,
+            self.max_nodes,
+        )
+        self.index.add_batch(self.tree.positions)
+
+    def update(self, target: np.ndarray, obstacles: Obstacles) -> np.ndarray:
+        """Advance one tick toward ``target`` and return the new position"""
+        obstacles = as_obstacle_field(obstacles)
+        if obstacles is not self._obstacles:
+            self._repair(obstacles)
+            self._obstacles = obstacles
+        self._grow(target, obstacles)
+
+        remaining = self.speed
+        while remaining > 0:
+            if self._next is None:
+                goal, sees_target = self._best_node(target, obstacles)
+                branch = self.tree.branch(goal)
+                if len(branch) > 1:
+                    self._next = int(branch[1])
+                else:
+                    if sees_target:
+                        self._fly_direct(target, remaining)
+                    break
+
+            offset = self.tree.positions[self._next] - self.position
+            distance = float(np.linalg.norm(offset))
+            if distance > remaining:
+                self.position = self.position + (remaining / distance) * offset
+                break
+            # Reached the node: it becomes the root, the rest is pruned
+            self.position = self.tree.positions[self._next].copy()
+            remaining -= distance
+            self.tree.reroot(self._next)
+            self._next = None
+            self._reindex()
+
+        self._update_path(target, obstacles)
+        return self.position
+
+    def _repair(self, obstacles: ObstacleField):
+        """Drop the subtrees of edges that now collide"""
+        children = np.flatnonzero(self.tree.parents != NO_PARENT)
+        if len(children) == 0:
+            return
+        positions = self.tree.positions
+        hit = obstacles.segments_collide(
+            positions[self.tree.parents[children]], positions[children]
+        )
+        if not hit.any():
+            return
+        dropped = self.tree.subtree_mask(children[hit])
+        if self._next is not None and dropped[self._next]:
+            # The edge being flown is blocked: start over from here
+            self.replans += 1
+            self._reset()
+            return
+        remap = self.tree.prune(~dropped)
+        if self._next is not None:
+            self._next = int(remap[self._next])
+        self._reindex()
+
+    def _grow(self, target: np.ndarray, obstacles: ObstacleField):
+        """Goal-biased extensions until the tick's budget runs out"""
+        deadline = (
+            None if self.time_budget is None else time.perf_counter() + self.time_budget
+        )
+        self.planner.grow(
+            self.tree,
+            self.index,
+            obstacles,
+            target,
+            deadline,
+            self.max_nodes,
+            self.max_extensions,
         )
 
+    def _best_node(
+        self, target: np.ndarray, obstacles: ObstacleField
+    ) -> Tuple[int, bool]:
+        """Cheapest node with a clear line to ``target``, else the nearest node
+
+        Returns:
+            The node and whether it sees the target
+        """
+        candidates = self.index.within_radius(target, self.planner.goal_radius)
+        if len(candidates):
+            positions = self.tree.positions[candidates]
+            visible = ~obstacles.segments_collide(
+                positions, np.broadcast_to(target, positions.shape)
+            )
+            if visible.any():
+                candidates = candidates[visible]
+                total = self.tree.costs[candidates] + np.linalg.norm(
+                    self.tree.positions[candidates] - target, axis=1
+                )
+                return int(candidates[np.argmin(total)]), True
+        return self.index.nearest(target), False
+
+    def _fly_direct(self, target: np.ndarray, remaining: float):
+        """Close on a visible target off the tree, then restart the tree there"""
+        offset = target - self.position
+        distance = float(np.linalg.norm(offset))
+        if distance > 0:
+            self.position = self.position + min(remaining / distance, 1.0) * offset
+        self._reset()
+
+    def _update_path(self, target: np.ndarray, obstacles: ObstacleField):
+        """Plan from the pursuer onward, for drawing"""
+        goal, sees_target = self._best_node(target, obstacles)
+        branch = self.tree.branch(goal)[1:]
+        if self._next is not None:
+            ahead = np.flatnonzero(branch == self._next)
+            branch = branch[ahead[0] :] if len(ahead) else np.array([self._next])
+        parts = [self.position[None, :], self.tree.positions[branch]]
+        if sees_target:
+            parts.append(np.asarray(target, dtype=float)[None, :])
+        self.path = np.vstack(parts)
+
 
 class StarWarsRenderer:
     """High-performance 3D renderer using OpenGL"""
 
-    def __init__(self, width: int = 1600, height: int = 900):
-        pygame.init()
-        pygame.display.set_mode((width, height), DOUBLEBUF | OPENGL)
-        pygame.display.set_caption("Star Wars RRT Path Planner - Python")
+    def __init__(
+        self,
+        width: int = 1600,
+        height: int = 900,
+        rng: Optional[np.random.Generator] = None,
+        retained: bool = True,
+        headless: bool = False,
+    ):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # Headless renderers draw into a framebuffer object on a context the
+        # caller made current (see render.create_offscreen_context)
+        self.headless = headless
+        self.target: Optional[OffscreenTarget] = None
+        if headless:
+            self.target = OffscreenTarget(width, height)
+            self.target.bind()
+        else:
+            pygame.init()
+            pygame.display.set_mode((width, height), DOUBLEBUF | OPENGL)
+            pygame.display.set_caption("Star Wars RRT Path Planner - Python")
 
         # OpenGL setup
         glEnable(GL_DEPTH_TEST)
@@ -174,17 +1013,43 @@ class StarWarsRenderer:
         glEnable(GL_LIGHT0)
         glEnable(GL_COLOR_MATERIAL)
 
+        # Perspective projection; without it the scene is clipped to the
+        # unit cube around the camera and almost nothing is visible
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(45.0, width / height, 0.01, 100.0)
+        glMatrixMode(GL_MODELVIEW)
+
         # Camera setup
         self.camera_pos = np.array([2.0, -2.0, 1.0])
         self.camera_target = np.array([0.0, 0.0, 0.0])
         self.camera_up = np.array([0.0, 0.0, 1.0])
+        self._eye = self.camera_pos  # Camera position of the current frame
 
         # Starfield
         self.stars = self._generate_starfield(1000)
 
+        # Retained mode keeps stars, obstacles and paths in vertex buffers and
+        # rebuilds them only when their source changes; immediate mode
+        # (glBegin/glEnd) is the fallback when buffers are unavailable
+        self.retained = retained and vbo_supported()
+        self._star_buffer: Optional[MeshBuffer] = None
+        self._obstacles: Optional[ObstacleRenderer] = None
+        self._obstacle_source = None
+        self._path_buffers: List[MeshBuffer] = []
+        self._path_sources: List[np.ndarray] = []
+        self._model_buffers = {}  # (id(model), level) -> MeshBuffer
+        self.ship_size = 0.05  # Bounding radius of a drawn ship
+        if self.retained:
+            self._star_buffer = MeshBuffer(
+                self.stars, colors=np.ones_like(self.stars), usage=GL_DYNAMIC_DRAW
+            )
+            # Shared unit meshes, instanced when the context allows
+            self._obstacles = ObstacleRenderer()
+
     def _generate_starfield(self, num_stars: int) -> np.ndarray:
         """Generate dynamic starfield"""
-        return np.random.randn(num_stars, 3) * 3
+        return self.rng.standard_normal((num_stars, 3)) * 3
 
     def render_frame(
         self,
@@ -194,6 +1059,8 @@ class StarWarsRenderer:
         camera_mode: str = "cinematic",
     ):
         """Render a single frame at 60 FPS"""
+        if self.target is not None:
+            self.target.bind()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glLoadIdentity()
 
@@ -204,23 +1071,39 @@ class StarWarsRenderer:
         self._render_starfield()
 
         # Render obstacles
-        for obstacle in obstacles:
-            self._render_obstacle(obstacle)
+        if self.retained:
+            self._render_obstacles_retained(obstacles)
+        else:
+            if isinstance(obstacles, ObstacleField):
+                obstacles = obstacles.to_obstacles(Obstacle)
+            for obstacle in obstacles:
+                self._render_obstacle(obstacle)
 
         # Render ships
         for ship in ships:
             self._render_ship(ship)
 
         # Render paths
-        for path in paths:
-            if len(path) > 1:
-                self._render_path(path)
+        if self.retained:
+            self._render_paths_retained(paths)
+        else:
+            for path in paths:
+                if len(path) > 1:
+                    self._render_path(path)
 
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
+
+    def read_frame(self) -> np.ndarray:
+        """Last rendered frame as ``(height, width, 3)`` uint8, top row first"""
+        if self.target is None:
+            raise RuntimeError("read_frame requires StarWarsRenderer(headless=True)")
+        return self.target.read_pixels()
 
     def _update_camera(self, mode: str, ships: List[Ship]):
         """Update camera position based on mode"""
         if mode == "cinematic":
+            self._eye = self.camera_pos
             gluLookAt(
                 self.camera_pos[0],
                 self.camera_pos[1],
@@ -237,6 +1120,7 @@ class StarWarsRenderer:
             ship_pos = ships[0].position
             camera_offset = np.array([-2.0, 0.0, 1.0])
             camera_pos = ship_pos + camera_offset
+            self._eye = camera_pos
             gluLookAt(
                 camera_pos[0],
                 camera_pos[1],
@@ -253,12 +1137,41 @@ class StarWarsRenderer:
         """Render starfield with varying star sizes"""
         glDisable(GL_LIGHTING)
         glPointSize(2.0)
-        glBegin(GL_POINTS)
-        for star in self.stars:
-            brightness = random.uniform(0.5, 1.0)
-            glColor3f(brightness, brightness, brightness)
-            glVertex3f(star[0], star[1], star[2])
-        glEnd()
+        brightness = self.rng.uniform(0.5, 1.0, len(self.stars))
+        if self._star_buffer is not None:
+            # One upload of the twinkle colors, one draw call
+            self._star_buffer.update_colors(np.repeat(brightness[:, None], 3, axis=1))
+            self._star_buffer.draw(GL_POINTS)
+        else:
+            glBegin(GL_POINTS)
+            for star, brightness in zip(self.stars, brightness.tolist()):
+                glColor3f(brightness, brightness, brightness)
+                glVertex3f(star[0], star[1], star[2])
+            glEnd()
+        glEnable(GL_LIGHTING)
+
+    def _render_obstacles_retained(self, obstacles: Obstacles):
+        """Draw all obstacles as instances, repacked when the set changes"""
+        if obstacles is not self._obstacle_source:
+            self._obstacles.set_obstacles(as_obstacle_field(obstacles))
+            self._obstacle_source = obstacles
+        self._obstacles.draw()
+
+    def _render_paths_retained(self, paths: List[np.ndarray]):
+        """Draw each path from its own buffer, re-uploaded when paths change"""
+        if len(paths) != len(self._path_sources) or any(
+            path is not source for path, source in zip(paths, self._path_sources)
+        ):
+            for buffer in self._path_buffers:
+                buffer.delete()
+            self._path_sources = list(paths)
+            self._path_buffers = [MeshBuffer(path) for path in paths if len(path) > 1]
+
+        glDisable(GL_LIGHTING)
+        glColor3f(1.0, 1.0, 0.0)  # Yellow path
+        glLineWidth(3.0)
+        for buffer in self._path_buffers:
+            buffer.draw(GL_LINE_STRIP)
         glEnable(GL_LIGHTING)
 
     def _render_obstacle(self, obstacle: Obstacle):
@@ -314,11 +1227,10 @@ class StarWarsRenderer:
         glTranslatef(ship.position[0], ship.position[1], ship.position[2])
 
         # Apply ship orientation
-        if ship.model is not None:
-            # Render 3D model
+        if ship.model is not None and self.retained:
+            # Render 3D model at the level of detail for its camera distance
             glColor3f(*ship.color)
-            # Simplified ship rendering for now
-            self._render_simple_ship()
+            self._render_model(ship.model, np.linalg.norm(ship.position - self._eye))
         else:
             # Render simple ship
             glColor3f(*ship.color)
@@ -326,6 +1238,17 @@ class StarWarsRenderer:
 
         glPopMatrix()
 
+    def _render_model(self, model: ShipModel, distance: float):
+        """Draw one LOD of a unit-radius model, uploading it on first use"""
+        level = model.select_lod(distance)
+        key = (id(model), level)
+        if key not in self._model_buffers:
+            self._model_buffers[key] = MeshBuffer(*model.lods[level])
+        glScalef(self.ship_size, self.ship_size, self.ship_size)
+        glEnable(GL_NORMALIZE)
+        self._model_buffers[key].draw(GL_TRIANGLES)
+        glDisable(GL_NORMALIZE)
+
     def _render_simple_ship(self):
         """Render simple ship geometry"""
         size = 0.05
@@ -348,44 +1271,144 @@ class StarWarsRenderer:
         glEnable(GL_LIGHTING)
 
 
+@dataclass
+class PursuitOutcome:
+    """Result of a simulate-only pursuit run
+
+    In swarm mode ``captured`` means every target has been captured.
+    """
+
+    steps: int
+    sim_time: float
+    captured: bool
+    capture_time: Optional[float]
+
+
 class StarWarsRRTApp:
-    """Main application class"""
+    """Main application class
 
-    def __init__(self):
-        self.bounds = np.array([-1.0, 1.0, -0.6, 0.6, -0.3, 0.3])
-        self.planner = RRTPlanner(self.bounds)
-        self.pursuit_ai = PursuitAI(self.bounds)
-        self.renderer = StarWarsRenderer()
+    ``bounds`` sets the planning and sampling volume, e.g. the bounds row of
+    a loaded scene; ``DEFAULT_BOUNDS`` otherwise.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        headless: bool = False,
+        size: Tuple[int, int] = (1600, 900),
+        render: bool = True,
+        bounds: Optional[np.ndarray] = None,
+    ):
+        if bounds is None:
+            bounds = DEFAULT_BOUNDS
+        self.bounds = np.array(bounds, dtype=float)
+        # Independent streams per consumer, all derived from one seed
+        seeds = np.random.SeedSequence(seed).spawn(6)
+        scene_seq, planner_seq, ai_seq, render_seq, swarm_seq, pursuer_seq = seeds
+        self.rng = np.random.default_rng(scene_seq)
+        self.planner = RRTPlanner(self.bounds, rng=np.random.default_rng(planner_seq))
+        self.pursuit_ai = PursuitAI(self.bounds, rng=np.random.default_rng(ai_seq))
+        self.swarm_ai = SwarmPursuit(self.bounds, rng=np.random.default_rng(swarm_seq))
+        self.swarm: Optional[Swarm] = None
+        self.swarm_size = (8, 24)  # Pursuers, targets
+        # The pursuit-mode pursuer follows an incrementally repaired plan;
+        # replanning=False flies it straight at the target instead
+        self.replanning = True
+        self.replan_budget: Optional[float] = 0.002  # Seconds per tick
+        self.pursuer_planner = RRTPlanner(
+            self.bounds, check_edges=True, rng=np.random.default_rng(pursuer_seq)
+        )
+        self.replanner: Optional[ReplanningPursuer] = None
+        # render=False builds no renderer at all, for simulate-only runs
+        self.renderer: Optional[StarWarsRenderer] = None
+        if render:
+            self.renderer = StarWarsRenderer(
+                *size, rng=np.random.default_rng(render_seq), headless=headless
+            )
 
         # Game state
         self.ships = []
         self.obstacles = []
+        self.obstacle_field = ObstacleField.from_obstacles([])
+        self.moving_obstacles: Optional[MovingObstacleField] = None
+        # Voxel edge length for an OccupancyGrid over static scenes; None
+        # keeps the plain obstacle field
+        self.voxel_resolution: Optional[float] = None
         self.paths = []
-        self.mode = "single"  # "single" or "pursuit"
+        self.mode = "single"  # "single", "pursuit" or "swarm"
         self.running = True
         self.clock = pygame.time.Clock()
 
+        # Fixed-timestep simulation: the world always advances in dt-second
+        # steps, independent of the frame rate; frames interpolate between
+        # the last two steps
+        self.dt = 1.0 / 60.0
+        self.max_frame_time = 0.25  # Clamp after stalls instead of spiralling
+        self.sim_time = 0.0
+        self.captured = False
+        self.capture_time: Optional[float] = None
+        self._accumulator = 0.0
+        self._previous_positions: List[np.ndarray] = []
+
         # Load STL models
         self.ship_models = self._load_ship_models()
 
     def _load_ship_models(self) -> dict:
         """Load STL models for ships"""
         models = {}
+        # Working directory first, then the model shipped with the MATLAB version
+        candidates = [
+            Path("falcon_clean_fixed.stl"),
+            MODELS_DIR / "falcon_clean_fixed.stl",
+        ]
         try:
-            # Try to load Millennium Falcon
-            models["falcon"] = trimesh.load("falcon_clean_fixed.stl")
+            # Try to load Millennium Falcon (parsed once, then from the LOD cache)
+            path = next(path for path in candidates if path.exists())
+            models["falcon"] = load_ship_model(path)
             print("✅ Loaded Millennium Falcon model")
-        except:
+        except Exception:
             print("⚠️ Could not load STL model, using simple geometry")
 
         return models
 
-    def setup_scenario(self, mode: str = "single"):
-        """Setup the scenario"""
+    def setup_scenario(
+        self,
+        mode: str = "single",
+        obstacles: Optional[Union[Obstacles, MovingObstacleField]] = None,
+    ):
+        """Setup the scenario, generating random obstacles unless a scene is given
+
+        A ``MovingObstacleField`` is re-sampled at the simulation time every
+        step, and the single-ship plan is made in space-time.
+        """
         self.mode = mode
+        self.sim_time = 0.0
+        self.captured = False
+        self.capture_time = None
+        self._accumulator = 0.0
+        self.pursuit_ai.reset()
 
         # Generate obstacles
-        self.obstacles = self._generate_obstacles(30)
+        if obstacles is None:
+            obstacles = self._generate_obstacles(30)
+        self.moving_obstacles = None
+        if isinstance(obstacles, MovingObstacleField):
+            self.moving_obstacles = obstacles
+            self.obstacle_field = self.obstacles = obstacles.at(self.sim_time)
+        elif isinstance(obstacles, ObstacleField):
+            self.obstacle_field = obstacles
+            self.obstacles = obstacles.to_obstacles(Obstacle)
+        else:
+            self.obstacles = list(obstacles)
+            self.obstacle_field = ObstacleField.from_obstacles(self.obstacles)
+        if (
+            self.voxel_resolution is not None
+            and self.moving_obstacles is None
+            and not isinstance(self.obstacle_field, OccupancyGrid)
+        ):
+            self.obstacle_field = OccupancyGrid(
+                self.obstacle_field, self.bounds, self.voxel_resolution
+            )
 
         if mode == "single":
             # Single ship navigation
@@ -399,7 +1422,10 @@ class StarWarsRRTApp:
             self.ships = [ship]
 
             # Plan path
-            path = self.planner.plan_path(start, goal, self.obstacles)
+            scene = self.obstacle_field
+            if self.moving_obstacles is not None:
+                scene = self.moving_obstacles
+            path = self.planner.plan_path(start, goal, scene)
             if path is not None:
                 self.paths = [path]
                 print(f"✅ Path planned: {len(path)} waypoints")
@@ -430,29 +1456,51 @@ class StarWarsRRTApp:
 
             self.ships = [pursuer, target]
             self.paths = []
+            self.replanner = None
+            if self.replanning:
+                self.replanner = ReplanningPursuer(
+                    self.pursuer_planner,
+                    pursuer_start,
+                    speed=self.pursuit_ai.pursuer_speed,
+                    time_budget=self.replan_budget,
+                )
 
-    def _generate_obstacles(self, num_obstacles: int) -> List[Obstacle]:
-        """Generate random obstacles"""
-        obstacles = []
-        for _ in range(num_obstacles):
-            obstacle_type = random.randint(0, 1)
-            position = np.array(
-                [
-                    random.uniform(self.bounds[0], self.bounds[1]),
-                    random.uniform(self.bounds[2], self.bounds[3]),
-                    random.uniform(self.bounds[4], self.bounds[5]),
-                ]
-            )
-            size = random.uniform(0.02, 0.08)
-            color = (
-                random.uniform(0.3, 0.7),
-                random.uniform(0.3, 0.7),
-                random.uniform(0.3, 0.7),
+        elif mode == "swarm":
+            # Many pursuers and targets stepped as arrays; each Ship views
+            # its row of the swarm arrays, so the renderer sees every update
+            self.swarm = Swarm.random(
+                *self.swarm_size, self.bounds, self.rng, self.obstacle_field
             )
+            self.swarm_ai.obstacles = self.obstacle_field
+            self.swarm_ai.goals.reset(len(self.swarm))
+            self.ships = [
+                Ship(
+                    position=self.swarm.positions[i],
+                    orientation=np.eye(3),
+                    velocity=self.swarm.velocities[i],
+                    color=(0.6, 0.6, 0.6) if role == TARGET else (0.8, 0.8, 0.8),
+                )
+                for i, role in enumerate(self.swarm.roles)
+            ]
+            self.paths = []
+
+        self._previous_positions = [ship.position.copy() for ship in self.ships]
 
-            obstacles.append(Obstacle(obstacle_type, position, size, color))
+    def _generate_obstacles(self, num_obstacles: int) -> List[Obstacle]:
+        """Generate random obstacles"""
+        types = self.rng.integers(0, 2, num_obstacles)
+        positions = self.rng.uniform(
+            self.bounds[0::2], self.bounds[1::2], (num_obstacles, 3)
+        )
+        sizes = self.rng.uniform(0.02, 0.08, num_obstacles)
+        colors = self.rng.uniform(0.3, 0.7, (num_obstacles, 3))
 
-        return obstacles
+        return [
+            Obstacle(int(obstacle_type), position, float(size), tuple(color))
+            for obstacle_type, position, size, color in zip(
+                types, positions, sizes, colors.tolist()
+            )
+        ]
 
     def run(self):
         """Main game loop"""
@@ -462,6 +1510,7 @@ class StarWarsRRTApp:
         print("  C - Change camera view")
         print("  ESC - Quit")
 
+        previous = time.perf_counter()
         while self.running:
             # Handle events
             for event in pygame.event.get():
@@ -477,18 +1526,87 @@ class StarWarsRRTApp:
                         # Cycle camera modes
                         pass
 
-            # Update game state
-            if self.mode == "pursuit":
-                self._update_pursuit()
+            # Update game state in fixed steps for the elapsed wall time
+            now = time.perf_counter()
+            alpha = self._advance(now - previous)
+            previous = now
 
             # Render frame
-            self.renderer.render_frame(self.ships, self.obstacles, self.paths)
+            self.renderer.render_frame(
+                self._interpolated_ships(alpha), self.obstacles, self.paths
+            )
 
-            # Maintain 60 FPS
+            # Cap rendering at 60 FPS
             self.clock.tick(60)
 
         pygame.quit()
 
+    def record(
+        self, sink, frames: int, camera_mode: str = "cinematic", fps: float = 60.0
+    ):
+        """Render ``frames`` frames into ``sink`` as fast as possible
+
+        Needs a headless renderer. Each frame advances the world by ``1 / fps``
+        simulated seconds, so the output plays back in real time at ``fps``.
+        """
+        try:
+            for _ in range(frames):
+                alpha = self._advance(1.0 / fps)
+                self.renderer.render_frame(
+                    self._interpolated_ships(alpha),
+                    self.obstacles,
+                    self.paths,
+                    camera_mode,
+                )
+                sink.write(self.renderer.read_frame())
+        finally:
+            sink.close()
+
+    def step(self):
+        """Advance the world by one fixed timestep of ``dt`` seconds"""
+        self._previous_positions = [ship.position.copy() for ship in self.ships]
+        self.sim_time += self.dt
+        if self.moving_obstacles is not None:
+            # New snapshot object, so renderers and the replanner pick it up
+            self.obstacle_field = self.moving_obstacles.at(self.sim_time)
+            self.obstacles = self.obstacle_field
+            if self.mode == "swarm":
+                self.swarm_ai.obstacles = self.obstacle_field
+        if self.mode == "pursuit":
+            self._update_pursuit()
+        elif self.mode == "swarm":
+            self._update_swarm()
+
+    def simulate(self, steps: int, stop_on_capture: bool = True) -> PursuitOutcome:
+        """Step the world without drawing, as fast as the CPU allows"""
+        taken = 0
+        while taken < steps and not (stop_on_capture and self.captured):
+            self.step()
+            taken += 1
+        return PursuitOutcome(taken, self.sim_time, self.captured, self.capture_time)
+
+    def _advance(self, elapsed: float) -> float:
+        """Run the fixed steps covered by ``elapsed`` wall seconds
+
+        Returns:
+            Fraction of a step left over, for interpolating the next frame
+        """
+        self._accumulator += min(elapsed, self.max_frame_time)
+        # Tolerate round-off, so frame times that sum to whole steps run them all
+        while self._accumulator >= self.dt - STEP_EPSILON:
+            self.step()
+            self._accumulator -= self.dt
+        return max(self._accumulator, 0.0) / self.dt
+
+    def _interpolated_ships(self, alpha: float) -> List[Ship]:
+        """Ships placed ``alpha`` of the way from the previous to the last step"""
+        if len(self._previous_positions) != len(self.ships):
+            return self.ships
+        return [
+            replace(ship, position=previous + alpha * (ship.position - previous))
+            for ship, previous in zip(self.ships, self._previous_positions)
+        ]
+
     def _update_pursuit(self):
         """Update pursuit scenario"""
         if len(self.ships) >= 2:
@@ -497,27 +1615,91 @@ class StarWarsRRTApp:
 
             # Update target behavior
             new_target_pos = self.pursuit_ai.update_target_behavior(
-                target, pursuer, self.obstacles
+                target, pursuer, self.obstacle_field, self.dt
             )
             target.position = new_target_pos
 
-            # Update pursuer (simple direct movement for now)
             direction = target.position - pursuer.position
             distance = np.linalg.norm(direction)
-            if distance > 0:
+            if self.replanner is not None:
+                # Follow the repaired plan around obstacles
+                pursuer.position = self.replanner.update(
+                    target.position, self.obstacle_field
+                )
+                self.paths = [self.replanner.path]
+            elif distance > 0:
+                # Straight at the target, ignoring obstacles
                 direction = direction / distance
                 pursuer.position += self.pursuit_ai.pursuer_speed * direction
 
             # Check for capture
-            if distance < self.pursuit_ai.capture_radius:
+            if distance < self.pursuit_ai.capture_radius and not self.captured:
                 print("🎯 Target captured!")
+                self.captured = True
+                self.capture_time = self.sim_time
                 target.color = (1.0, 0.0, 0.0)  # Turn red
 
+    def _update_swarm(self):
+        """Update every swarm ship in one vectorized step"""
+        for index in self.swarm_ai.step(self.swarm, self.dt):
+            self.ships[index].color = (1.0, 0.0, 0.0)
+        if len(self.swarm.free_targets) == 0 and not self.captured:
+            print("🎯 All targets captured!")
+            self.captured = True
+            self.capture_time = self.sim_time
+
 
 def main():
     """Main entry point"""
-    app = StarWarsRRTApp()
-    app.setup_scenario("single")
+    parser = argparse.ArgumentParser(description="Star Wars RRT Path Planner")
+    parser.add_argument("--seed", type=int, help="seed for a repeatable run")
+    parser.add_argument(
+        "--simulate",
+        type=int,
+        metavar="STEPS",
+        help="step the pursuit scenario without a window and report the outcome",
+    )
+    parser.add_argument(
+        "--swarm",
+        type=int,
+        nargs=2,
+        metavar=("PURSUERS", "TARGETS"),
+        help="simulate a swarm of pursuers and targets instead of one pair",
+    )
+    parser.add_argument(
+        "--scene", help="MATLAB obstacle CSV or .npy scene instead of a random field"
+    )
+    parser.add_argument(
+        "--voxel",
+        type=float,
+        metavar="RESOLUTION",
+        help="precompute a voxel occupancy grid with this voxel size",
+    )
+    args = parser.parse_args()
+    obstacles, bounds = load_scene(args.scene) if args.scene else (None, None)
+
+    if args.simulate is not None:
+        app = StarWarsRRTApp(seed=args.seed, render=False, bounds=bounds)
+        app.voxel_resolution = args.voxel
+        if args.swarm:
+            app.swarm_size = tuple(args.swarm)
+        app.setup_scenario("swarm" if args.swarm else "pursuit", obstacles)
+        tic = time.perf_counter()
+        outcome = app.simulate(args.simulate)
+        seconds = time.perf_counter() - tic
+        print(
+            f"{outcome.steps} steps ({outcome.sim_time:.2f}s simulated) in "
+            f"{seconds:.3f}s, {outcome.steps / seconds:.0f} steps/s"
+        )
+        if outcome.captured:
+            print(f"Captured after {outcome.capture_time:.2f}s")
+        else:
+            print("Evaded capture")
+        return
+
+    app = StarWarsRRTApp(seed=args.seed, bounds=bounds)
+    app.voxel_resolution = args.voxel
+    app.setup_scenario("single", obstacles)
     app.run()
 
 
@@ -0,0 +1 @@
+"""Test package init."""
@@ -0,0 +1,6 @@
+"""Pytest configuration - make ``src`` importable like ``python src/star_wars_rrt.py``"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
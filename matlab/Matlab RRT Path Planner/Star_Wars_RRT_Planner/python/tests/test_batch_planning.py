@@ -0,0 +1,52 @@
+"""Tests for parallel multi-query planning"""
+
+import numpy as np
+
+import batch_planning
+from batch_planning import plan_many
+from core import ObstacleField
+from star_wars_rrt import DEFAULT_BOUNDS, RRTPlanner
+from tests.test_rrt_planner import make_obstacles
+
+
+def make_queries(count):
+    rng = np.random.default_rng(0)
+    starts = rng.uniform([-0.9, -0.5, -0.2], [-0.6, 0.5, 0.2], (count, 3))
+    goals = rng.uniform([0.6, -0.5, -0.2], [0.9, 0.5, 0.2], (count, 3))
+    return list(zip(starts, goals))
+
+
+def test_results_in_order_and_reproducible():
+    """Pool results match an in-process run query for query"""
+    queries = make_queries(6)
+    field = ObstacleField.from_obstacles(make_obstacles())
+    planner = RRTPlanner(DEFAULT_BOUNDS, nn_backend="kdtree", mode="connect")
+
+    serial = plan_many(queries, field, workers=1, planner=planner, seed=7)
+    parallel = plan_many(queries, field, workers=2, planner=planner, seed=7)
+
+    assert len(parallel) == len(queries)
+    for (start, goal), a, b in zip(queries, serial, parallel):
+        assert a.seed == b.seed
+        assert a.iterations == b.iterations > 0
+        assert b.seconds >= 0
+        np.testing.assert_array_equal(a.path, b.path)
+        np.testing.assert_array_equal(b.path[0], start)
+        np.testing.assert_array_equal(b.path[-1], goal)
+
+
+def test_distinct_seeds_per_query():
+    results = plan_many(make_queries(4), make_obstacles(), workers=1)
+    assert len({r.seed for r in results}) == 4
+
+
+def test_in_process_run_leaves_the_planner_alone():
+    planner = RRTPlanner(DEFAULT_BOUNDS, rng=np.random.default_rng(3))
+    before = planner.rng.bit_generator.state
+
+    plan_many(make_queries(3), make_obstacles(), workers=1, planner=planner)
+
+    assert planner.rng.bit_generator.state == before
+    assert planner.last_iterations == 0
+    assert batch_planning._worker_planner is None
+    assert batch_planning._worker_field is None
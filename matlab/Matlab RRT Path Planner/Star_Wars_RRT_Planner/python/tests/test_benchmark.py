@@ -0,0 +1,75 @@
+"""Tests for the headless benchmark CLI"""
+
+import json
+
+import numpy as np
+
+from benchmark import main
+
+
+def test_report_covers_every_combination(tmp_path):
+    scene = tmp_path / "scene.csv"
+    scene.write_text("-1,-1,1,-0.5,0.5,-0.5,0.5,\n0,0,0.3,0,0.1,0.5,0.5,0.5\n")
+    output = tmp_path / "bench.json"
+
+    main(
+        [
+            "--scene",
+            str(scene),
+            "--random",
+            "10",
+            "--mode",
+            "rrt",
+            "connect",
+            "--iterations",
+            "500",
+            "2000",
+            "--trials",
+            "3",
+            "--output",
+            str(output),
+        ]
+    )
+    report = json.loads(output.read_text())
+
+    results = report["results"]
+    assert len(results) == 2 * 2 * 2
+    assert {r["scene"] for r in results} == {"scene.csv", "random_10"}
+    for result in results:
+        assert 0 <= result["success_rate"] <= 1
+        assert result["time_p50_s"] <= result["time_p95_s"]
+        assert result["nodes_mean"] >= 1
+        if result["success_rate"]:
+            assert result["path_length_mean"] > 0
+
+
+def test_same_seed_same_report(tmp_path):
+    args = ["--random", "20", "--trials", "2", "--iterations", "1000"]
+    first, second = main(args), main(args)
+
+    for a, b in zip(first["results"], second["results"]):
+        assert a["nodes_mean"] == b["nodes_mean"]
+        assert np.isclose(a["path_length_mean"], b["path_length_mean"])
+
+
+def test_expansion_batch_sweep():
+    report = main(
+        ["--random", "20", "--trials", "2", "--mode", "rrt"]
+        + ["--iterations", "2000", "--expansion-batch", "1", "8"]
+    )
+
+    results = report["results"]
+    assert [r["expansion_batch"] for r in results] == [1, 8]
+    assert all(r["success_rate"] == 1 for r in results)
+
+
+def test_planner_overrides_reach_the_report():
+    report = main(
+        ["--random", "20", "--trials", "2", "--mode", "rrt", "--iterations", "3000"]
+        + ["--step-size", "0.01", "--goal-bias", "0"]
+    )
+
+    (result,) = report["results"]
+    assert result["step_size"] == 0.01
+    assert result["goal_bias"] == 0
+    assert result["nodes_per_s"] > 0
@@ -0,0 +1,59 @@
+"""Tests for offscreen frame capture"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pygame
+import pytest
+
+from render import PNGSequenceSink, open_sink, write_png
+
+CAPTURE = Path(__file__).resolve().parent.parent / "src" / "capture.py"
+
+
+def read_png(path):
+    return pygame.surfarray.array3d(pygame.image.load(str(path))).swapaxes(0, 1)
+
+
+def test_png_round_trip(tmp_path):
+    image = np.random.default_rng(0).integers(0, 256, (7, 5, 3), dtype=np.uint8)
+    write_png(tmp_path / "image.png", image)
+
+    np.testing.assert_array_equal(read_png(tmp_path / "image.png"), image)
+
+
+def test_sink_selection(tmp_path):
+    sink = open_sink(tmp_path / "frames", 4, 2)
+    sink.write(np.zeros((2, 4, 3), dtype=np.uint8))
+    sink.close()
+
+    assert isinstance(sink, PNGSequenceSink)
+    assert [p.name for p in (tmp_path / "frames").iterdir()] == ["frame_00000.png"]
+
+
+def test_headless_capture_renders_scene(tmp_path):
+    """End to end on an EGL pbuffer; skipped where no EGL driver is present"""
+    env = dict(os.environ, PYOPENGL_PLATFORM="egl", EGL_PLATFORM="surfaceless")
+    env["XDG_CACHE_HOME"] = str(tmp_path / "cache")
+    result = subprocess.run(
+        [sys.executable, str(CAPTURE), str(tmp_path / "frames"), "--frames", "3"]
+        + ["--width", "160", "--height", "90", "--seed", "1"],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    if result.returncode != 0 and "egl" in result.stderr.lower():
+        pytest.skip("No EGL driver for offscreen rendering")
+    assert result.returncode == 0, result.stderr
+
+    frames = sorted((tmp_path / "frames").glob("*.png"))
+    assert len(frames) == 3
+    frame = read_png(frames[-1])
+    assert frame.shape == (90, 160, 3)
+    # Path pixels are pure yellow
+    yellow = (frame[:, :, 0] > 200) & (frame[:, :, 1] > 200) & (frame[:, :, 2] < 50)
+    assert yellow.any()
@@ -0,0 +1,109 @@
+"""Tests for the packed obstacle collision engine"""
+
+import numpy as np
+
+from core import CUBE, SPHERE, ObstacleField
+from star_wars_rrt import Obstacle
+
+
+def random_obstacles(rng, count):
+    return [
+        Obstacle(
+            int(rng.integers(0, 2)),
+            rng.uniform(-1, 1, 3) * [1.0, 0.6, 0.3],
+            float(rng.uniform(0.02, 0.2)),
+            tuple(rng.uniform(0.3, 0.7, 3)),
+        )
+        for _ in range(count)
+    ]
+
+
+def reference_collision(point, obstacles):
+    """Original per-obstacle loop from RRTPlanner._check_collision"""
+    for obstacle in obstacles:
+        if obstacle.type == SPHERE:
+            if np.linalg.norm(point - obstacle.position) <= obstacle.size:
+                return True
+        elif np.all(np.abs(point - obstacle.position) <= obstacle.size / 2):
+            return True
+    return False
+
+
+def test_point_and_batch_queries_match_loop():
+    rng = np.random.default_rng(0)
+    obstacles = random_obstacles(rng, 40)
+    field = ObstacleField.from_obstacles(obstacles)
+    points = rng.uniform(-1, 1, (2000, 3)) * [1.0, 0.6, 0.3]
+
+    expected = np.array([reference_collision(p, obstacles) for p in points])
+    assert expected.any() and not expected.all()
+    np.testing.assert_array_equal(field.contains_batch(points), expected)
+    np.testing.assert_array_equal([field.contains(p) for p in points], expected)
+
+
+def test_boundaries_are_inclusive():
+    field = ObstacleField([[0, 0, 0]], [0.5], [[2, 0, 0]], [0.5])
+
+    assert field.contains(np.array([0.5, 0, 0]))
+    assert field.contains(np.array([2.25, 0.25, -0.25]))
+    assert not field.contains(np.array([2.2501, 0, 0]))
+
+
+def test_round_trip_and_empty_field():
+    obstacles = [
+        Obstacle(CUBE, np.array([0.5, 0, 0]), 0.1, (0.1, 0.2, 0.3)),
+        Obstacle(SPHERE, np.array([0, 0.5, 0]), 0.2, (0.4, 0.5, 0.6)),
+    ]
+    field = ObstacleField.from_obstacles(obstacles)
+    unpacked = field.to_obstacles(Obstacle)
+
+    assert len(field) == 2
+    assert [o.type for o in unpacked] == [SPHERE, CUBE]
+    np.testing.assert_array_equal(unpacked[1].position, [0.5, 0, 0])
+    assert unpacked[0].color == (0.4, 0.5, 0.6)
+
+    empty = ObstacleField.from_obstacles([])
+    assert not empty.contains(np.zeros(3))
+    assert not empty.contains_batch(np.zeros((4, 3))).any()
+
+
+def test_segments_match_dense_sampling():
+    """Exact edge tests agree with finely sampled point checks"""
+    rng = np.random.default_rng(2)
+    field = ObstacleField(
+        rng.uniform(-1, 1, (10, 3)),
+        rng.uniform(0.05, 0.2, 10),
+        rng.uniform(-1, 1, (10, 3)),
+        rng.uniform(0.05, 0.3, 10),
+    )
+    starts = rng.uniform(-1, 1, (400, 3))
+    ends = starts + rng.normal(0, 0.3, (400, 3))
+    ends[:100, 1:] = starts[:100, 1:]  # axis-parallel edges
+
+    t = np.linspace(0, 1, 2001)[:, None]
+    sampled = [
+        field.contains_batch(a + t * (b - a)).any() for a, b in zip(starts, ends)
+    ]
+    np.testing.assert_array_equal(field.segments_collide(starts, ends), sampled)
+
+
+def test_segment_clipping_thin_obstacle():
+    """An edge whose endpoints are both free can still cross an obstacle"""
+    field = ObstacleField([[0, 0, 0]], [0.01], [[1, 0, 0]], [0.02])
+    start, end = np.array([-0.5, 0, 0]), np.array([1.5, 0, 0])
+
+    assert not field.contains(start) and not field.contains(end)
+    assert field.segment_collides(start, end)
+    assert not field.segment_collides(start, np.array([-0.5, 0.5, 0]))
+
+
+def test_from_array_reads_matlab_rows():
+    rows = [
+        [SPHERE, 0.1, 0.2, 0.3, 0.05, 0.6, 0.6, 0.6],
+        [CUBE, -0.1, 0.0, 0.1, 0.04, 0.5, 0.3, 0.1],
+    ]
+    field = ObstacleField.from_array(rows)
+
+    np.testing.assert_array_equal(field.sphere_centers, [[0.1, 0.2, 0.3]])
+    np.testing.assert_array_equal(field.cube_sizes, [0.04])
+    np.testing.assert_array_equal(field.cube_colors, [[0.5, 0.3, 0.1]])
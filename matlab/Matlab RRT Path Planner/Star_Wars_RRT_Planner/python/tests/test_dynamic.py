@@ -0,0 +1,118 @@
+"""Tests for moving obstacles and space-time collision queries"""
+
+import numpy as np
+import pytest
+
+from core import CUBE, SPHERE, MovingObstacleField, ObstacleField, Trajectories
+from star_wars_rrt import Obstacle, RRTPlanner
+
+BOUNDS = np.array([-1.0, 1.0, -0.6, 0.6, -0.3, 0.3])
+GREY = (0.5, 0.5, 0.5)
+
+
+def test_velocity_and_waypoint_tracks():
+    motion = Trajectories.from_motion(
+        [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]],
+        [[0.1, 0.0, 0.0], [0.0, 0.0, 0.0]],
+        [None, ([0.0, 1.0, 3.0], [[0, 0, 0], [0, 1, 0], [0, 1, 2]])],
+    )
+    centers = motion.centers([-1.0, 0.5, 2.0, 10.0])
+
+    np.testing.assert_allclose(centers[:, 0, 0], [-0.1, 0.05, 0.2, 1.0])
+    np.testing.assert_allclose(
+        centers[:, 1], [[0, 0, 0], [0, 0.5, 0], [0, 1, 1], [0, 1, 2]]
+    )
+    assert np.isclose(motion.max_speed, 1.0)
+
+
+def test_looping_waypoints_repeat():
+    motion = Trajectories.from_motion(
+        [[0.0, 0.0, 0.0]],
+        waypoints=[([0.0, 1.0, 2.0], [[0, 0, 0], [1, 0, 0], [0, 0, 0]])],
+        loop=True,
+    )
+    np.testing.assert_allclose(
+        motion.centers([0.5, 2.5, 4.5]), motion.centers([0.5, 0.5, 0.5])
+    )
+
+
+def test_snapshots_wrap_like_matlab():
+    moving = MovingObstacleField.from_array(
+        [[SPHERE, 0.9, 0.0, 0.0, 0.05, 0.5, 0.5, 0.5]], [[0.2, 0.0, 0.0]], BOUNDS
+    )
+    snapshot = moving.at(1.0)
+
+    assert isinstance(snapshot, ObstacleField)
+    np.testing.assert_allclose(snapshot.sphere_centers, [[-0.9, 0.0, 0.0]])
+    np.testing.assert_array_equal(snapshot.sphere_radii, [0.05])
+
+
+def test_batched_queries_match_snapshots():
+    rng = np.random.default_rng(0)
+    obstacles = [
+        Obstacle(
+            int(kind),
+            rng.uniform(BOUNDS[0::2], BOUNDS[1::2]),
+            0.15,
+            GREY,
+            velocity=rng.uniform(-0.3, 0.3, 3),
+        )
+        for kind in rng.integers(0, 2, 20)
+    ]
+    moving = MovingObstacleField.from_obstacles(obstacles, BOUNDS)
+    points = rng.uniform(BOUNDS[0::2], BOUNDS[1::2], (300, 3))
+    times = rng.uniform(0.0, 5.0, 300)
+
+    expected = [moving.at(t).contains(p) for p, t in zip(points, times)]
+    np.testing.assert_array_equal(moving.contains_batch(points, times), expected)
+    assert moving.contains(points[0], times[0]) == expected[0]
+
+
+def test_edges_collide_only_when_the_obstacle_is_there():
+    # A cube sweeping along +y crosses x = 0 at t = 1
+    moving = MovingObstacleField.from_obstacles(
+        [Obstacle(CUBE, np.array([0.0, -1.0, 0.0]), 0.2, GREY, np.array([0, 1, 0]))]
+    )
+    start, end = np.array([-0.5, 0.0, 0.0]), np.array([0.5, 0.0, 0.0])
+
+    assert moving.segment_collides(start, end, 0.5, 1.5)
+    assert not moving.segment_collides(start, end, 2.0, 3.0)
+    np.testing.assert_array_equal(
+        moving.segments_collide([start, start], [end, end], [0.5, 2.0], [1.5, 3.0]),
+        [True, False],
+    )
+
+
+def test_space_time_plan_avoids_moving_obstacles():
+    rng = np.random.default_rng(1)
+    obstacles = [
+        Obstacle(
+            SPHERE,
+            np.array([x, y, 0.0]),
+            0.12,
+            GREY,
+            velocity=np.array([0.0, rng.uniform(-0.4, 0.4), 0.0]),
+        )
+        for x in (-0.4, 0.0, 0.4)
+        for y in (-0.3, 0.3)
+    ]
+    moving = MovingObstacleField.from_obstacles(obstacles, BOUNDS)
+    planner = RRTPlanner(BOUNDS, rng=np.random.default_rng(2))
+    planner.speed = 0.5
+    start, goal = np.array([-0.8, 0.0, 0.0]), np.array([0.8, 0.0, 0.0])
+
+    path = planner.plan_path(start, goal, moving, start_time=1.0)
+
+    assert path is not None
+    times = planner.last_times
+    assert times[0] == 1.0 and np.all(np.diff(times) > 0)
+    assert not moving.segments_collide(
+        path[:-1], path[1:], times[:-1], times[1:], resolution=0.002
+    ).any()
+
+
+def test_only_plain_rrt_plans_in_space_time():
+    moving = MovingObstacleField(ObstacleField.from_obstacles([]))
+    planner = RRTPlanner(BOUNDS, mode="connect")
+    with pytest.raises(ValueError):
+        planner.plan_path(np.zeros(3), np.ones(3) * 0.2, moving)
@@ -0,0 +1,134 @@
+"""Tests for Poisson-disc goal sets and the target goal state machine"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from core import (
+    SPHERE,
+    GoalRegions,
+    GoalTracker,
+    ObstacleField,
+    goal_set,
+    poisson_disc,
+)
+from star_wars_rrt import Obstacle, PursuitAI, Ship
+
+BOUNDS = np.array([-1.0, 1.0, -0.6, 0.6, -0.3, 0.3])
+DT = 1 / 60
+
+
+def test_poisson_disc_is_spaced_and_maximal():
+    radius = 0.15
+    points = poisson_disc(BOUNDS, radius, np.random.default_rng(0))
+
+    assert (points >= BOUNDS[0::2]).all() and (points <= BOUNDS[1::2]).all()
+    tree = cKDTree(points)
+    assert tree.query(points, k=2)[0][:, 1].min() >= radius
+    # Nowhere in the bounds is more than two radii from a point
+    probes = np.random.default_rng(1).uniform(BOUNDS[0::2], BOUNDS[1::2], (2000, 3))
+    assert tree.query(probes)[0].max() < 2 * radius
+
+
+def test_goal_set_is_built_once_and_read_only():
+    first = goal_set(BOUNDS, 0.3)
+    assert goal_set(BOUNDS.copy(), 0.3) is first
+    assert not first.flags.writeable
+    assert goal_set(BOUNDS, 0.3, seed=1) is not first
+
+
+def test_goal_is_held_until_arrival_then_dwells():
+    points = np.array([[0.5, 0.0, 0.0]])
+    tracker = GoalTracker(points, dwell_time=0.1, rng=np.random.default_rng(0))
+    position = np.zeros(3)
+
+    moves = []
+    for _ in range(60):
+        step = tracker.steps(position, 0.02, DT)[0]
+        moves.append(np.linalg.norm(step))
+        position = position + step
+    moves = np.array(moves)
+
+    # 25 full steps to the goal, then every arrival is followed by a dwell
+    np.testing.assert_allclose(moves[:25], 0.02)
+    np.testing.assert_allclose(position, points[0])
+    assert (moves[25:] == 0).all()
+    dwelling = np.flatnonzero(tracker.dwell > 0)
+    assert len(dwelling) == 1
+
+
+def test_dwell_lasts_dwell_time():
+    tracker = GoalTracker(np.array([[0.01, 0.0, 0.0], [0.5, 0.0, 0.0]]), 1, 0.1)
+    tracker.goals[0] = [0.01, 0.0, 0.0]
+    tracker.has_goal[0] = True
+    tracker.steps(np.zeros(3), 0.02, DT)  # Arrives
+
+    held = 0
+    while tracker.dwell[0] > 1e-9:
+        tracker.steps(np.array([0.01, 0.0, 0.0]), 0.02, DT)
+        held += 1
+    assert held == int(np.ceil(0.1 / DT))
+
+
+def test_goals_inside_obstacles_are_dropped():
+    points = np.array([[0.5, 0.0, 0.0], [-0.5, 0.0, 0.0]])
+    tracker = GoalTracker(points, rng=np.random.default_rng(0))
+    tracker.goals[0] = points[0]
+    tracker.has_goal[0] = True
+
+    blocker = ObstacleField.from_obstacles(
+        [Obstacle(SPHERE, points[0], 0.1, (0.5, 0.5, 0.5))]
+    )
+    for _ in range(10):
+        tracker.steps(np.zeros(3), 0.02, DT, blocker)
+        np.testing.assert_array_equal(tracker.goals[0], points[1])
+
+
+def test_target_heads_steadily_for_its_goal():
+    ai = PursuitAI(BOUNDS, rng=np.random.default_rng(4))
+    target = Ship(np.zeros(3), np.eye(3), np.zeros(3))
+    pursuer = Ship(np.array([0.9, 0.5, 0.2]), np.eye(3), np.zeros(3))
+    field = ObstacleField.from_obstacles([])
+
+    directions = []
+    for _ in range(5):
+        new_position = ai.update_target_behavior(target, pursuer, field)
+        directions.append((new_position - target.position) / ai.target_speed)
+        target.position = new_position
+    np.testing.assert_allclose(directions, np.broadcast_to(directions[0], (5, 3)))
+
+
+def test_goal_regions_hit_the_nearest_containing_center():
+    regions = GoalRegions([[0.0, 0, 0], [0.15, 0, 0], [1.0, 0, 0]], [0.1, 0.1, 0.3])
+    points = np.array([[0.05, 0, 0], [0.1, 0, 0], [0.5, 0, 0], [0.75, 0, 0]])
+
+    np.testing.assert_array_equal(regions.hits(points), [0, 1, -1, 2])
+    assert [regions.hit(p) for p in points] == [0, 1, -1, 2]
+    np.testing.assert_allclose(regions.lower_bounds(np.zeros(3)), [0.0, 0.05, 0.7])
+
+
+def test_goal_regions_prefer_open_regions():
+    regions = GoalRegions([[0.0, 0, 0], [0.15, 0, 0]], [0.1, 0.2])
+    point = np.array([0.05, 0.0, 0.0])
+    closed_first = np.array([False, True])
+
+    assert regions.hit(point) == 0
+    assert regions.hit(point, closed_first) == 1
+    # A point only a closed region contains still reports it
+    assert regions.hit(np.array([-0.05, 0, 0]), np.array([False, True])) == 0
+    np.testing.assert_array_equal(
+        regions.hits([point, [0.3, 0, 0], [1.0, 0, 0]], closed_first), [1, 1, -1]
+    )
+
+
+def test_goal_regions_skip_blocked_centers():
+    regions = GoalRegions([[0.5, 0, 0], [-0.5, 0, 0], [0, 0.3, 0]], 0.1)
+    blocker = ObstacleField.from_obstacles(
+        [Obstacle(SPHERE, np.array([0.5, 0, 0]), 0.1, (0.5, 0.5, 0.5))]
+    )
+
+    free = regions.without_blocked(blocker)
+    np.testing.assert_array_equal(free.ids, [1, 2])
+    np.testing.assert_array_equal(free.centers, regions.centers[1:])
+    # With nothing free, every goal stays a candidate
+    single = GoalRegions([0.5, 0, 0], 0.1)
+    assert single.without_blocked(blocker) is single
@@ -0,0 +1,53 @@
+"""Tests for renderer mesh generation"""
+
+import numpy as np
+
+from core import ObstacleField
+from render import instance_array, unit_cube, uv_sphere
+
+
+def face_normals(vertices, indices):
+    a, b, c = (vertices[indices[:, k]] for k in range(3))
+    return np.cross(b - a, c - a)
+
+
+def test_sphere_is_unit_and_outward():
+    vertices, normals, indices = uv_sphere(16, 16)
+    cross = face_normals(vertices, indices)
+    centroid = vertices[indices].mean(axis=1)
+    area = np.linalg.norm(cross, axis=1)
+
+    np.testing.assert_allclose(np.linalg.norm(vertices, axis=1), 1.0, rtol=1e-6)
+    np.testing.assert_array_equal(vertices, normals)
+    assert indices.max() < len(vertices)
+    # Pole triangles are degenerate; every other one faces outward
+    assert np.all(np.einsum("ij,ij->i", cross, centroid)[area > 1e-6] > 0)
+
+
+def test_cube_faces_point_along_normals():
+    vertices, normals, indices = unit_cube()
+    cross = face_normals(vertices, indices)
+
+    assert len(indices) == 12
+    np.testing.assert_array_equal(np.abs(vertices), 0.5)
+    assert np.all(np.einsum("ij,ij->i", cross, normals[indices[:, 0]]) > 0)
+
+
+def test_instance_array_packs_fields():
+    field = ObstacleField(
+        [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]],
+        [0.5, 0.25],
+        [[0.0, 2.0, 0.0]],
+        [0.4],
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        [[0.0, 0.0, 1.0]],
+    )
+    spheres = instance_array(
+        field.sphere_centers, field.sphere_radii, field.sphere_colors
+    )
+    cubes = instance_array(field.cube_centers, field.cube_sizes, field.cube_colors)
+
+    assert spheres.dtype == np.float32 and spheres.shape == (2, 7)
+    np.testing.assert_array_equal(spheres[1], [1.0, 0.0, 0.0, 0.25, 0.0, 1.0, 0.0])
+    np.testing.assert_allclose(cubes[0], [0.0, 2.0, 0.0, 0.4, 0.0, 0.0, 1.0])
+    assert instance_array(np.empty((0, 3)), [], np.empty((0, 3))).shape == (0, 7)
@@ -0,0 +1,62 @@
+"""Tests for the ship model LOD pipeline and cache"""
+
+import numpy as np
+import pytest
+import trimesh
+
+from render import load_ship_model
+from render import models as ship_models
+
+
+@pytest.fixture
+def stl_path(tmp_path):
+    path = tmp_path / "ship.stl"
+    trimesh.creation.icosphere(subdivisions=3, radius=2.0).export(path)
+    return path
+
+
+def test_levels_get_coarser_and_stay_normalized(stl_path, tmp_path):
+    model = load_ship_model(stl_path, tmp_path / "cache", levels=(0, 8, 3))
+    counts = model.face_counts()
+
+    assert counts[0] == 1280
+    assert counts[0] > counts[1] > counts[2] > 0
+    for vertices, normals in model.lods:
+        assert vertices.dtype == np.float32 and vertices.shape == normals.shape
+        assert np.linalg.norm(vertices, axis=1).max() <= 1.0 + 1e-6
+    # Outward faces keep outward normals after decimation
+    vertices, normals = model.lods[1]
+    assert np.all(np.einsum("ij,ij->i", vertices, normals) > 0)
+
+
+def test_cache_hit_skips_parsing(stl_path, tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    first = load_ship_model(stl_path, cache)
+
+    def fail(data):
+        raise AssertionError("STL parsed despite a cached copy")
+
+    monkeypatch.setattr(ship_models, "_parse_stl", fail)
+    second = load_ship_model(stl_path, cache)
+
+    assert len(list(cache.glob("*.npz"))) == 1
+    for (a, _), (b, _) in zip(first.lods, second.lods):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_changed_source_invalidates_cache(stl_path, tmp_path):
+    cache = tmp_path / "cache"
+    load_ship_model(stl_path, cache)
+    trimesh.creation.box().export(stl_path)
+
+    model = load_ship_model(stl_path, cache)
+
+    assert model.face_counts()[0] == 12
+    assert len(list(cache.glob("*.npz"))) == 2
+
+
+def test_lod_selection_by_distance(stl_path, tmp_path):
+    model = load_ship_model(stl_path, tmp_path)
+    model.lod_distances = (1.0, 3.0)
+
+    assert [model.select_lod(d) for d in (0.2, 1.0, 2.0, 3.5, 50.0)] == [0, 1, 1, 2, 2]
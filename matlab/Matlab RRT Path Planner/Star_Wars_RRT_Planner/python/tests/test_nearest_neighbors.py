@@ -0,0 +1,114 @@
+"""Tests for the nearest-neighbor backends"""
+
+import numpy as np
+import pytest
+
+from core import NN_BACKENDS, LinearIndex, SpatialHashIndex, create_nn_index
+
+BOUNDS = np.array([-1.0, 1.0, -0.6, 0.6, -0.3, 0.3])
+
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+@pytest.mark.parametrize("cell_size", [0.02, 0.1, 0.5])
+def test_nearest_matches_linear_scan(backend, cell_size):
+    """Every backend returns an exact nearest neighbor"""
+    rng = np.random.default_rng(0)
+    index = create_nn_index(backend, BOUNDS, cell_size)
+    reference = LinearIndex()
+
+    # Include points and queries outside the bounds
+    points = rng.uniform(-1.2, 1.2, (2000, 3)) * [1.0, 0.6, 0.3]
+    for i, point in enumerate(points):
+        index.add(point)
+        reference.add(point)
+        if i % 5 == 0:
+            query = rng.uniform(-1.3, 1.3, 3)
+            found = points[index.nearest(query)]
+            expected = points[reference.nearest(query)]
+            assert np.isclose(
+                np.linalg.norm(found - query), np.linalg.norm(expected - query)
+            )
+
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+def test_within_radius_matches_linear_scan(backend):
+    rng = np.random.default_rng(2)
+    index = create_nn_index(backend, BOUNDS, 0.05)
+    reference = LinearIndex()
+
+    for i, point in enumerate(rng.uniform(-1.1, 1.1, (2000, 3)) * [1.0, 0.6, 0.3]):
+        index.add(point)
+        reference.add(point)
+        if i % 5 == 0:
+            query = rng.uniform(-1.1, 1.1, 3)
+            radius = rng.uniform(0.0, 0.3)
+            found = np.sort(index.within_radius(query, radius))
+            np.testing.assert_array_equal(
+                found, np.sort(reference.within_radius(query, radius))
+            )
+
+
+def test_indices_follow_insertion_order():
+    """Node ids returned by add() line up with the stored points"""
+    index = create_nn_index("kdtree", BOUNDS, 0.05)
+    points = np.random.default_rng(1).uniform(-0.5, 0.5, (300, 3))
+    ids = [index.add(p) for p in points]
+
+    assert ids == list(range(300))
+    np.testing.assert_array_equal(index.points, points)
+    assert index.nearest(points[123]) == 123
+
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+def test_batch_calls_match_single_calls(backend):
+    """add_batch ids and nearest_batch answers match add and nearest"""
+    rng = np.random.default_rng(4)
+    index = create_nn_index(backend, BOUNDS, 0.05)
+    reference = LinearIndex()
+
+    for _ in range(12):
+        points = rng.uniform(-1.1, 1.1, (int(rng.integers(1, 200)), 3)) * [1, 0.6, 0.3]
+        ids = index.add_batch(points)
+        assert list(ids) == [reference.add(p) for p in points]
+        queries = rng.uniform(-1.2, 1.2, (50, 3)) * [1, 0.6, 0.3]
+        found = index.points[index.nearest_batch(queries)]
+        expected = reference.points[[reference.nearest(q) for q in queries]]
+        np.testing.assert_allclose(
+            np.linalg.norm(found - queries, axis=1),
+            np.linalg.norm(expected - queries, axis=1),
+        )
+
+
+def test_spatial_hash_small_step_on_scene_bounds():
+    """A tiny step on the full scene bounds stays sparse and exact"""
+    bounds = np.array([-2.0, 2.0, -1.0, 1.0, -0.5, 0.5])
+    rng = np.random.default_rng(5)
+    index = SpatialHashIndex(bounds, 0.0005)
+    reference = LinearIndex()
+
+    # A compact tree near the start, queried from anywhere in the scene
+    points = rng.normal([-1.8, 0.0, 0.0], 0.05, (3000, 3))
+    index.add_batch(points)
+    reference.add_batch(points)
+    assert len(index._cells) <= len(points)
+
+    queries = rng.uniform(bounds[0::2], bounds[1::2], (200, 3))
+    found = points[index.nearest_batch(queries)]
+    expected = points[reference.nearest_batch(queries)]
+    np.testing.assert_allclose(
+        np.linalg.norm(found - queries, axis=1),
+        np.linalg.norm(expected - queries, axis=1),
+    )
+
+
+def test_spatial_hash_cell_floor_from_expected_nodes():
+    bounds = np.array([-2.0, 2.0, -1.0, 1.0, -0.5, 0.5])
+    assert SpatialHashIndex(bounds, 0.002).cell_size == 0.002
+    floored = create_nn_index("spatial_hash", bounds, 0.002, expected_nodes=8000)
+    assert np.isclose(floored.cell_size, 0.1)
+    assert create_nn_index("spatial_hash", bounds, 0.5, 8000).cell_size == 0.5
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        create_nn_index("octree", BOUNDS, 0.05)
@@ -0,0 +1,125 @@
+"""Tests for the voxel occupancy grid and its distance field"""
+
+import numpy as np
+import pytest
+
+from core import ObstacleField, OccupancyGrid, random_scene
+from core.occupancy import BLOCKED, FREE, MIXED
+from star_wars_rrt import RRTPlanner, StarWarsRRTApp
+from tests.test_rrt_planner import BOUNDS, GOAL, START
+
+
+def obstacle_distance(field, points):
+    """Exact distance from each point to the nearest obstacle surface"""
+    distances = np.full(len(points), np.inf)
+    if len(field.sphere_radii):
+        offsets = points[:, None, :] - field.sphere_centers[None]
+        spheres = np.linalg.norm(offsets, axis=2) - field.sphere_radii
+        distances = np.minimum(distances, spheres.min(axis=1))
+    if len(field.cube_sizes):
+        gaps = np.abs(points[:, None, :] - field.cube_centers[None])
+        gaps = np.maximum(gaps - field.cube_half_sizes[None, :, None], 0.0)
+        distances = np.minimum(distances, np.linalg.norm(gaps, axis=2).min(axis=1))
+    return distances
+
+
+@pytest.fixture(scope="module")
+def scene():
+    field = random_scene(60, BOUNDS, np.random.default_rng(0), (0.03, 0.15))
+    return field, OccupancyGrid(field, BOUNDS, 0.03)
+
+
+def test_point_queries_match_the_exact_field(scene):
+    field, grid = scene
+    rng = np.random.default_rng(1)
+    # Include points outside the grid and points on voxel faces
+    points = np.vstack(
+        [
+            rng.uniform(BOUNDS[0::2] - 0.1, BOUNDS[1::2] + 0.1, (20000, 3)),
+            np.round(rng.uniform(BOUNDS[0::2], BOUNDS[1::2], (2000, 3)) / 0.03) * 0.03,
+        ]
+    )
+
+    expected = field.contains_batch(points)
+    np.testing.assert_array_equal(grid.contains_batch(points), expected)
+    assert [grid.contains(p) for p in points[:500]] == expected[:500].tolist()
+    assert set(np.unique(grid.states)) == {FREE, MIXED, BLOCKED}
+
+
+def test_clearance_is_a_lower_bound(scene):
+    field, grid = scene
+    points = np.random.default_rng(2).uniform(BOUNDS[0::2], BOUNDS[1::2], (20000, 3))
+    clearance = grid.clearance(points)
+    free = ~field.contains_batch(points)
+
+    assert np.all(clearance[free] < obstacle_distance(field, points[free]))
+    assert not clearance[~free].any()
+    assert (clearance > 0.1).mean() > 0.1
+
+
+def test_edge_queries_match_the_exact_field(scene):
+    field, grid = scene
+    rng = np.random.default_rng(3)
+    starts = rng.uniform(BOUNDS[0::2], BOUNDS[1::2], (5000, 3))
+    ends = starts + rng.normal(scale=0.1, size=starts.shape)
+
+    np.testing.assert_array_equal(
+        grid.segments_collide(starts, ends), field.segments_collide(starts, ends)
+    )
+
+
+def test_saved_grid_loads_memory_mapped(scene, tmp_path):
+    _, grid = scene
+    grid.save(tmp_path / "grid")
+    loaded = OccupancyGrid.load(tmp_path / "grid")
+
+    assert isinstance(loaded.states, np.memmap)
+    np.testing.assert_array_equal(loaded.states, grid.states)
+    np.testing.assert_array_equal(loaded.to_array(), grid.to_array())
+    points = np.random.default_rng(4).uniform(BOUNDS[0::2], BOUNDS[1::2], (1000, 3))
+    np.testing.assert_array_equal(
+        loaded.contains_batch(points), grid.contains_batch(points)
+    )
+    np.testing.assert_array_equal(loaded.clearance(points), grid.clearance(points))
+
+
+def test_empty_grid_is_all_free():
+    grid = OccupancyGrid(ObstacleField.from_array(np.empty((0, 8))), BOUNDS, 0.1)
+
+    assert not grid.states.any()
+    assert np.isinf(grid.clearance(np.zeros((1, 3)))).all()
+
+
+def test_clearance_steps_take_fewer_nodes(scene):
+    field, grid = scene
+    nodes = {}
+    for name, obstacles in (("field", field), ("grid", grid)):
+        planner = RRTPlanner(BOUNDS, check_edges=True, rng=np.random.default_rng(5))
+        path = planner.plan_path(START, GOAL, obstacles)
+        assert path is not None
+        assert not field.segments_collide(path[:-1], path[1:]).any()
+        nodes[name] = planner.last_nodes
+
+    assert nodes["grid"] < nodes["field"]
+
+
+def test_batched_clearance_steps_stay_collision_free(scene):
+    field, grid = scene
+    planner = RRTPlanner(BOUNDS, check_edges=True, rng=np.random.default_rng(6))
+    planner.expansion_batch = 32
+
+    path = planner.plan_path(START, GOAL, grid)
+
+    assert path is not None
+    assert not field.segments_collide(path[:-1], path[1:]).any()
+    steps = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    assert np.all(steps <= planner.max_step_size + 1e-12)
+
+
+def test_app_voxelizes_static_scenes():
+    app = StarWarsRRTApp(seed=0, render=False)
+    app.voxel_resolution = 0.05
+    app.setup_scenario("single")
+
+    assert isinstance(app.obstacle_field, OccupancyGrid)
+    assert app.obstacle_field.shape == (40, 24, 12)
@@ -0,0 +1,88 @@
+"""Tests for the incrementally replanning pursuer"""
+
+import numpy as np
+import pytest
+
+from core import CUBE, ObstacleField, RRTTree, create_nn_index
+from star_wars_rrt import Obstacle, ReplanningPursuer, RRTPlanner
+
+BOUNDS = np.array([-1.0, 1.0, -1.0, 1.0, -1.0, 1.0])
+START = np.array([-0.8, 0.0, 0.0])
+TARGET = np.array([0.8, 0.0, 0.0])
+
+
+def wall() -> ObstacleField:
+    return ObstacleField.from_obstacles(
+        [Obstacle(CUBE, np.zeros(3), 0.8, (0.5, 0.5, 0.5))]
+    )
+
+
+def make_pursuer(seed: int = 0) -> ReplanningPursuer:
+    planner = RRTPlanner(BOUNDS, check_edges=True, rng=np.random.default_rng(seed))
+    return ReplanningPursuer(planner, START, time_budget=None)
+
+
+def test_requires_edge_checking_planner():
+    with pytest.raises(ValueError):
+        ReplanningPursuer(RRTPlanner(BOUNDS), START)
+
+
+def test_grow_extends_a_caller_owned_tree():
+    planner = RRTPlanner(BOUNDS, check_edges=True, rng=np.random.default_rng(4))
+    tree = RRTTree(START)
+    index = create_nn_index(planner.nn_backend, BOUNDS, planner.step_size)
+    index.add(START)
+    field = wall()
+
+    attempts = planner.grow(tree, index, field, TARGET, max_extensions=40)
+    assert attempts == 40
+    assert 1 < len(tree) == len(index) <= 41
+    np.testing.assert_array_equal(index.points, tree.positions)
+    assert planner.grow(tree, index, field, TARGET, max_nodes=len(tree)) == 0
+    with pytest.raises(ValueError):
+        planner.grow(tree, index, field, TARGET)
+
+
+def test_flies_around_obstacles_to_a_static_target():
+    field = wall()
+    pursuer = make_pursuer()
+    previous = pursuer.position.copy()
+    for _ in range(1000):
+        position = pursuer.update(TARGET, field)
+        assert not field.segment_collides(previous, position)
+        assert np.linalg.norm(position - previous) <= pursuer.speed + 1e-9
+        previous = position.copy()
+        if np.linalg.norm(position - TARGET) < 1e-9:
+            break
+    np.testing.assert_allclose(pursuer.position, TARGET)
+    assert pursuer.replans == 0
+
+
+def test_tree_carries_over_between_ticks():
+    field = wall()
+    pursuer = make_pursuer(1)
+    pursuer.update(TARGET, field)
+    sizes = []
+    for _ in range(20):
+        pursuer.update(TARGET, field)
+        sizes.append(len(pursuer.tree))
+    # Re-rooting prunes only what is behind; the tree is never restarted
+    assert max(sizes) > pursuer.max_extensions
+    assert pursuer.replans == 0
+    np.testing.assert_allclose(pursuer.path[0], pursuer.position)
+
+
+def test_repair_prunes_edges_blocked_by_new_obstacles():
+    pursuer = make_pursuer(2)
+    for _ in range(5):
+        pursuer.update(TARGET, ObstacleField.from_obstacles([]))
+    before = len(pursuer.tree)
+
+    field = wall()
+    pursuer.update(TARGET, field)
+    tree = pursuer.tree
+    children = np.flatnonzero(tree.parents >= 0)
+    assert not field.segments_collide(
+        tree.positions[tree.parents[children]], tree.positions[children]
+    ).any()
+    assert len(tree) < before + pursuer.max_extensions
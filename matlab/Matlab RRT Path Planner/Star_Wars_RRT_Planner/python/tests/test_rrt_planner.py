@@ -0,0 +1,249 @@
+"""Tests for RRTPlanner"""
+
+import time
+
+import numpy as np
+import pytest
+
+from core import NN_BACKENDS, ObstacleField
+from star_wars_rrt import Obstacle, RRTPlanner
+
+BOUNDS = np.array([-1.0, 1.0, -0.6, 0.6, -0.3, 0.3])
+START = np.array([-0.8, 0.0, 0.0])
+GOAL = np.array([0.8, 0.0, 0.0])
+
+
+def make_obstacles():
+    """Sphere wall with a gap plus a cube, between start and goal"""
+    return [
+        Obstacle(0, np.array([0.0, 0.3, 0.0]), 0.2, (0.5, 0.5, 0.5)),
+        Obstacle(0, np.array([0.0, -0.3, 0.0]), 0.2, (0.5, 0.5, 0.5)),
+        Obstacle(1, np.array([0.4, 0.0, 0.0]), 0.1, (0.5, 0.5, 0.5)),
+    ]
+
+
+@pytest.mark.parametrize("mode", ["rrt", "connect"])
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+def test_plan_path_reaches_goal(backend, mode):
+    """Path starts at start, ends near goal, and avoids obstacles"""
+    planner = RRTPlanner(
+        BOUNDS,
+        max_iterations=20000,
+        nn_backend=backend,
+        mode=mode,
+        rng=np.random.default_rng(0),
+    )
+    obstacles = make_obstacles()
+
+    path = planner.plan_path(START, GOAL, obstacles)
+
+    assert path is not None, "Path should not be None"
+    np.testing.assert_array_equal(path[0], START)
+    assert np.linalg.norm(path[-1] - GOAL) < planner.goal_radius
+    assert not any(planner._check_collision(p, obstacles) for p in path[1:])
+    steps = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    assert np.all(steps <= planner.step_size + 1e-12)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        RRTPlanner(BOUNDS, nn_backend="octree")
+    with pytest.raises(ValueError):
+        RRTPlanner(BOUNDS, mode="prm")
+
+
+def test_edge_checking_allows_large_steps():
+    """With edge checks no path segment crosses an obstacle"""
+    planner = RRTPlanner(
+        BOUNDS, nn_backend="kdtree", check_edges=True, rng=np.random.default_rng(3)
+    )
+    planner.step_size = 0.2
+    planner.goal_radius = 0.2
+    field = ObstacleField.from_obstacles(make_obstacles())
+
+    path = planner.plan_path(START, GOAL, field)
+
+    assert path is not None
+    assert not field.segments_collide(path[:-1], path[1:]).any()
+
+
+def test_connect_joins_start_and_goal_trees():
+    """RRT-Connect paths run exactly from start to goal"""
+    planner = RRTPlanner(
+        BOUNDS,
+        nn_backend="kdtree",
+        check_edges=True,
+        mode="connect",
+        rng=np.random.default_rng(4),
+    )
+    field = ObstacleField.from_obstacles(make_obstacles())
+
+    path = planner.plan_path(START, GOAL, field)
+
+    assert path is not None
+    np.testing.assert_array_equal(path[0], START)
+    np.testing.assert_array_equal(path[-1], GOAL)
+    assert not field.segments_collide(path[:-1], path[1:]).any()
+
+
+def path_length(path):
+    return float(np.linalg.norm(np.diff(path, axis=0), axis=1).sum())
+
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+def test_star_improves_on_rrt(backend):
+    """RRT* returns a collision-free path no longer than plain RRT's"""
+    field = ObstacleField.from_obstacles(make_obstacles())
+    rrt = RRTPlanner(
+        BOUNDS, nn_backend=backend, check_edges=True, rng=np.random.default_rng(5)
+    )
+    rrt_path = rrt.plan_path(START, GOAL, field)
+    star = RRTPlanner(
+        BOUNDS,
+        max_iterations=1500,
+        nn_backend=backend,
+        check_edges=True,
+        mode="star",
+        rng=np.random.default_rng(5),
+    )
+    star_path = star.plan_path(START, GOAL, field)
+
+    assert star_path is not None
+    np.testing.assert_array_equal(star_path[0], START)
+    assert np.linalg.norm(star_path[-1] - GOAL) < star.goal_radius
+    assert not field.segments_collide(star_path[:-1], star_path[1:]).any()
+    assert path_length(star_path) < path_length(rrt_path)
+
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+@pytest.mark.parametrize("step_size, rewire_radius", [(0.2, 0.1), (0.05, 0.05)])
+def test_star_with_steps_past_the_rewire_radius(backend, step_size, rewire_radius):
+    """The nearest node always stays a parent candidate for the new node"""
+    planner = RRTPlanner(
+        BOUNDS,
+        max_iterations=1500,
+        nn_backend=backend,
+        check_edges=True,
+        mode="star",
+        rng=np.random.default_rng(8),
+    )
+    planner.step_size = step_size
+    planner.rewire_radius = rewire_radius
+    field = ObstacleField.from_obstacles(make_obstacles())
+
+    path = planner.plan_path(START, GOAL, field)
+
+    assert path is not None
+    assert np.isfinite(planner._trees[0].costs).all()
+    assert not field.segments_collide(path[:-1], path[1:]).any()
+
+
+def test_time_budget_returns_best_so_far():
+    """An expired budget stops RRT* early with the current best path"""
+    planner = RRTPlanner(
+        BOUNDS, max_iterations=10**7, mode="star", rng=np.random.default_rng(6)
+    )
+
+    tic = time.perf_counter()
+    path = planner.plan_path(START, GOAL, make_obstacles(), time_budget=0.3)
+
+    assert time.perf_counter() - tic < 1.0
+    assert path is not None
+
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+@pytest.mark.parametrize("check_edges", [False, True])
+def test_batched_expansion_reaches_goal(backend, check_edges):
+    """Extending several samples per round still yields a valid path"""
+    planner = RRTPlanner(
+        BOUNDS,
+        max_iterations=20000,
+        nn_backend=backend,
+        check_edges=check_edges,
+        rng=np.random.default_rng(0),
+    )
+    planner.expansion_batch = 16
+    obstacles = ObstacleField.from_obstacles(make_obstacles())
+
+    path = planner.plan_path(START, GOAL, obstacles)
+
+    assert path is not None
+    np.testing.assert_array_equal(path[0], START)
+    assert np.linalg.norm(path[-1] - GOAL) < planner.goal_radius
+    assert not obstacles.contains_batch(path[1:]).any()
+    if check_edges:
+        assert not obstacles.segments_collide(path[:-1], path[1:]).any()
+    steps = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    assert np.all(steps <= planner.step_size + 1e-12)
+    assert planner.last_iterations % 16 == 0
+    assert planner.last_nodes <= planner.last_iterations + 1
+
+
+@pytest.mark.parametrize("batch", [1, 16])
+@pytest.mark.parametrize("mode", ["rrt", "connect", "star"])
+def test_multi_goal_plan_ends_in_a_candidate(mode, batch):
+    goals = np.array([[0.8, 0.4, 0.0], [0.8, -0.4, 0.1], [0.6, 0.0, -0.2]])
+    radii = np.array([0.05, 0.1, 0.15])
+    planner = RRTPlanner(
+        BOUNDS, max_iterations=3000, mode=mode, rng=np.random.default_rng(1)
+    )
+    planner.expansion_batch = batch
+    obstacles = make_obstacles()
+
+    path = planner.plan_path(START, goals, obstacles, goal_radii=radii)
+
+    assert path is not None
+    goal = planner.last_goal
+    assert np.linalg.norm(path[-1] - goals[goal]) <= radii[goal]
+    assert not any(planner._check_collision(p, obstacles) for p in path[1:])
+
+
+@pytest.mark.parametrize("mode", ["rrt", "connect", "star"])
+def test_last_goal_is_the_region_reached(mode):
+    """Overlapping regions of mixed radii: the wide ball's edge sits closer
+    to the narrow ball's center than to its own"""
+    goals = np.array([[0.3, 0.0, 0.0], [-0.3, 0.0, 0.0]])
+    radii = np.array([0.5, 0.01])
+    for seed in range(6):
+        planner = RRTPlanner(
+            BOUNDS, max_iterations=500, mode=mode, rng=np.random.default_rng(seed)
+        )
+        path = planner.plan_path(START, goals, [], goal_radii=radii)
+
+        assert path is not None
+        goal = planner.last_goal
+        assert np.linalg.norm(path[-1] - goals[goal]) <= radii[goal]
+
+
+def test_multi_goal_skips_blocked_goals():
+    goals = np.array([[0.0, 0.3, 0.0], [0.8, 0.0, 0.0]])  # First is in a sphere
+    planner = RRTPlanner(BOUNDS, max_iterations=20000, rng=np.random.default_rng(2))
+
+    planner.plan_path(START, goals, make_obstacles())
+
+    assert planner.last_goal == 1
+
+
+def test_best_goal_is_never_longer_than_first():
+    goals = np.array([[0.8, 0.0, 0.0], [-0.8, 0.5, 0.25], [0.0, -0.5, -0.2]])
+    lengths = {}
+    for selection in ("first", "best"):
+        totals = []
+        for seed in range(6):
+            planner = RRTPlanner(
+                BOUNDS, max_iterations=20000, rng=np.random.default_rng(seed)
+            )
+            planner.goal_selection = selection
+            path = planner.plan_path(START, goals, make_obstacles())
+            assert path is not None
+            totals.append(np.linalg.norm(np.diff(path, axis=0), axis=1).sum())
+        lengths[selection] = np.array(totals)
+
+    # Both grow the same tree up to the first goal; "best" may go on to a
+    # closer one
+    assert np.all(lengths["best"] <= lengths["first"] + 1e-12)
+    assert np.any(lengths["best"] < lengths["first"])
+
+    planner.goal_selection = "nearest"
+    with pytest.raises(ValueError):
+        planner.plan_path(START, goals, make_obstacles())
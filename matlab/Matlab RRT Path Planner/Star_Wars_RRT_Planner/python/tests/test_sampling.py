@@ -0,0 +1,105 @@
+"""Tests for seeded block sampling"""
+
+import numpy as np
+import pytest
+
+from core import InformedSampler, UniformSampler
+from star_wars_rrt import PursuitAI, RRTPlanner
+from tests.test_rrt_planner import BOUNDS, GOAL, START, make_obstacles
+
+
+def test_points_stay_in_bounds_across_blocks():
+    sampler = UniformSampler(BOUNDS, np.random.default_rng(0), batch=16)
+    points = np.array([sampler.point() for _ in range(100)])
+    coins = np.array([sampler.coin() for _ in range(100)])
+
+    assert np.all(points >= BOUNDS[0::2]) and np.all(points <= BOUNDS[1::2])
+    assert len(np.unique(points, axis=0)) == 100
+    assert np.all((coins >= 0) & (coins < 1))
+
+
+def test_same_seed_same_samples():
+    a = UniformSampler(BOUNDS, np.random.default_rng(1), batch=8)
+    b = UniformSampler(BOUNDS, np.random.default_rng(1), batch=8)
+
+    for _ in range(20):
+        np.testing.assert_array_equal(a.point(), b.point())
+        assert a.coin() == b.coin()
+
+
+def test_batch_draws_continue_the_single_streams():
+    a = UniformSampler(BOUNDS, np.random.default_rng(5), batch=8)
+    b = UniformSampler(BOUNDS, np.random.default_rng(5), batch=8)
+
+    points = np.concatenate([a.points(3), a.points(11), a.points(0), a.points(2)])
+    coins = np.concatenate([a.coins(5), a.coins(9)])
+
+    np.testing.assert_array_equal(points, [b.point() for _ in range(16)])
+    np.testing.assert_array_equal(coins, [b.coin() for _ in range(14)])
+
+
+def test_seeded_planner_is_reproducible():
+    paths = [
+        RRTPlanner(BOUNDS, rng=np.random.default_rng(2)).plan_path(
+            START, GOAL, make_obstacles()
+        )
+        for _ in range(2)
+    ]
+
+    np.testing.assert_array_equal(paths[0], paths[1])
+
+
+def test_seeded_pursuit_goals():
+    first, second = (PursuitAI(BOUNDS, rng=np.random.default_rng(3)) for _ in range(2))
+    goals = []
+    for ai in (first, second):
+        ai.goals.steps(np.zeros(3), ai.target_speed, 1 / 60)
+        goals.append(ai.goals.goals[0].copy())
+
+    assert np.all(goals[0] >= BOUNDS[0::2]) and np.all(goals[0] <= BOUNDS[1::2])
+    np.testing.assert_array_equal(goals[0], goals[1])
+
+
+def test_informed_sampler_is_uniform_until_a_cost_is_set():
+    informed = InformedSampler(BOUNDS, START, GOAL, np.random.default_rng(4))
+    uniform = UniformSampler(BOUNDS, np.random.default_rng(4))
+
+    for _ in range(300):
+        np.testing.assert_array_equal(informed.point(), uniform.point())
+
+
+@pytest.mark.parametrize("cost", [1.7, 2.5, 20.0])
+def test_informed_points_could_shorten_the_path(cost):
+    sampler = InformedSampler(BOUNDS, START, GOAL, np.random.default_rng(5))
+    sampler.point()
+    sampler.set_cost(cost)
+    points = np.array([sampler.point() for _ in range(2000)])
+
+    focal = np.linalg.norm(points - START, axis=1) + np.linalg.norm(
+        points - GOAL, axis=1
+    )
+    assert np.all(focal <= cost + 1e-9)
+    assert np.all(points >= BOUNDS[0::2]) and np.all(points <= BOUNDS[1::2])
+    # Both halves of the spheroid get samples
+    assert (points[:, 0] < 0).mean() > 0.3 and (points[:, 0] > 0).mean() > 0.3
+
+
+def test_informed_rrt_star_converges_faster():
+    lengths = {True: [], False: []}
+    for informed in lengths:
+        for seed in range(4):
+            planner = RRTPlanner(
+                BOUNDS,
+                max_iterations=800,
+                nn_backend="kdtree",
+                check_edges=True,
+                mode="star",
+                rng=np.random.default_rng(seed),
+            )
+            planner.informed_sampling = informed
+            path = planner.plan_path(START, GOAL, make_obstacles())
+            lengths[informed].append(
+                np.linalg.norm(np.diff(path, axis=0), axis=1).sum()
+            )
+
+    assert np.mean(lengths[True]) < np.mean(lengths[False])
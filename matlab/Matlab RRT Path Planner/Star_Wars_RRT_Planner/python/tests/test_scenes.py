@@ -0,0 +1,130 @@
+"""Tests for scene loading, caching, export and random scene generation"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from core import load_scene, load_scene_csv, random_scene, save_scene
+from core.scenes import CACHE_DIR
+from tests.test_rrt_planner import BOUNDS, GOAL, START
+
+
+def test_csv_with_bounds_row(tmp_path):
+    path = tmp_path / "custom.csv"
+    path.write_text(
+        "-1.0,-2.0,2.0,-1.0,1.0,-0.5,0.5,\n"
+        "0.0,0.1,0.2,0.3,0.05,0.5,0.5,0.5\n"
+        "1.0,-0.1,0.0,0.0,0.1,0.4,0.4,0.4\n"
+    )
+
+    field, bounds = load_scene_csv(path)
+
+    np.testing.assert_array_equal(bounds, [-2.0, 2.0, -1.0, 1.0, -0.5, 0.5])
+    assert len(field) == 2
+    np.testing.assert_array_equal(field.sphere_centers, [[0.1, 0.2, 0.3]])
+    np.testing.assert_array_equal(field.cube_sizes, [0.1])
+
+
+def test_csv_without_bounds_row(tmp_path):
+    path = tmp_path / "plain.csv"
+    path.write_text("1,0.5,0.0,0.0,0.2,0.1,0.2,0.3\n")
+
+    field, bounds = load_scene_csv(path)
+
+    assert bounds is None
+    assert len(field) == 1
+    assert field.contains(np.array([0.55, 0.05, -0.05]))
+
+
+def test_random_scene_is_seeded_and_keeps_points_clear():
+    make = lambda: random_scene(  # noqa: E731
+        400, BOUNDS, np.random.default_rng(0), clear=[START, GOAL]
+    )
+    field, again = make(), make()
+
+    assert len(field) == 400
+    assert not field.contains_batch(np.array([START, GOAL])).any()
+    np.testing.assert_array_equal(field.cube_centers, again.cube_centers)
+    assert np.all(field.sphere_centers >= BOUNDS[0::2])
+    assert np.all(field.sphere_centers <= BOUNDS[1::2])
+
+
+SHIPPED_SCENES = Path(__file__).resolve().parents[3] / "RRT_3D_Static"
+
+
+def test_shipped_matlab_scenes_load():
+    for name, count in (
+        ("obstacles3D.csv", 180),
+        ("obstacles3D_space_custom_1.csv", 150),
+        ("obstacles3D_space_custom_3.csv", 210),
+    ):
+        path = SHIPPED_SCENES / name
+        if not path.exists():
+            pytest.skip("MATLAB scenes not checked out")
+        field, bounds = load_scene(path, cache=False)
+        assert len(field) == count
+        assert bounds is not None and np.all(bounds[0::2] < bounds[1::2])
+
+
+def test_csv_copy_is_cached_and_invalidated_by_mtime(tmp_path):
+    path = tmp_path / "scene.csv"
+    save_scene(path, random_scene(50, BOUNDS, np.random.default_rng(0)), BOUNDS)
+
+    field, bounds = load_scene(path)
+    copies = list((tmp_path / CACHE_DIR).glob("scene.csv.*.npy"))
+    assert len(copies) == 1
+    again, _ = load_scene(path)
+    np.testing.assert_array_equal(again.cube_centers, field.cube_centers)
+    np.testing.assert_array_equal(bounds, BOUNDS)
+
+    save_scene(path, random_scene(20, BOUNDS, np.random.default_rng(1)))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    edited, bounds = load_scene(path)
+
+    assert len(edited) == 20 and bounds is None
+    copies = list((tmp_path / CACHE_DIR).glob("scene.csv.*.npy"))
+    assert len(copies) == 1 and str(path.stat().st_mtime_ns) in copies[0].name
+
+
+def test_unwritable_cache_warns_and_still_loads(tmp_path):
+    path = tmp_path / "scene.csv"
+    save_scene(path, random_scene(10, BOUNDS, np.random.default_rng(2)), BOUNDS)
+    (tmp_path / CACHE_DIR).write_text("not a directory")
+
+    with pytest.warns(RuntimeWarning, match="Could not cache"):
+        field, bounds = load_scene(path)
+
+    assert len(field) == 10
+    np.testing.assert_array_equal(bounds, BOUNDS)
+
+
+def test_export_round_trips_through_csv_and_npy(tmp_path):
+    field = random_scene(30, BOUNDS, np.random.default_rng(2))
+    for name in ("scene.csv", "scene.npy"):
+        save_scene(tmp_path / name, field, BOUNDS)
+        loaded, bounds = load_scene(tmp_path / name)
+
+        np.testing.assert_array_equal(loaded.to_array(), field.to_array())
+        np.testing.assert_array_equal(bounds, BOUNDS)
+    assert load_scene_csv(tmp_path / "scene.csv")[0].to_array().shape == (30, 8)
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("0,0.1,0.2,0.3,0.05\n", "expected rows of 8"),
+        ("0,0.1,0.2,0.3,0.05,0.5,0.5,0.5\n2,0,0,0,0.1,0,0,0\n", "row 2: type"),
+        ("-1,1,-1,-1,1,-1,1,\n1,0,0,0,0.1,0,0,0\n", "row 1: bounds"),
+        ("1,0,0,0,0,0.5,0.5,0.5\n", "row 1: size"),
+        ("1,0,nan,0,0.1,0.5,0.5,0.5\n", "row 1: non-finite"),
+    ],
+)
+def test_invalid_rows_are_rejected(tmp_path, text, message):
+    path = tmp_path / "bad.csv"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        load_scene(path)
+    assert not list(tmp_path.glob(f"{CACHE_DIR}/*.npy"))
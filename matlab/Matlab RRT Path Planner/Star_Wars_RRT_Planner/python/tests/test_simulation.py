@@ -0,0 +1,123 @@
+"""Tests for the fixed-timestep simulation loop"""
+
+import numpy as np
+import pytest
+
+from core import MovingObstacleField, load_scene
+from star_wars_rrt import StarWarsRRTApp, main
+
+
+@pytest.fixture(autouse=True)
+def model_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+
+def pursuit_app(seed: int = 3) -> StarWarsRRTApp:
+    app = StarWarsRRTApp(seed=seed, render=False)
+    # Growth capped by extensions only, so replanning is repeatable
+    app.replan_budget = None
+    app.setup_scenario("pursuit")
+    return app
+
+
+def positions(app: StarWarsRRTApp) -> np.ndarray:
+    return np.array([ship.position for ship in app.ships])
+
+
+def test_simulate_is_deterministic_and_captures():
+    first = pursuit_app().simulate(5000)
+    second = pursuit_app().simulate(5000)
+    assert first == second
+    assert first.captured
+    assert first.steps < 5000
+    assert np.isclose(first.capture_time, first.steps * (1.0 / 60.0))
+
+
+def test_simulate_without_stop_runs_every_step():
+    app = pursuit_app()
+    outcome = app.simulate(200, stop_on_capture=False)
+    assert outcome.steps == 200
+    assert np.isclose(outcome.sim_time, 200 * app.dt)
+
+
+def test_advance_runs_whole_steps_and_returns_remainder():
+    app = pursuit_app()
+    alpha = app._advance(2.5 * app.dt)
+    assert np.isclose(app.sim_time, 2 * app.dt)
+    assert np.isclose(alpha, 0.5)
+
+
+def test_advance_clamps_long_frames():
+    app = pursuit_app()
+    app._advance(10.0)
+    assert app.sim_time <= app.max_frame_time + 1e-9
+
+
+def test_frame_rate_does_not_change_the_simulation():
+    fast, slow = pursuit_app(), pursuit_app()
+    for _ in range(120):
+        fast._advance(1.0 / 120.0)
+    for _ in range(24):
+        slow._advance(1.0 / 24.0)
+    assert np.isclose(fast.sim_time, slow.sim_time)
+    np.testing.assert_allclose(positions(fast), positions(slow))
+
+
+def test_interpolated_ships_lie_between_steps():
+    app = pursuit_app()
+    app.step()
+    previous = np.array(app._previous_positions)
+    current = positions(app)
+    halfway = np.array([ship.position for ship in app._interpolated_ships(0.5)])
+    np.testing.assert_allclose(halfway, (previous + current) / 2)
+    np.testing.assert_allclose(positions(app), current)
+
+
+def test_swarm_mode_ships_follow_the_swarm_arrays():
+    app = StarWarsRRTApp(seed=5, render=False)
+    app.swarm_size = (20, 40)
+    app.setup_scenario("swarm")
+    assert len(app.ships) == 60
+
+    outcome = app.simulate(5000)
+    np.testing.assert_array_equal(positions(app), app.swarm.positions)
+    assert outcome.captured
+    assert app.swarm.captured[app.swarm.targets].all()
+
+
+def test_moving_obstacles_are_resampled_every_step():
+    app = StarWarsRRTApp(seed=6, render=False)
+    app.replan_budget = None
+    moving = MovingObstacleField.from_array(
+        [[0, 0.0, 0.0, 0.2, 0.1, 0.5, 0.5, 0.5]], [[0.3, 0.0, 0.0]], app.bounds
+    )
+    app.setup_scenario("pursuit", moving)
+    app.simulate(30, stop_on_capture=False)
+
+    np.testing.assert_allclose(app.obstacle_field.sphere_centers, [[0.15, 0.0, 0.2]])
+    assert app.obstacles is app.obstacle_field
+
+
+def test_scene_bounds_reach_the_planners_and_ai(tmp_path):
+    scene = tmp_path / "wide.csv"
+    scene.write_text(
+        "-1.0,-2.0,2.0,-1.0,1.0,-0.5,0.5,\n0.0,1.5,0.7,0.3,0.1,0.5,0.5,0.5\n"
+    )
+    field, bounds = load_scene(scene)
+    app = StarWarsRRTApp(seed=7, render=False, bounds=bounds)
+    app.replan_budget = None
+    app.setup_scenario("pursuit", field)
+
+    for owner in (app, app.planner, app.pursuer_planner, app.pursuit_ai, app.swarm_ai):
+        np.testing.assert_array_equal(owner.bounds, bounds)
+    # Target goals cover the scene, not just the default volume
+    goals = app.pursuit_ai.goals.points
+    assert (goals[:, 0] > 1.0).any() and (goals[:, 0] < -1.0).any()
+    app.simulate(30, stop_on_capture=False)
+
+
+def test_cli_simulates_zero_steps_headless(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["star_wars_rrt.py", "--simulate", "0"])
+    main()
+
+    assert "0 steps" in capsys.readouterr().out
@@ -0,0 +1,99 @@
+"""Tests for path shortcutting and resampling"""
+
+import numpy as np
+import pytest
+
+from core import (
+    ObstacleField,
+    resample_bspline,
+    resample_linear,
+    resample_min_jerk,
+    shortcut_path,
+    smooth_path,
+)
+from star_wars_rrt import RRTPlanner
+from tests.test_rrt_planner import BOUNDS, GOAL, START, make_obstacles
+
+# A cube at the origin with a detour over its top
+WALL = ObstacleField(np.empty((0, 3)), [], [[0.0, 0.0, 0.0]], [0.4])
+DETOUR = np.array(
+    [
+        [-0.5, 0.0, 0.0],
+        [-0.4, 0.0, 0.1],
+        [-0.3, 0.0, 0.3],
+        [-0.1, 0.0, 0.3],
+        [0.1, 0.0, 0.3],
+        [0.3, 0.0, 0.3],
+        [0.4, 0.0, 0.1],
+        [0.5, 0.0, 0.0],
+    ]
+)
+
+
+def collides(field, path):
+    return field.segments_collide(path[:-1], path[1:]).any()
+
+
+def test_shortcut_keeps_endpoints_and_stays_free():
+    path = shortcut_path(DETOUR, WALL, rng=np.random.default_rng(0))
+
+    assert 2 < len(path) < len(DETOUR)
+    np.testing.assert_array_equal(path[0], DETOUR[0])
+    np.testing.assert_array_equal(path[-1], DETOUR[-1])
+    assert not collides(WALL, path)
+
+
+def test_shortcut_without_obstacles_is_straight():
+    empty = ObstacleField(np.empty((0, 3)), [], np.empty((0, 3)), [])
+    path = shortcut_path(DETOUR, empty, rng=np.random.default_rng(0))
+
+    np.testing.assert_array_equal(path, DETOUR[[0, -1]])
+
+
+@pytest.mark.parametrize("resample", [resample_linear, resample_bspline])
+def test_resampling_hits_count_and_endpoints(resample):
+    path = resample(DETOUR, 25)
+
+    assert path.shape == (25, 3)
+    np.testing.assert_allclose(path[0], DETOUR[0], atol=1e-12)
+    np.testing.assert_allclose(path[-1], DETOUR[-1], atol=1e-12)
+
+
+def test_min_jerk_passes_through_waypoints():
+    path = resample_min_jerk(DETOUR, 200)
+    gaps = np.linalg.norm(path[:, None, :] - DETOUR[None, :, :], axis=2).min(axis=0)
+
+    assert path.shape == (200, 3)
+    np.testing.assert_allclose(path[[0, -1]], DETOUR[[0, -1]], atol=1e-12)
+    assert gaps.max() < 0.01
+
+
+def test_colliding_curve_falls_back_to_polyline():
+    # A corner hugging the cube: the B-spline cuts through it
+    corner = np.array([[-0.3, -0.21, 0.0], [0.21, -0.21, 0.0], [0.21, 0.3, 0.0]])
+    assert not collides(WALL, corner)
+    assert collides(WALL, resample_bspline(corner, 20))
+
+    path = smooth_path(corner, WALL, "bspline", 20, np.random.default_rng(0))
+
+    np.testing.assert_array_equal(path, corner)
+
+
+def test_planner_smoothing_option():
+    field = ObstacleField.from_obstacles(make_obstacles())
+    planner = RRTPlanner(
+        BOUNDS, nn_backend="kdtree", smoothing="min_jerk", rng=np.random.default_rng(0)
+    )
+    planner.smooth_waypoints = 30
+    path = planner.plan_path(START, GOAL, field)
+
+    assert len(path) == 30
+    np.testing.assert_array_equal(path[0], START)
+    assert not collides(field, path)
+
+
+def test_unknown_smoothing_rejected():
+    with pytest.raises(ValueError):
+        RRTPlanner(BOUNDS, smoothing="cubic")
+    with pytest.raises(ValueError):
+        smooth_path(DETOUR, WALL, "cubic")
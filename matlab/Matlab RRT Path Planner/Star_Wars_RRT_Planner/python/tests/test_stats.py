@@ -0,0 +1,87 @@
+"""Tests for planner instrumentation"""
+
+import json
+
+import numpy as np
+import pytest
+
+from benchmark import main
+from core import PlannerStats
+from core.stats import PHASES
+from star_wars_rrt import RRTPlanner
+from tests.test_rrt_planner import BOUNDS, GOAL, START, make_obstacles
+
+
+def plan(mode, stats=None, **options):
+    planner = RRTPlanner(BOUNDS, mode=mode, rng=np.random.default_rng(0), **options)
+    planner.stats = stats
+    return planner, planner.plan_path(START, GOAL, make_obstacles())
+
+
+@pytest.mark.parametrize("mode", ["rrt", "connect", "star"])
+def test_stats_do_not_change_the_plan(mode):
+    _, plain = plan(mode, max_iterations=600)
+    _, timed = plan(mode, PlannerStats(), max_iterations=600)
+
+    np.testing.assert_array_equal(plain, timed)
+
+
+def test_counters_and_timers_add_up():
+    stats = PlannerStats(growth_interval=10)
+    planner, path = plan("rrt", stats, check_edges=True, smoothing="shortcut")
+    counts, timers = stats.counts, stats.timers_ns
+
+    assert path is not None
+    assert counts["plans"] == 1
+    assert counts["iterations"] == counts["samples"] == planner.last_iterations
+    assert counts["nearest_queries"] == counts["samples"]
+    assert 0 < counts["rejections"] <= counts["collision_checks"]
+    assert counts["nodes"] == planner.last_nodes
+    assert 0 < counts["goal_samples"] < counts["samples"]
+    assert all(timers[phase] > 0 for phase in PHASES)
+    assert timers["total"] == sum(timers[phase] for phase in PHASES)
+
+    plans, iterations, nodes, elapsed = zip(*stats.growth)
+    assert set(plans) == {1}
+    assert iterations[-1] == planner.last_iterations
+    assert nodes[-1] == planner.last_nodes
+    assert list(nodes) == sorted(nodes) and list(elapsed) == sorted(elapsed)
+
+
+def test_batched_rounds_count_every_sample():
+    stats = PlannerStats(growth_interval=64)
+    planner = RRTPlanner(BOUNDS, check_edges=True, rng=np.random.default_rng(0))
+    planner.expansion_batch = 16
+    planner.stats = stats
+    path = planner.plan_path(START, GOAL, make_obstacles())
+    counts = stats.counts
+
+    assert path is not None
+    assert counts["samples"] == counts["nearest_queries"] == planner.last_iterations
+    assert counts["nodes"] == planner.last_nodes
+    assert counts["nodes"] - 1 == counts["collision_checks"] - counts["rejections"]
+
+
+def test_stats_accumulate_until_reset_and_export():
+    stats = PlannerStats()
+    planner = RRTPlanner(BOUNDS, mode="connect", rng=np.random.default_rng(1))
+    planner.stats = stats
+    for _ in range(3):
+        planner.plan_path(START, GOAL, make_obstacles())
+
+    exported = json.loads(stats.to_json())
+    assert exported == stats.to_dict()
+    assert exported["counts"]["plans"] == 3
+    assert exported["growth"]["plan"][-1] == 3
+
+    stats.reset()
+    assert not any(stats.counts.values()) and not any(stats.timers_ns.values())
+    assert stats.to_dict()["growth"]["nodes"] == []
+
+
+def test_benchmark_reports_phase_breakdown():
+    report = main(["--random", "10", "--trials", "2", "--iterations", "300", "--stats"])
+
+    for result in report["results"]:
+        assert result["counts"]["plans"] == 2
+        assert result["timers_ns"]["total"] > 0
@@ -0,0 +1,69 @@
+"""Tests for the vectorized swarm pursuit"""
+
+import numpy as np
+
+from core import PURSUER, TARGET, ObstacleField, Swarm, SwarmPursuit, random_scene
+
+BOUNDS = np.array([-1.0, 1.0, -1.0, 1.0, -1.0, 1.0])
+
+
+def test_random_swarm_starts_outside_obstacles():
+    field = random_scene(40, BOUNDS, np.random.default_rng(0), size_range=(0.1, 0.3))
+    swarm = Swarm.random(50, 150, BOUNDS, np.random.default_rng(1), field)
+
+    assert len(swarm) == 200
+    assert np.count_nonzero(swarm.roles == PURSUER) == 50
+    assert np.count_nonzero(swarm.roles == TARGET) == 150
+    assert not field.contains_batch(swarm.positions).any()
+
+
+def test_step_stays_in_bounds_and_never_crosses_obstacles():
+    rng = np.random.default_rng(2)
+    field = random_scene(40, BOUNDS, rng, size_range=(0.1, 0.3))
+    swarm = Swarm.random(100, 300, BOUNDS, rng, field)
+    pursuit = SwarmPursuit(BOUNDS, field, rng)
+
+    for _ in range(50):
+        start = swarm.positions.copy()
+        pursuit.step(swarm)
+        assert not field.segments_collide(start, swarm.positions).any()
+        np.testing.assert_allclose(swarm.velocities, swarm.positions - start)
+    assert (swarm.positions >= BOUNDS[0::2]).all()
+    assert (swarm.positions <= BOUNDS[1::2]).all()
+
+
+def test_close_target_evades_and_distant_pursuer_chases():
+    swarm = Swarm(
+        [[0.0, 0.0, 0.0], [0.1, 0.0, 0.0], [0.9, 0.9, 0.9]],
+        [PURSUER, TARGET, TARGET],
+    )
+    pursuit = SwarmPursuit(BOUNDS, rng=np.random.default_rng(3))
+    pursuit.step(swarm)
+
+    np.testing.assert_allclose(swarm.positions[1], [0.1 + pursuit.target_speed, 0, 0])
+    # The pursuer heads for the nearest free target at full speed
+    assert np.isclose(np.linalg.norm(swarm.velocities[0]), pursuit.pursuer_speed)
+    assert swarm.velocities[0, 0] > 0
+
+
+def test_capture_marks_targets_and_stops_the_swarm():
+    swarm = Swarm([[0.0, 0.0, 0.0], [0.01, 0.0, 0.0]], [PURSUER, TARGET])
+    pursuit = SwarmPursuit(BOUNDS, rng=np.random.default_rng(4))
+
+    np.testing.assert_array_equal(pursuit.step(swarm), [1])
+    assert swarm.captured[1]
+    assert len(swarm.free_targets) == 0
+
+    before = swarm.positions.copy()
+    assert len(pursuit.step(swarm)) == 0
+    np.testing.assert_array_equal(swarm.positions, before)
+
+
+def test_empty_obstacle_field_moves_freely():
+    swarm = Swarm([[0.0, 0.0, 0.0], [0.5, 0.0, 0.0]], [PURSUER, TARGET])
+    pursuit = SwarmPursuit(BOUNDS, ObstacleField.from_obstacles([]))
+    pursuit.step(swarm)
+    np.testing.assert_allclose(
+        np.linalg.norm(swarm.velocities, axis=1),
+        [pursuit.pursuer_speed, pursuit.target_speed],
+    )
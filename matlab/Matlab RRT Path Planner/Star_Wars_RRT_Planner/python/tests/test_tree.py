@@ -0,0 +1,110 @@
+"""Tests for the array-backed RRT tree"""
+
+import numpy as np
+
+from core import NO_PARENT, RRTTree
+
+
+def test_growth_preserves_nodes():
+    """Doubling past the initial capacity keeps positions and parents intact"""
+    points = np.random.default_rng(0).uniform(-1, 1, (100, 3))
+    tree = RRTTree(points[0], capacity=4)
+    for i, point in enumerate(points[1:]):
+        tree.add(point, i)
+
+    assert len(tree) == 100
+    assert tree.capacity == 128
+    assert tree.positions.dtype == np.float64
+    assert tree.parents.dtype == np.int32
+    np.testing.assert_array_equal(tree.positions, points)
+    assert tree.parents[0] == NO_PARENT
+    np.testing.assert_array_equal(tree.parents[1:], np.arange(99))
+
+
+def test_add_batch_matches_sequential_adds():
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-1, 1, (50, 3))
+    blocks = np.split(np.arange(50), [7, 8, 40])
+    # Parents come from the tree as it stood before each block
+    parents = np.concatenate(
+        [rng.integers(block[0] + 1, size=len(block)) for block in blocks]
+    )
+    single = RRTTree(np.zeros(3), capacity=4, track_children=True)
+    batched = RRTTree(np.zeros(3), capacity=4, track_children=True)
+
+    for point, parent in zip(points, parents):
+        single.add(point, parent, single.costs[parent] + 1.0)
+    for block in blocks:
+        batched.add_batch(
+            points[block], parents[block], batched.costs[parents[block]] + 1.0
+        )
+
+    np.testing.assert_array_equal(batched.positions, single.positions)
+    np.testing.assert_array_equal(batched.parents, single.parents)
+    np.testing.assert_array_equal(batched.costs, single.costs)
+    # Child lists are filed too, so rewiring shifts the same subtree
+    single.reparent(5, 0, 0.5)
+    batched.reparent(5, 0, 0.5)
+    np.testing.assert_array_equal(batched.costs, single.costs)
+
+
+def test_branch_walks_root_to_node():
+    tree = RRTTree(np.zeros(3))
+    a = tree.add(np.array([1.0, 0, 0]), 0)
+    tree.add(np.array([0, 1.0, 0]), 0)
+    b = tree.add(np.array([2.0, 0, 0]), a)
+
+    np.testing.assert_array_equal(tree.branch(b), [0, a, b])
+    np.testing.assert_array_equal(tree.branch(0), [0])
+
+
+def test_reparent_shifts_subtree_costs():
+    tree = RRTTree(np.zeros(3), track_children=True)
+    a = tree.add(np.array([1.0, 0, 0]), 0, cost=1.0)
+    b = tree.add(np.array([2.0, 0, 0]), a, cost=3.0)
+    c = tree.add(np.array([3.0, 0, 0]), b, cost=4.0)
+    d = tree.add(np.array([0, 1.0, 0]), 0, cost=1.0)
+
+    tree.reparent(b, d, 1.5)
+
+    assert tree.parents[b] == d
+    np.testing.assert_array_equal(tree.costs, [0.0, 1.0, 1.5, 2.5, 1.0])
+    np.testing.assert_array_equal(tree.branch(c), [0, d, b, c])
+
+
+def chain_tree() -> RRTTree:
+    """0 -> 1 -> 2 -> 3 with a side branch 0 -> 4 -> 5, unit edges"""
+    tree = RRTTree(np.zeros(3))
+    for i, parent in enumerate([0, 1, 2, 0, 4]):
+        tree.add(np.array([i + 1.0, 0, 0]), parent, tree.costs[parent] + 1.0)
+    return tree
+
+
+def test_subtree_mask_marks_descendants():
+    tree = chain_tree()
+    np.testing.assert_array_equal(
+        tree.subtree_mask([1]), [False, True, True, True, False, False]
+    )
+    np.testing.assert_array_equal(tree.subtree_mask([2, 4]), [0, 0, 1, 1, 1, 1])
+
+
+def test_prune_compacts_and_remaps_parents():
+    tree = chain_tree()
+    remap = tree.prune(~tree.subtree_mask([2]))
+
+    assert len(tree) == 4
+    np.testing.assert_array_equal(remap, [0, 1, NO_PARENT, NO_PARENT, 2, 3])
+    np.testing.assert_array_equal(tree.parents, [NO_PARENT, 0, 0, 2])
+    np.testing.assert_array_equal(tree.positions[:, 0], [0, 1, 4, 5])
+    # Growth continues after the compacted tail
+    assert tree.add(np.ones(3), 3) == 4
+
+
+def test_reroot_keeps_subtree_with_shifted_costs():
+    tree = chain_tree()
+    remap = tree.reroot(1)
+
+    assert remap[1] == 0
+    np.testing.assert_array_equal(tree.parents, [NO_PARENT, 0, 1])
+    np.testing.assert_array_equal(tree.costs, [0.0, 1.0, 2.0])
+    np.testing.assert_array_equal(tree.branch(2), [0, 1, 2])